@@ -12,6 +12,7 @@ from .models import (
     EmployerProfile,
     HemisAuth,
     Notification,
+    SiteMetricsSnapshot,
     StudentProfile,
     UserActivity,
 )
@@ -153,4 +154,28 @@ class StudentProfileAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
         (_("Statistics"), {"fields": ("resumes_created", "jobs_applied")},
         ),
         (_("Timestamps"), {"fields": ("created_at", "updated_at")}),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(SiteMetricsSnapshot)
+class SiteMetricsSnapshotAdmin(admin.ModelAdmin):
+    """Read-only view of daily site metrics snapshots"""
+
+    list_display = (
+        "snapshot_date",
+        "total_users",
+        "total_students",
+        "total_employers",
+        "total_jobs",
+        "total_resumes",
+        "active_today",
+        "updated_at",
+    )
+    date_hierarchy = "snapshot_date"
+    list_per_page = 31
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from accounts.search import rebuild_student_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employer-facing student search index (StudentSearchDocument)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of student profiles indexed per query batch",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_student_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} student profiles"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from accounts.metrics import take_metrics_snapshot
+
+
+class Command(BaseCommand):
+    help = "Recompute today's site metrics snapshot (run periodically, e.g. every 5 minutes from cron)"
+
+    def handle(self, *args, **options):
+        snapshot = take_metrics_snapshot()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Snapshot {snapshot.snapshot_date}: "
+                f"{snapshot.total_users} users, {snapshot.total_jobs} jobs, "
+                f"{snapshot.total_resumes} resumes, {snapshot.active_today} active today"
+            )
+        )
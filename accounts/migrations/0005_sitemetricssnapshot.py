@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_customuser_address_en_customuser_address_ru_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteMetricsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot_date', models.DateField(help_text='Day the counters belong to (one row per day)', unique=True, verbose_name='Snapshot Date')),
+                ('total_users', models.PositiveIntegerField(default=0, verbose_name='Total Users')),
+                ('total_students', models.PositiveIntegerField(default=0, verbose_name='Students')),
+                ('total_employers', models.PositiveIntegerField(default=0, verbose_name='Employers')),
+                ('total_admins', models.PositiveIntegerField(default=0, verbose_name='Admins')),
+                ('new_this_week', models.PositiveIntegerField(default=0, verbose_name='New This Week')),
+                ('active_today', models.PositiveIntegerField(default=0, help_text='Distinct users with any activity on this day', verbose_name='Active Today')),
+                ('logins_today', models.PositiveIntegerField(default=0, help_text='Distinct users who logged in on this day', verbose_name='Logins Today')),
+                ('total_jobs', models.PositiveIntegerField(default=0, verbose_name='Jobs')),
+                ('total_resumes', models.PositiveIntegerField(default=0, verbose_name='Resumes')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the counters were last recomputed', verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Site Metrics Snapshot',
+                'verbose_name_plural': 'Site Metrics Snapshots',
+                'ordering': ['-snapshot_date'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_sitemetricssnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchDocument',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='accounts.studentprofile', verbose_name='Student Profile')),
+                ('name_tokens', models.TextField(blank=True, help_text='Normalized first name, last name and username', verbose_name='Name Tokens')),
+                ('skill_tokens', models.TextField(blank=True, help_text='Normalized skills from published CVs', verbose_name='Skill Tokens')),
+                ('profile_tokens', models.TextField(blank=True, help_text='Normalized faculty, specialty and desired position', verbose_name='Profile Tokens')),
+                ('faculty', models.CharField(blank=True, db_index=True, max_length=255, verbose_name='Faculty')),
+                ('education_level', models.CharField(blank=True, db_index=True, max_length=20, verbose_name='Education Level')),
+                ('graduation_year', models.IntegerField(blank=True, db_index=True, null=True, verbose_name='Graduation Year')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Student Search Document',
+                'verbose_name_plural': 'Student Search Documents',
+                'indexes': [models.Index(fields=['faculty', 'graduation_year'], name='accounts_st_faculty_c155ee_idx')],
+            },
+        ),
+    ]
@@ -480,6 +480,73 @@ class StudentProfile(models.Model):
         return reverse("accounts:student_profile", kwargs={"pk": self.pk})
 
 
+class StudentSearchDocument(models.Model):
+    """Denormalized search document for employer-facing student search.
+
+    Maintained by accounts.search from StudentProfile, the user's name and the
+    skills of their published CVs. Token fields store normalized Latin tokens
+    wrapped in spaces so that `contains=" tok"` is a word-prefix match.
+    """
+
+    profile = models.OneToOneField(
+        StudentProfile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+        verbose_name=_("Student Profile")
+    )
+    name_tokens = models.TextField(
+        blank=True,
+        verbose_name=_("Name Tokens"),
+        help_text=_("Normalized first name, last name and username")
+    )
+    skill_tokens = models.TextField(
+        blank=True,
+        verbose_name=_("Skill Tokens"),
+        help_text=_("Normalized skills from published CVs")
+    )
+    profile_tokens = models.TextField(
+        blank=True,
+        verbose_name=_("Profile Tokens"),
+        help_text=_("Normalized faculty, specialty and desired position")
+    )
+
+    # Facets
+    faculty = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        verbose_name=_("Faculty")
+    )
+    education_level = models.CharField(
+        max_length=20,
+        blank=True,
+        db_index=True,
+        verbose_name=_("Education Level")
+    )
+    graduation_year = models.IntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name=_("Graduation Year")
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At")
+    )
+
+    class Meta:
+        verbose_name = _("Student Search Document")
+        verbose_name_plural = _("Student Search Documents")
+        indexes = [
+            models.Index(fields=["faculty", "graduation_year"]),
+        ]
+
+    def __str__(self):
+        return f"Search document for {self.profile_id}"
+
+
 class AdminProfile(models.Model):
     """Profile for admin users with management permissions"""
 
@@ -752,6 +819,53 @@ class Notification(models.Model):
         self.save()
 
 
+class SiteMetricsSnapshot(models.Model):
+    """Daily snapshot of site-wide counters used by admin dashboards"""
+
+    snapshot_date = models.DateField(
+        unique=True,
+        verbose_name=_("Snapshot Date"),
+        help_text=_("Day the counters belong to (one row per day)")
+    )
+
+    # Users
+    total_users = models.PositiveIntegerField(default=0, verbose_name=_("Total Users"))
+    total_students = models.PositiveIntegerField(default=0, verbose_name=_("Students"))
+    total_employers = models.PositiveIntegerField(default=0, verbose_name=_("Employers"))
+    total_admins = models.PositiveIntegerField(default=0, verbose_name=_("Admins"))
+    new_this_week = models.PositiveIntegerField(default=0, verbose_name=_("New This Week"))
+
+    # Activity
+    active_today = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Active Today"),
+        help_text=_("Distinct users with any activity on this day")
+    )
+    logins_today = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Logins Today"),
+        help_text=_("Distinct users who logged in on this day")
+    )
+
+    # Content
+    total_jobs = models.PositiveIntegerField(default=0, verbose_name=_("Jobs"))
+    total_resumes = models.PositiveIntegerField(default=0, verbose_name=_("Resumes"))
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At"),
+        help_text=_("When the counters were last recomputed")
+    )
+
+    class Meta:
+        verbose_name = _("Site Metrics Snapshot")
+        verbose_name_plural = _("Site Metrics Snapshots")
+        ordering = ["-snapshot_date"]
+
+    def __str__(self):
+        return f"Metrics {self.snapshot_date}"
+
+
 # Signal handlers
 
 
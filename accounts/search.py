@@ -0,0 +1,185 @@
+# accounts/search.py - индекс поиска студентов для работодателей
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.search import facet_counts, token_filter, token_rank
+from core.utils import join_tokens, search_tokens
+
+from .models import CustomUser, StudentProfile, StudentSearchDocument
+
+# Поля документа, по которым считаются фасеты
+FACET_FIELDS = ("faculty", "graduation_year", "education_level")
+
+TOKEN_FIELDS = ("name_tokens", "skill_tokens", "profile_tokens")
+
+# Веса совпадений для ранжирования: (точное слово, префикс слова)
+RANK_WEIGHTS = {
+    "name_tokens": (4, 2),
+    "skill_tokens": (3, 1),
+    "profile_tokens": (1, 1),
+}
+
+
+def published_skills_by_user(user_ids):
+    """Навыки из опубликованных резюме: {user_id: [названия]} одним запросом"""
+    from cvbuilder.models import Skill
+
+    skills = {}
+    rows = Skill.objects.filter(
+        cv__user_id__in=user_ids, cv__status="published"
+    ).values_list("cv__user_id", "name")
+    for user_id, name in rows:
+        skills.setdefault(user_id, []).append(name)
+    return skills
+
+
+def build_search_document(profile, skills=()):
+    """Несохраненный документ поиска для профиля (profile.user должен быть загружен)"""
+    user = profile.user
+    return StudentSearchDocument(
+        profile=profile,
+        name_tokens=join_tokens(
+            search_tokens(user.first_name, user.last_name, user.username)
+        ),
+        skill_tokens=join_tokens(search_tokens(*skills)),
+        profile_tokens=join_tokens(
+            search_tokens(profile.faculty, profile.specialty, profile.desired_position)
+        ),
+        faculty=profile.faculty,
+        education_level=profile.education_level,
+        graduation_year=profile.graduation_year,
+    )
+
+
+def index_student_profiles(profiles):
+    """Пересобрать документы для списка профилей (upsert одним запросом)"""
+    profiles = list(profiles)
+    if not profiles:
+        return 0
+
+    skills = published_skills_by_user([profile.user_id for profile in profiles])
+    documents = [
+        build_search_document(profile, skills.get(profile.user_id, ()))
+        for profile in profiles
+    ]
+    StudentSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["profile"],
+        update_fields=[
+            "name_tokens",
+            "skill_tokens",
+            "profile_tokens",
+            "faculty",
+            "education_level",
+            "graduation_year",
+            "updated_at",
+        ],
+    )
+    return len(documents)
+
+
+def reindex_student_user(user_id):
+    """Обновить документ студента по id пользователя (если профиль есть)"""
+    profiles = StudentProfile.objects.select_related("user").filter(user_id=user_id)
+    return index_student_profiles(profiles)
+
+
+def rebuild_student_index(batch_size=1000):
+    """Полная пересборка индекса пачками по batch_size профилей"""
+    total = 0
+    batch = []
+    profiles = StudentProfile.objects.select_related("user").order_by("pk")
+    for profile in profiles.iterator(chunk_size=batch_size):
+        batch.append(profile)
+        if len(batch) >= batch_size:
+            total += index_student_profiles(batch)
+            batch = []
+    total += index_student_profiles(batch)
+    return total
+
+
+def _facet_filter(filters, exclude=None):
+    condition = Q()
+    for field in FACET_FIELDS:
+        if field != exclude and filters.get(field) not in (None, ""):
+            condition &= Q(**{field: filters[field]})
+    for token in search_tokens(filters.get("skill")):
+        condition &= Q(skill_tokens__contains=f" {token} ")
+    return condition
+
+
+def search_students(query="", **filters):
+    """
+    Поиск по индексу студентов.
+
+    Возвращает (queryset документов с select_related профиля, фасеты).
+    Фильтры: faculty, graduation_year, education_level, skill.
+    """
+    tokens = search_tokens(query)
+    base = StudentSearchDocument.objects.filter(token_filter(tokens, TOKEN_FIELDS))
+
+    documents = base.filter(_facet_filter(filters)).select_related("profile__user")
+    if tokens:
+        documents = documents.annotate(rank=token_rank(tokens, RANK_WEIGHTS)).order_by(
+            "-rank", "profile_id"
+        )
+    else:
+        documents = documents.order_by("-profile__updated_at", "profile_id")
+
+    return documents, student_facets(base, filters)
+
+
+def student_facets(queryset, filters=None):
+    """
+    Счетчики по фасетам — один GROUP BY на измерение.
+
+    Для каждого измерения применяются все фильтры, кроме его собственного,
+    чтобы в списке оставались альтернативные значения.
+    """
+    filters = filters or {}
+    return {
+        field: facet_counts(
+            queryset.filter(_facet_filter(filters, exclude=field)), field
+        )
+        for field in FACET_FIELDS
+    }
+
+
+# ============ ОБНОВЛЕНИЕ ИНДЕКСА ============
+
+
+@receiver(post_save, sender=StudentProfile)
+def index_student_profile(sender, instance, **kwargs):
+    reindex_student_user(instance.user_id)
+
+
+# Поля пользователя, которые попадают в документ поиска
+INDEXED_USER_FIELDS = {"first_name", "last_name", "username"}
+
+
+@receiver(post_save, sender=CustomUser)
+def index_student_user(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.user_type != "student":
+        return
+    # Сохранения вроде last_login/last_activity не меняют документ
+    if update_fields is not None and not INDEXED_USER_FIELDS & set(update_fields):
+        return
+    reindex_student_user(instance.pk)
+
+
+@receiver(post_save, sender="cvbuilder.CV")
+@receiver(post_delete, sender="cvbuilder.CV")
+def index_student_cv(sender, instance, **kwargs):
+    reindex_student_user(instance.user_id)
+
+
+@receiver(post_save, sender="cvbuilder.Skill")
+@receiver(post_delete, sender="cvbuilder.Skill")
+def index_student_skill(sender, instance, **kwargs):
+    from cvbuilder.models import CV
+
+    user_id = CV.objects.filter(pk=instance.cv_id).values_list("user_id", flat=True).first()
+    if user_id:
+        reindex_student_user(user_id)
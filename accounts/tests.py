@@ -1,7 +1,7 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 
-from .models import CustomUser, AdminProfile, EmployerProfile, StudentProfile
+from .models import CustomUser, AdminProfile, EmployerProfile, SiteMetricsSnapshot, StudentProfile
 
 
 class AccountCreationTests(TestCase):
@@ -107,3 +107,86 @@ class AccountCreationTests(TestCase):
 		self.assertGreaterEqual(profiles.count(), 1)
 		# Should not create duplicates
 		self.assertEqual(profiles.count(), 1)
+
+
+class SiteMetricsSnapshotTests(TestCase):
+	def setUp(self):
+		self.admin = CustomUser.objects.create_user(
+			username="statsadmin",
+			email="stats@example.com",
+			password="adminpass",
+			user_type="admin",
+		)
+		CustomUser.objects.create_user(
+			username="student1", email="s1@example.com", password="pass123", user_type="student"
+		)
+		self.client = Client()
+		self.client.force_login(self.admin)
+
+	def test_snapshot_counts_users_by_type(self):
+		from .metrics import take_metrics_snapshot
+
+		snapshot = take_metrics_snapshot()
+		self.assertEqual(snapshot.total_users, 2)
+		self.assertEqual(snapshot.total_students, 1)
+		self.assertEqual(snapshot.total_admins, 1)
+		# Повторный снимок за тот же день обновляет строку, а не создает новую
+		take_metrics_snapshot()
+		self.assertEqual(SiteMetricsSnapshot.objects.count(), 1)
+
+	def test_user_stats_api_reads_fresh_snapshot(self):
+		from .metrics import take_metrics_snapshot
+
+		take_metrics_snapshot()
+		with self.assertNumQueries(2):  # пользователь и снимок (сессия в кэше)
+			response = self.client.get(reverse("accounts:user_stats_api"))
+		self.assertEqual(response.json()["students_count"], 1)
+
+
+class StudentSearchTests(TestCase):
+	def setUp(self):
+		self.employer = CustomUser.objects.create_user(
+			username="hr", email="hr@example.com", password="pass123", user_type="employer"
+		)
+		shoxrux = CustomUser.objects.create_user(
+			username="shox", email="sh@example.com", password="pass123", user_type="student",
+			first_name="Шохрух", last_name="Ғуломов",
+		)
+		profile = shoxrux.student_profile
+		profile.faculty = "Computer Science"
+		profile.graduation_year = 2024
+		profile.save()
+
+		other = CustomUser.objects.create_user(
+			username="anna", email="anna@example.com", password="pass123", user_type="student",
+			first_name="Anna", last_name="Petrova",
+		)
+		profile = other.student_profile
+		profile.faculty = "Economics"
+		profile.graduation_year = 2023
+		profile.save()
+
+		self.client = Client()
+		self.client.force_login(self.employer)
+
+	def test_latin_query_matches_cyrillic_name(self):
+		from .search import search_students
+
+		documents, _facets = search_students("Shokhrukh gulo")
+		self.assertEqual([d.profile.user.username for d in documents], ["shox"])
+
+	def test_facets_ignore_own_filter(self):
+		from .search import search_students
+
+		documents, facets = search_students("", faculty="Economics")
+		self.assertEqual(documents.count(), 1)
+		self.assertEqual(
+			dict(facets["faculty"]), {"Computer Science": 1, "Economics": 1}
+		)
+		self.assertEqual(dict(facets["graduation_year"]), {2023: 1})
+
+	def test_student_search_view(self):
+		response = self.client.get(reverse("accounts:student_search"), {"q": "petrova"})
+		self.assertEqual(response.status_code, 200)
+		self.assertContains(response, "Anna Petrova")
+		self.assertNotContains(response, "Шохрух")
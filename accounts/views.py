@@ -1,5 +1,4 @@
 # accounts/views.py - ИСПРАВЛЕННАЯ ВЕРСИЯ
-from datetime import datetime, timedelta
 from typing import Optional, Union
 
 from django.contrib import messages
@@ -7,12 +6,14 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.paginator import Paginator
 from django.http import JsonResponse
-from django.db.models import Q
+from django.db.models import F
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from core.utils import mark_viewed
+
 from .forms import (
     EmployerRegistrationForm,
     EmployerProfileForm,
@@ -20,6 +21,12 @@ from .forms import (
     AdminProfileForm,
     UserUpdateForm,
 )
+from .metrics import (
+    SPARKLINE_FIELDS,
+    get_latest_metrics,
+    get_metrics_history,
+    sparkline_points,
+)
 from .models import (
     CustomUser,
     EmployerProfile,
@@ -28,6 +35,7 @@ from .models import (
     UserActivity,
     Notification,
 )
+from .search import search_students
 
 
 # Utility functions
@@ -339,24 +347,42 @@ def student_dashboard(request):
 @login_required
 @user_passes_test(is_employer, login_url="accounts:employer_login")
 def student_search(request):
-    """Simple student search for employers."""
+    """Student search for employers backed by StudentSearchDocument index."""
     query = request.GET.get("q", "").strip()
-    students = StudentProfile.objects.select_related("user").all()
+    filters = {
+        "faculty": request.GET.get("faculty", "").strip(),
+        "education_level": request.GET.get("education_level", "").strip(),
+        "skill": request.GET.get("skill", "").strip(),
+        "graduation_year": None,
+    }
+    try:
+        filters["graduation_year"] = int(request.GET.get("graduation_year", ""))
+    except ValueError:
+        pass
 
-    if query:
-        students = students.filter(
-            Q(user__first_name__icontains=query)
-            | Q(user__last_name__icontains=query)
-            | Q(user__username__icontains=query)
-        )
+    documents, facets = search_students(query, **filters)
 
-    paginator = Paginator(students, 12)
+    paginator = Paginator(documents, 12)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
+    education_labels = dict(StudentProfile.EDUCATION_LEVEL_CHOICES)
+    facets["education_level"] = [
+        (value, education_labels.get(value, value), count)
+        for value, count in facets["education_level"]
+    ]
+
+    # Параметры фильтров для ссылок пагинации
+    params = request.GET.copy()
+    params.pop("page", None)
+
     context = {
         "page_obj": page_obj,
+        "profiles": [document.profile for document in page_obj.object_list],
         "query": query,
+        "filters": filters,
+        "facets": facets,
+        "query_string": params.urlencode(),
     }
     return render(request, "accounts/student_search.html", context)
 
@@ -371,24 +397,21 @@ def admin_dashboard(request):
     except AdminProfile.DoesNotExist:
         admin_profile = AdminProfile.objects.create(user=request.user)
 
-    today = datetime.now().date()
-    week_ago = today - timedelta(days=7)
-
-    # ИСПРАВЛЕНО: статистика вакансий и резюме
-    from cvbuilder.models import CV
-    from jobs.models import Job
-
+    # Счетчики читаются из снимка SiteMetricsSnapshot (см. accounts/metrics.py)
+    snapshot = get_latest_metrics()
     stats = {
-        "total_users": CustomUser.objects.count(),
-        "total_students": CustomUser.objects.filter(user_type="student").count(),
-        "total_employers": CustomUser.objects.filter(user_type="employer").count(),
-        "active_today": UserActivity.objects.filter(created_at__date=today)
-        .values("user")
-        .distinct()
-        .count(),
-        "total_jobs": Job.objects.count(),
-        "total_resumes": CV.objects.count(),
-        "new_this_week": CustomUser.objects.filter(date_joined__gte=week_ago).count(),
+        "total_users": snapshot.total_users,
+        "total_students": snapshot.total_students,
+        "total_employers": snapshot.total_employers,
+        "active_today": snapshot.active_today,
+        "total_jobs": snapshot.total_jobs,
+        "total_resumes": snapshot.total_resumes,
+        "new_this_week": snapshot.new_this_week,
+    }
+
+    history = get_metrics_history()
+    sparklines = {
+        field: sparkline_points(history[field]) for field in SPARKLINE_FIELDS
     }
 
     recent_activities = UserActivity.objects.select_related("user").order_by(
@@ -398,6 +421,8 @@ def admin_dashboard(request):
     context = {
         "admin_profile": admin_profile,
         "stats": stats,
+        "sparklines": sparklines,
+        "metrics_updated_at": snapshot.updated_at,
         "recent_activities": recent_activities,
     }
 
@@ -477,16 +502,13 @@ def profile_view(request, user_id=None):
         user = request.user
         is_own_profile = True
 
-    # Увеличиваем счетчик просмотров если смотрим чужой профиль (только один раз за сессию)
+    # Увеличиваем счетчик просмотров если смотрим чужой профиль (только один раз за 24 часа)
     if user != request.user:
-        session_key = f"profile_viewed_{user.id}"
-        if not request.session.get(session_key):
-            user.profile_views = getattr(user, "profile_views", 0) + 1
-            user.save(update_fields=["profile_views"])
-            
-            # Устанавливаем флаг в сессии на 24 часа
-            request.session[session_key] = True
-            request.session.set_expiry(86400)  # 24 часа
+        if mark_viewed(request, "profile", user.id):
+            CustomUser.objects.filter(pk=user.pk).update(
+                profile_views=F("profile_views") + 1
+            )
+            user.profile_views += 1
 
             create_user_activity(
                 user=request.user,
@@ -858,23 +880,24 @@ def user_stats_api(request):
     ):
         return JsonResponse({"error": "Permission denied"}, status=403)
 
-    today = datetime.now().date()
-    week_ago = today - timedelta(days=7)
-
+    snapshot = get_latest_metrics()
     stats = {
-        "total_users": CustomUser.objects.count(),
-        "students_count": CustomUser.objects.filter(user_type="student").count(),
-        "employers_count": CustomUser.objects.filter(user_type="employer").count(),
-        "admins_count": CustomUser.objects.filter(
-            user_type__in=["admin", "main_admin"]
-        ).count(),
-        "active_today": UserActivity.objects.filter(
-            created_at__date=today, activity_type="login"
-        )
-        .values("user")
-        .distinct()
-        .count(),
-        "new_this_week": CustomUser.objects.filter(date_joined__gte=week_ago).count(),
+        "total_users": snapshot.total_users,
+        "students_count": snapshot.total_students,
+        "employers_count": snapshot.total_employers,
+        "admins_count": snapshot.total_admins,
+        "active_today": snapshot.logins_today,
+        "new_this_week": snapshot.new_this_week,
+        "updated_at": snapshot.updated_at.isoformat(),
     }
 
+    if request.GET.get("history"):
+        try:
+            days = min(max(int(request.GET["history"]), 1), 365)
+        except ValueError:
+            days = 30
+        history = get_metrics_history(days=days)
+        history["dates"] = [day.isoformat() for day in history["dates"]]
+        stats["history"] = history
+
     return JsonResponse(stats)
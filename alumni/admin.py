@@ -1,9 +1,13 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin import display
+from django.shortcuts import redirect, render
+from django.urls import path
 from django.utils.html import format_html
 # ЗАКОММЕНТИРУЙТЕ эту строку - временно отключаем modeltranslation
 # from modeltranslation.admin import TranslationAdmin
 
+from .forms import AlumniImportForm
+from .importer import AlumniImportError, import_alumni
 from .models import (
     Alumni,
     Company,
@@ -58,6 +62,7 @@ class AlumniAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
     filter_horizontal = ("skills",)
     list_per_page = 25
     date_hierarchy = "created_at"
+    change_list_template = "admin/alumni/alumni/change_list.html"
 
     fieldsets = (
         (
@@ -99,6 +104,46 @@ class AlumniAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
             )
         return "No photo"
 
+    def get_urls(self):
+        urls = [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="alumni_alumni_import",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Пакетный импорт выпускников из выгрузки регистратора"""
+        if not self.has_add_permission(request):
+            return redirect("admin:alumni_alumni_changelist")
+
+        report = None
+        form = AlumniImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                report = import_alumni(
+                    upload.file, upload.name, dry_run=form.cleaned_data["dry_run"]
+                )
+            except AlumniImportError as exc:
+                messages.error(request, str(exc))
+            else:
+                messages.success(
+                    request,
+                    f"{report.created} alumni imported, {report.skipped} rows skipped",
+                )
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import alumni",
+            "form": form,
+            "report": report,
+        }
+        return render(request, "admin/alumni/alumni/import_alumni.html", context)
+
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
@@ -383,7 +428,7 @@ class MessageAdmin(admin.ModelAdmin):
     list_display = ("sender", "receiver", "subject", "is_read", "created_at")
     list_filter = ("is_read", "created_at")
     search_fields = ("sender__name", "receiver__name", "subject", "body")
-    readonly_fields = ("created_at",)
+    readonly_fields = ("conversation", "created_at")
     date_hierarchy = "created_at"
     list_per_page = 20
 
@@ -398,7 +443,7 @@ class MessageAdmin(admin.ModelAdmin):
         ),
         (
             "Threading",
-            {"fields": ("parent_message",)},
+            {"fields": ("parent_message", "conversation")},
         ),
         (
             "Timestamps",
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AlumniConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "alumni"
+
+    def ready(self):
+        # Обработчики обновления индекса каталога, графа связей, подбора
+        # менторов, сводок переписки и версий RSS-лент
+        from . import feeds, graph, matching, messaging, search  # noqa: F401
@@ -1,9 +1,92 @@
+import hashlib
+import heapq
+import time
+from datetime import date
+from itertools import islice
+
 from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.utils.feedgenerator import Rss201rev2Feed
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
-from .models import Event, Job, News
+from .models import Alumni, Company, Event, Job, News
+
+# Сколько хранится готовый XML ленты; актуальность обеспечивают счетчики версий
+FEED_CACHE_TTL = 60 * 60
+
+FEED_VERSION_KEY = "feeds:version:{}"
+
+
+def feed_versions(sources):
+    """Текущие версии источников лент ({источник: версия})"""
+    keys = {FEED_VERSION_KEY.format(source): source for source in sources}
+    versions = cache.get_many(keys)
+    for key, source in keys.items():
+        if key not in versions:
+            # Начальное значение от времени: после вытеснения счетчика из кэша
+            # старые ключи лент не совпадут с новыми
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return {source: versions[key] for key, source in keys.items()}
+
+
+def bump_feed_version(*sources):
+    """Инвалидировать ленты, построенные из указанных источников"""
+    for source in sources:
+        key = FEED_VERSION_KEY.format(source)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+class CachedFeed(Feed):
+    """
+    Лента с кэшированием готового XML и условными GET-запросами.
+
+    Ключ кэша включает версии источников (sources), язык и хост, поэтому
+    лента перестраивается только после изменения данных. ETag и
+    Last-Modified позволяют RSS-читателям получать 304 без тела ответа.
+    """
+
+    sources = ()
+
+    def cache_key(self, request):
+        versions = feed_versions(self.sources)
+        parts = [f"{source}{versions[source]}" for source in self.sources]
+        return ":".join(
+            ["feeds", type(self).__name__, get_language() or "", request.get_host(), *parts]
+        )
+
+    def __call__(self, request, *args, **kwargs):
+        key = self.cache_key(request)
+        cached = cache.get(key)
+        if cached is None:
+            response = super().__call__(request, *args, **kwargs)
+            cached = {
+                "content": response.content,
+                "content_type": response["Content-Type"],
+                "etag": quote_etag(hashlib.md5(response.content).hexdigest()),
+                "last_modified": int(time.time()),
+            }
+            cache.set(key, cached, FEED_CACHE_TTL)
+
+        response = HttpResponse(cached["content"], content_type=cached["content_type"])
+        response["ETag"] = cached["etag"]
+        response["Last-Modified"] = http_date(cached["last_modified"])
+        return get_conditional_response(
+            request,
+            etag=cached["etag"],
+            last_modified=cached["last_modified"],
+            response=response,
+        )
 
 
 class ExtendedRSSFeed(Rss201rev2Feed):
@@ -17,16 +100,33 @@ class ExtendedRSSFeed(Rss201rev2Feed):
             handler.addQuickElement("image", item["image"])
 
 
-class LatestNewsFeed(Feed):
+def latest_news(limit):
+    return (
+        News.objects.filter(is_published=True)
+        .select_related("author")
+        .order_by("-created_at")[:limit]
+    )
+
+
+def latest_jobs(limit):
+    return (
+        Job.objects.filter(is_active=True)
+        .for_card()
+        .order_by("-created_at")[:limit]
+    )
+
+
+class LatestNewsFeed(CachedFeed):
     """RSS feed для последних новостей"""
 
     title = _("OXU Alumni - So'ngi yangiliklar")
     link = "/alumni/news/"
     description = _("OXU bitiruvchilari assotsiatsiyasining so'ngi yangiliklari")
     feed_type = ExtendedRSSFeed
+    sources = ("news",)
 
     def items(self):
-        return News.objects.filter(is_published=True).order_by("-created_at")[:20]
+        return latest_news(20)
 
     def item_title(self, item):
         return item.title
@@ -54,16 +154,17 @@ class LatestNewsFeed(Feed):
         }
 
 
-class LatestJobsFeed(Feed):
+class LatestJobsFeed(CachedFeed):
     """RSS feed для последних вакансий"""
 
     title = _("OXU Alumni - So'ngi vakansiyalar")
     link = "/alumni/jobs/"
     description = _("OXU bitiruvchilari uchun so'ngi ish vakansiyalari")
     feed_type = ExtendedRSSFeed
+    sources = ("jobs",)
 
     def items(self):
-        return Job.objects.filter(is_active=True).order_by("-created_at")[:25]
+        return latest_jobs(25)
 
     def item_title(self, item):
         return f"{item.title} - {item.company.name}"
@@ -100,19 +201,23 @@ class LatestJobsFeed(Feed):
         }
 
 
-class UpcomingEventsFeed(Feed):
+class UpcomingEventsFeed(CachedFeed):
     """RSS feed для предстоящих мероприятий"""
 
     title = _("OXU Alumni - Kelgusi tadbirlar")
     link = "/alumni/events/"
     description = _("OXU bitiruvchilari uchun kelgusi tadbirlar")
     feed_type = ExtendedRSSFeed
+    sources = ("events",)
 
-    def items(self):
-        from datetime import date
+    def cache_key(self, request):
+        # Прошедшие мероприятия выпадают из ленты со сменой даты
+        return f"{super().cache_key(request)}:{date.today().isoformat()}"
 
+    def items(self):
         return (
             Event.objects.filter(is_active=True, date__gte=date.today())
+            .select_related("organizer")
             .order_by("date")[:15]
         )
 
@@ -146,53 +251,47 @@ class UpcomingEventsFeed(Feed):
         }
 
 
-class AllUpdatesFeed(Feed):
+class AllUpdatesFeed(CachedFeed):
     """Общий RSS feed всех обновлений"""
 
     title = _("OXU Alumni - Barcha yangilanishlar")
     link = "/alumni/"
     description = _("OXU bitiruvchilari portalidagi barcha yangilanishlar")
+    sources = ("news", "jobs", "events")
 
     def items(self):
-        # Объединяем новости, вакансии и мероприятия
-        from itertools import chain
-        from datetime import datetime
-
-        news = News.objects.filter(is_published=True).order_by("-created_at")[:10]
-        jobs = Job.objects.filter(is_active=True).order_by("-created_at")[:10]
-        events = Event.objects.filter(is_active=True).order_by("-created_at")[:10]
-
-        # Сортируем все по дате создания. Use getattr to avoid mypy complaining
-        # about missing 'created_at' on the union of different model types.
-        # Use a datetime fallback so the key is always comparable
-        all_items = sorted(
-            chain(news, jobs, events),
-            key=lambda x: getattr(x, "created_at", datetime.min),
-            reverse=True,
-        )[:20]
-
-        return all_items
+        # Каждый источник уже отсортирован по created_at, поэтому достаточно
+        # k-way слияния через кучу вместо сортировки объединенного списка
+        sources = [
+            latest_news(20),
+            latest_jobs(20),
+            Event.objects.filter(is_active=True)
+            .select_related("organizer")
+            .order_by("-created_at")[:20],
+        ]
+        merged = heapq.merge(*sources, key=lambda item: item.created_at, reverse=True)
+        return list(islice(merged, 20))
 
     def item_title(self, item):
-        if hasattr(item, "content"):  # News
+        if isinstance(item, News):
             return f"📰 {item.title}"
-        elif hasattr(item, "description"):  # Job
+        elif isinstance(item, Job):
             return f"💼 {item.title} - {item.company.name}"
-        elif hasattr(item, "event_type"):  # Event
+        elif isinstance(item, Event):
             return f"🎯 {item.title}"
         return item.title
 
     def item_description(self, item):
-        if hasattr(item, "content"):  # News
+        if isinstance(item, News):
             content = item.content
             return content[:300] + "..." if len(content) > 300 else content
-        elif hasattr(item, "description"):  # Job
+        elif isinstance(item, Job):
             return (
                 f"{item.description[:200]}..."
                 if len(item.description) > 200
                 else item.description
             )
-        elif hasattr(item, "event_type"):  # Event
+        elif isinstance(item, Event):
             return (
                 f"{item.description[:200]}..."
                 if len(item.description) > 200
@@ -201,13 +300,49 @@ class AllUpdatesFeed(Feed):
         return ""
 
     def item_link(self, item):
-        if hasattr(item, "content"):  # News
+        if isinstance(item, News):
             return reverse("alumni:news_detail", kwargs={"slug": item.slug})
-        elif hasattr(item, "description"):  # Job
+        elif isinstance(item, Job):
             return reverse("alumni:job_detail", kwargs={"pk": item.pk})
-        elif hasattr(item, "event_type"):  # Event
+        elif isinstance(item, Event):
             return reverse("alumni:event_detail", kwargs={"pk": item.pk})
         return "/alumni/"
 
     def item_pubdate(self, item):
         return item.created_at
+
+
+# ============ ИНВАЛИДАЦИЯ ЛЕНТ ============
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def invalidate_news_feeds(sender, **kwargs):
+    bump_feed_version("news")
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_feeds(sender, **kwargs):
+    bump_feed_version("jobs")
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_feeds(sender, **kwargs):
+    bump_feed_version("events")
+
+
+@receiver(post_save, sender=Company)
+def invalidate_company_feeds(sender, created, **kwargs):
+    # Название и логотип компании выводятся в вакансиях
+    if not created:
+        bump_feed_version("jobs")
+
+
+@receiver(post_save, sender=Alumni)
+def invalidate_author_feeds(sender, created, update_fields=None, **kwargs):
+    # Имя выпускника выводится как автор новостей и организатор мероприятий
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    bump_feed_version("news", "events")
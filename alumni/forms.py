@@ -185,6 +185,7 @@ class AlumniProfileForm(forms.ModelForm):
                     "class": "form-control",
                     "rows": 3,
                     "placeholder": "Mutaxassislik sohalarini vergul bilan ajrating",
+                    "data-skill-autocomplete": "list",
                 }
             ),
             "years_of_experience": forms.NumberInput(attrs={"class": "form-control"}),
@@ -532,3 +533,22 @@ class ConnectionRequestForm(forms.ModelForm):
                 }
             ),
         }
+
+
+class AlumniImportForm(forms.Form):
+    """Forma import bitiruvchilar (CSV/XLSX)"""
+
+    file = forms.FileField(
+        help_text="CSV yoki XLSX: name, graduation_year, faculty, degree, email, company, skills, ...",
+        widget=forms.ClearableFileInput(attrs={"accept": ".csv,.xlsx"}),
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        help_text="Faqat tekshirish, ma'lumotlar saqlanmaydi",
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data["file"]
+        if not upload.name.lower().endswith((".csv", ".xlsx")):
+            raise ValidationError("Faqat .csv va .xlsx fayllar qabul qilinadi.")
+        return upload
@@ -0,0 +1,205 @@
+# alumni/graph.py - граф связей выпускников и рекомендации "возможно, вы знакомы"
+import heapq
+from array import array
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Connection, ConnectionSuggestion
+
+# Сколько рекомендаций хранится на одного выпускника
+SUGGESTIONS_TOP_K = 10
+
+
+class ConnectionGraph:
+    """
+    Неориентированный граф принятых связей в формате CSR.
+
+    Вершины — id выпускников (отсортированы в `nodes`), соседи вершины i —
+    `indices[indptr[i]:indptr[i + 1]]` (индексы вершин, по возрастанию).
+    Массивы array('q') занимают 8 байт на элемент, поэтому граф на 100k
+    связей держится в памяти процесса в нескольких мегабайтах.
+    """
+
+    def __init__(self, nodes, indptr, indices):
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.index = {node: i for i, node in enumerate(nodes)}
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Построить граф из пар (id, id); дубликаты и петли отбрасываются"""
+        adjacency = {}
+        for a, b in edges:
+            if a == b:
+                continue
+            adjacency.setdefault(a, set()).add(b)
+            adjacency.setdefault(b, set()).add(a)
+
+        nodes = array("q", sorted(adjacency))
+        index = {node: i for i, node in enumerate(nodes)}
+        indptr = array("q", [0])
+        indices = array("q")
+        for node in nodes:
+            indices.extend(sorted(index[other] for other in adjacency[node]))
+            indptr.append(len(indices))
+        return cls(nodes, indptr, indices)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def edge_count(self):
+        return len(self.indices) // 2
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def degree(self, i):
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def mutual_count(self, a, b):
+        """Число общих соседей двух вершин (пересечение отсортированных списков)"""
+        first, second = self.neighbors(a), self.neighbors(b)
+        i = j = count = 0
+        while i < len(first) and j < len(second):
+            if first[i] == second[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif first[i] < second[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+
+    def second_degree_counts(self, i):
+        """{вершина на расстоянии 2: число общих соседей} для вершины i"""
+        direct = set(self.neighbors(i))
+        counts = Counter()
+        for neighbor in direct:
+            counts.update(self.neighbors(neighbor))
+        counts.pop(i, None)
+        for neighbor in direct:
+            counts.pop(neighbor, None)
+        return counts
+
+    def suggestions(self, node_id, top_k=SUGGESTIONS_TOP_K):
+        """Top-k рекомендаций для выпускника: [(id, общих связей), ...]"""
+        i = self.index.get(node_id)
+        if i is None:
+            return []
+        counts = self.second_degree_counts(i)
+        best = heapq.nsmallest(
+            top_k, counts.items(), key=lambda item: (-item[1], self.nodes[item[0]])
+        )
+        return [(self.nodes[j], count) for j, count in best]
+
+
+def accepted_edges(alumni_ids=None):
+    """Пары (from_user_id, to_user_id) принятых связей, опционально для набора вершин"""
+    connections = Connection.objects.filter(status="accepted")
+    if alumni_ids is not None:
+        alumni_ids = list(alumni_ids)
+        connections = connections.filter(
+            Q(from_user_id__in=alumni_ids) | Q(to_user_id__in=alumni_ids)
+        )
+    return connections.values_list("from_user_id", "to_user_id")
+
+
+def load_connection_graph():
+    """Граф всех принятых связей одним запросом"""
+    return ConnectionGraph.from_edges(accepted_edges().iterator(chunk_size=10000))
+
+
+def load_local_graph(alumni_ids):
+    """
+    Подграф, достаточный для рекомендаций вершин alumni_ids: их связи и
+    связи их соседей (два запроса вне зависимости от степени вершин).
+    """
+    alumni_ids = set(alumni_ids)
+    first_hop = list(accepted_edges(alumni_ids))
+    neighbors = {node for edge in first_hop for node in edge} - alumni_ids
+    second_hop = list(accepted_edges(neighbors)) if neighbors else []
+    return ConnectionGraph.from_edges(first_hop + second_hop)
+
+
+def store_suggestions(graph, alumni_ids, top_k=SUGGESTIONS_TOP_K):
+    """Пересчитать и сохранить рекомендации для набора выпускников"""
+    alumni_ids = list(alumni_ids)
+    rows = [
+        ConnectionSuggestion(alumni_id=alumni_id, suggested_id=suggested_id, mutual_count=count)
+        for alumni_id in alumni_ids
+        for suggested_id, count in graph.suggestions(alumni_id, top_k)
+    ]
+    with transaction.atomic():
+        ConnectionSuggestion.objects.filter(alumni_id__in=alumni_ids).delete()
+        ConnectionSuggestion.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild_connection_suggestions(top_k=SUGGESTIONS_TOP_K, batch_size=1000):
+    """Полный пересчет: граф строится один раз, запись пачками по batch_size"""
+    graph = load_connection_graph()
+    total = 0
+    nodes = list(graph.nodes)
+    for start in range(0, len(nodes), batch_size):
+        total += store_suggestions(graph, nodes[start:start + batch_size], top_k)
+    # У выпускников без связей рекомендаций быть не может
+    ConnectionSuggestion.objects.exclude(alumni_id__in=graph.index.keys()).delete()
+    return total
+
+
+def refresh_suggestions_for_edge(from_id, to_id, top_k=SUGGESTIONS_TOP_K):
+    """
+    Инкрементальное обновление после принятия или удаления связи a-b.
+
+    Меняются рекомендации самих a и b, а также их соседей (для них меняется
+    число общих связей с b и a соответственно).
+    """
+    endpoints = {from_id, to_id}
+    affected = set(endpoints)
+    for a, b in accepted_edges(endpoints):
+        affected.update((a, b))
+    graph = load_local_graph(affected)
+    return store_suggestions(graph, affected, top_k)
+
+
+def mutual_connection_ids(first_id, second_id):
+    """id общих принятых связей двух выпускников (один запрос)"""
+    neighbors = {first_id: set(), second_id: set()}
+    for a, b in accepted_edges([first_id, second_id]):
+        if a in neighbors:
+            neighbors[a].add(b)
+        if b in neighbors:
+            neighbors[b].add(a)
+    return (neighbors[first_id] & neighbors[second_id]) - {first_id, second_id}
+
+
+# ============ ИНКРЕМЕНТАЛЬНОЕ ОБНОВЛЕНИЕ ============
+
+
+def _schedule_refresh(connection):
+    from_id, to_id = connection.from_user_id, connection.to_user_id
+    transaction.on_commit(lambda: refresh_suggestions_for_edge(from_id, to_id))
+
+
+@receiver(post_save, sender=Connection)
+def refresh_on_connection_change(sender, instance, created, update_fields=None, **kwargs):
+    # Новые запросы (pending) граф не меняют; смена статуса может добавить
+    # или убрать ребро, поэтому пересчитываем только при сохранении статуса
+    if created and instance.status != "accepted":
+        return
+    if update_fields is not None and "status" not in update_fields:
+        return
+    _schedule_refresh(instance)
+
+
+@receiver(post_delete, sender=Connection)
+def refresh_on_connection_delete(sender, instance, **kwargs):
+    if instance.status == "accepted":
+        _schedule_refresh(instance)
@@ -0,0 +1,384 @@
+# alumni/importer.py - пакетный импорт выпускников из выгрузки регистратора
+#
+# Файл (CSV или XLSX) читается потоково и обрабатывается пачками: строки
+# проверяются, компании и навыки сопоставляются через заранее загруженные
+# словари, выпускники и строки M2M пишутся через bulk_create. bulk_create не
+# вызывает сигналы, поэтому их побочные эффекты (индекс поиска, подбор
+# менторов, кэш каталога) выполняются одним пакетным шагом в конце.
+import csv
+import io
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from core.skills import skill_ids
+from core.slugs import assign_slugs
+from core.utils import normalize_search_text
+
+from .matching import MentorIndex, store_mentor_matches
+from .models import Alumni, Company, Skill
+from .search import index_alumni, invalidate_directory_cache
+
+IMPORT_BATCH_SIZE = 1000
+
+# Колонки файла (регистр и пробелы в заголовках не важны)
+IMPORT_COLUMNS = (
+    "name",
+    "graduation_year",
+    "faculty",
+    "degree",
+    "specialization",
+    "email",
+    "city",
+    "current_position",
+    "profession",
+    "company",
+    "industry",
+    "skills",
+    "expertise_areas",
+    "years_of_experience",
+    "is_mentor",
+)
+REQUIRED_COLUMNS = ("name", "graduation_year", "faculty")
+
+# Разделители списка навыков в одной ячейке
+SKILL_SEPARATORS = (";", "|")
+
+DEFAULT_SKILL_CATEGORY = "professional"
+
+TRUE_VALUES = {"1", "true", "yes", "ha", "да", "y", "+"}
+
+
+class AlumniImportError(Exception):
+    """Файл нельзя импортировать (формат, заголовки, зависимости)"""
+
+
+class ImportReport:
+    """Итоги импорта: созданные, пропущенные строки и ошибки по номерам строк"""
+
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+        self.created_ids = []
+
+    def add_error(self, row_number, message):
+        self.errors.append((row_number, message))
+        self.skipped += 1
+
+
+# ============ ЧТЕНИЕ ФАЙЛА ============
+
+
+def _header(value):
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _check_header(header):
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise AlumniImportError(f"Missing required columns: {', '.join(missing)}")
+
+
+def read_csv_rows(stream):
+    """(номер строки, {колонка: значение}) из CSV; stream — бинарный или текстовый"""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.reader(stream)
+    try:
+        header = [_header(value) for value in next(reader, [])]
+        _check_header(header)
+        for row_number, values in enumerate(reader, start=2):
+            if any(value.strip() for value in values):
+                yield row_number, dict(zip(header, values))
+    except UnicodeDecodeError:
+        # Например, выгрузка Excel в cp1251
+        raise AlumniImportError("File must be UTF-8 encoded")
+
+
+def read_xlsx_rows(stream):
+    """(номер строки, {колонка: значение}) из первого листа XLSX (read-only режим)"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise AlumniImportError("XLSX import requires the openpyxl package")
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_header(value) for value in next(rows, ())]
+        _check_header(header)
+        for row_number, values in enumerate(rows, start=2):
+            values = ["" if value is None else str(value) for value in values]
+            if any(value.strip() for value in values):
+                yield row_number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(stream, filename):
+    """Выбрать парсер по расширению файла"""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return read_csv_rows(stream)
+    if name.endswith(".xlsx"):
+        return read_xlsx_rows(stream)
+    raise AlumniImportError("Only .csv and .xlsx files are supported")
+
+
+# ============ ПРОВЕРКА СТРОК ============
+
+
+def _choice_lookup(choices):
+    """{ключ или подпись в нижнем регистре: ключ}"""
+    lookup = {}
+    for key, label in choices:
+        lookup[key.lower()] = key
+        lookup[str(label).lower()] = key
+    return lookup
+
+
+FACULTIES = _choice_lookup(Alumni.FACULTY_CHOICES)
+DEGREES = _choice_lookup(Alumni.DEGREE_CHOICES)
+INDUSTRIES = _choice_lookup(Company.INDUSTRY_CHOICES)
+
+
+def _split_skills(value):
+    for separator in SKILL_SEPARATORS:
+        value = value.replace(separator, ",")
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def clean_row(row):
+    """
+    Проверить строку и привести значения к полям Alumni.
+
+    Возвращает (поля выпускника, название компании, отрасль, навыки);
+    при ошибке бросает ValidationError.
+    """
+    value = {column: (row.get(column) or "").strip() for column in IMPORT_COLUMNS}
+
+    if not value["name"]:
+        raise ValidationError("name is required")
+
+    try:
+        graduation_year = int(float(value["graduation_year"]))
+    except (ValueError, OverflowError):
+        raise ValidationError(f"invalid graduation_year {value['graduation_year']!r}")
+    if not 1950 <= graduation_year <= date.today().year + 1:
+        raise ValidationError(f"graduation_year {graduation_year} is out of range")
+
+    faculty = FACULTIES.get(value["faculty"].lower())
+    if faculty is None:
+        raise ValidationError(f"unknown faculty {value['faculty']!r}")
+
+    degree = DEGREES.get(value["degree"].lower(), "bachelor") if value["degree"] else "bachelor"
+
+    if value["email"]:
+        validate_email(value["email"])
+
+    try:
+        years = int(float(value["years_of_experience"] or 0))
+    except (ValueError, OverflowError):
+        raise ValidationError(f"invalid years_of_experience {value['years_of_experience']!r}")
+
+    fields = {
+        "name": value["name"][:255],
+        "graduation_year": graduation_year,
+        "faculty": faculty,
+        "degree": degree,
+        "specialization": value["specialization"][:255],
+        "email": value["email"].lower(),
+        "city": value["city"][:100],
+        "current_position": value["current_position"][:255],
+        "profession": value["profession"][:255],
+        "industry": value["industry"][:255],
+        "expertise_areas": value["expertise_areas"],
+        "years_of_experience": max(years, 0),
+        "is_mentor": value["is_mentor"].lower() in TRUE_VALUES,
+    }
+    return fields, value["company"][:255], value["industry"], _split_skills(value["skills"])
+
+
+# ============ СПРАВОЧНИКИ ============
+
+
+class ReferenceCache:
+    """
+    Компании и навыки по нормализованному названию, загруженные один раз.
+
+    Недостающие записи создаются пачкой на каждый блок строк.
+    """
+
+    def __init__(self):
+        self.companies = {
+            normalize_search_text(company.name): company
+            for company in Company.objects.all()
+        }
+        self.skills = {
+            normalize_search_text(name): pk
+            for pk, name in Skill.objects.values_list("pk", "name")
+        }
+
+    def ensure_companies(self, names_with_industry):
+        missing = {}
+        for name, industry in names_with_industry:
+            key = normalize_search_text(name)
+            if key and key not in self.companies and key not in missing:
+                missing[key] = Company(
+                    name=name, industry=INDUSTRIES.get(industry.lower(), "other")
+                )
+        if missing:
+            Company.objects.bulk_create(missing.values())
+            self._reload(self.companies, missing, Company)
+
+    def ensure_skills(self, names):
+        missing = {}
+        for name in names:
+            key = normalize_search_text(name)
+            if key and key not in self.skills and key not in missing:
+                missing[key] = Skill(name=name[:100], category=DEFAULT_SKILL_CATEGORY)
+        if missing:
+            skills = assign_slugs(missing.values(), lambda skill: skill.name)
+            # bulk_create не вызывает save(): ссылки на общий словарь навыков здесь
+            canonical = skill_ids([skill.name for skill in skills], create=True)
+            for key, skill in missing.items():
+                skill.canonical_id = canonical.get(key)
+            Skill.objects.bulk_create(skills)
+            created = {}
+            self._reload(created, missing, Skill)
+            self.skills.update({key: skill.pk for key, skill in created.items()})
+
+    @staticmethod
+    def _reload(target, created, model):
+        """Записать созданные объекты; без RETURNING (MySQL) pk читаются заново"""
+        if all(obj.pk for obj in created.values()):
+            target.update(created)
+            return
+        names = [obj.name for obj in created.values()]
+        for obj in model.objects.filter(name__in=names).order_by("pk"):
+            target.setdefault(normalize_search_text(obj.name), obj)
+
+    def company(self, name):
+        return self.companies.get(normalize_search_text(name)) if name else None
+
+    def skill_ids(self, names):
+        ids = {self.skills.get(normalize_search_text(name)) for name in names}
+        ids.discard(None)
+        return ids
+
+
+# ============ ИМПОРТ ============
+
+
+def _existing_emails(emails):
+    emails = [email for email in emails if email]
+    if not emails:
+        return set()
+    return set(
+        email.lower()
+        for email in Alumni.objects.filter(email__in=emails).values_list("email", flat=True)
+    )
+
+
+def import_batch(rows, references, report, seen_emails, dry_run=False):
+    """Проверить и записать одну пачку строк [(номер строки, строка)]"""
+    cleaned = []
+    for row_number, row in rows:
+        try:
+            cleaned.append((row_number, *clean_row(row)))
+        except ValidationError as exc:
+            report.add_error(row_number, "; ".join(exc.messages))
+
+    existing = _existing_emails(fields["email"] for _n, fields, *_rest in cleaned)
+    accepted = []
+    for row_number, fields, company, industry, skills in cleaned:
+        email = fields["email"]
+        if email and (email in existing or email in seen_emails):
+            report.add_error(row_number, f"alumni with email {email} already exists")
+            continue
+        if email:
+            seen_emails.add(email)
+        accepted.append((fields, company, industry, skills))
+
+    if dry_run:
+        report.created += len(accepted)
+        return []
+
+    with transaction.atomic():
+        references.ensure_companies((company, industry) for _f, company, industry, _s in accepted)
+        references.ensure_skills(name for *_rest, skills in accepted for name in skills)
+
+        alumni = [
+            Alumni(company=references.company(company), **fields)
+            for fields, company, _industry, _skills in accepted
+        ]
+        assign_slugs(alumni, Alumni.slug_source)
+        Alumni.objects.bulk_create(alumni)
+        if not all(item.pk for item in alumni):
+            pks = dict(
+                Alumni.objects.filter(slug__in=[item.slug for item in alumni])
+                .values_list("slug", "pk")
+            )
+            for item in alumni:
+                item.pk = pks[item.slug]
+
+        Alumni.skills.through.objects.bulk_create(
+            [
+                Alumni.skills.through(alumni_id=item.pk, skill_id=skill_id)
+                for item, (_fields, _company, _industry, skills) in zip(alumni, accepted)
+                for skill_id in references.skill_ids(skills)
+            ],
+            ignore_conflicts=True,
+        )
+
+    report.created += len(alumni)
+    report.created_ids.extend(item.pk for item in alumni)
+    return alumni
+
+
+def finalize_import(alumni_ids, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Пакетная замена сигналов post_save для импортированных выпускников:
+    документы поиска, рекомендации менторов и кэш статистики каталога.
+    """
+    alumni_ids = list(alumni_ids)
+    if not alumni_ids:
+        return
+    for start in range(0, len(alumni_ids), batch_size):
+        index_alumni(
+            Alumni.objects.select_related("company").filter(
+                pk__in=alumni_ids[start:start + batch_size]
+            )
+        )
+    mentor_index = MentorIndex.load()
+    for start in range(0, len(alumni_ids), batch_size):
+        store_mentor_matches(mentor_index, alumni_ids[start:start + batch_size])
+    invalidate_directory_cache()
+
+
+def import_alumni(stream, filename, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Импортировать выпускников из CSV/XLSX.
+
+    Ошибочные строки и дубликаты по email пропускаются и попадают в
+    report.errors; остальные записываются пачками по batch_size.
+    """
+    report = ImportReport()
+    references = ReferenceCache()
+    seen_emails = set()
+
+    batch = []
+    for item in read_rows(stream, filename):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            import_batch(batch, references, report, seen_emails, dry_run)
+            batch = []
+    if batch:
+        import_batch(batch, references, report, seen_emails, dry_run)
+
+    if not dry_run:
+        finalize_import(report.created_ids, batch_size)
+    return report
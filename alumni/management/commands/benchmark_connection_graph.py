@@ -0,0 +1,60 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from alumni.graph import SUGGESTIONS_TOP_K, ConnectionGraph
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the in-memory connection graph on a synthetic graph "
+        "(no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=20000)
+        parser.add_argument("--edges", type=int, default=100000)
+        parser.add_argument("--top-k", type=int, default=SUGGESTIONS_TOP_K)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        nodes, edge_count = options["nodes"], options["edges"]
+
+        # Граф с "кластерами" (выпуски/факультеты), чтобы были общие связи
+        cluster_size = 200
+        edges = []
+        while len(edges) < edge_count:
+            a = rng.randrange(nodes)
+            if rng.random() < 0.8:
+                base = a - a % cluster_size
+                b = base + rng.randrange(min(cluster_size, nodes - base))
+            else:
+                b = rng.randrange(nodes)
+            edges.append((a, b))
+
+        started = time.perf_counter()
+        graph = ConnectionGraph.from_edges(edges)
+        build_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stored = 0
+        for node_id in graph.nodes:
+            stored += len(graph.suggestions(node_id, options["top_k"]))
+        suggest_time = time.perf_counter() - started
+
+        memory = (
+            graph.nodes.itemsize * len(graph.nodes)
+            + graph.indptr.itemsize * len(graph.indptr)
+            + graph.indices.itemsize * len(graph.indices)
+        )
+        self.stdout.write(
+            f"Graph: {len(graph)} nodes, {graph.edge_count} edges, "
+            f"CSR arrays {memory / 1024:.0f} KiB"
+        )
+        self.stdout.write(f"Build: {build_time:.2f}s")
+        self.stdout.write(
+            f"Top-{options['top_k']} suggestions for all nodes: {suggest_time:.2f}s "
+            f"({suggest_time / max(len(graph), 1) * 1000:.3f} ms/node, {stored} rows)"
+        )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from alumni.importer import IMPORT_BATCH_SIZE, AlumniImportError, import_alumni
+
+
+class Command(BaseCommand):
+    help = "Import alumni from a registrar CSV/XLSX export in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .csv or .xlsx file")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Number of rows validated and inserted per batch",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without writing anything",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], "rb") as stream:
+                report = import_alumni(
+                    stream,
+                    options["path"],
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, AlumniImportError) as exc:
+            raise CommandError(str(exc))
+
+        for row_number, message in report.errors:
+            self.stderr.write(f"Row {row_number}: {message}")
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {report.created} alumni, skipped {report.skipped} rows")
+        )
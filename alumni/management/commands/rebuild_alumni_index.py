@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from alumni.search import rebuild_alumni_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the alumni directory search index (AlumniSearchDocument)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of alumni indexed per query batch",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_alumni_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} alumni profiles"))
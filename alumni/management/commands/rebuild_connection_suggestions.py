@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from alumni.graph import SUGGESTIONS_TOP_K, rebuild_connection_suggestions
+
+
+class Command(BaseCommand):
+    help = "Recompute 'people you may know' suggestions for all alumni from accepted connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=SUGGESTIONS_TOP_K,
+            help="Number of suggestions stored per alumni",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of alumni whose suggestions are written per transaction",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild_connection_suggestions(
+            top_k=options["top_k"], batch_size=options["batch_size"]
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {total} suggestions in {elapsed:.2f}s")
+        )
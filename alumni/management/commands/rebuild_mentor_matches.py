@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from alumni.matching import MENTOR_MATCHES_TOP_K, rebuild_mentor_matches
+
+
+class Command(BaseCommand):
+    help = "Recompute mentor recommendations for all visible alumni"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=MENTOR_MATCHES_TOP_K,
+            help="Number of mentor recommendations stored per mentee",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of mentees processed per transaction",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild_mentor_matches(
+            top_k=options["top_k"], batch_size=options["batch_size"]
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {total} mentor matches in {elapsed:.2f}s")
+        )
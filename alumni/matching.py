@@ -0,0 +1,337 @@
+# alumni/matching.py - подбор менторов для выпускников
+#
+# Индекс менторов хранится в памяти процесса и перечитывается, когда меняется
+# номер версии в кэше: при изменении экспертизы, видимости, нагрузки или
+# рейтинга менторов. Правка профиля менти индекс не перечитывает.
+import heapq
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from modeltranslation import settings as mt_settings
+from modeltranslation.utils import build_localized_fieldname
+
+from core.utils import normalize_search_text
+
+from .models import Alumni, MentorMatch, Mentorship
+
+# Сколько рекомендаций хранится на одного выпускника
+MENTOR_MATCHES_TOP_K = 10
+
+# Максимум активных менти у ментора; при достижении ментор не рекомендуется
+MENTOR_CAPACITY = getattr(settings, "MENTOR_CAPACITY", 5)
+
+# Байесовское сглаживание рейтинга: PRIOR "виртуальных" оценок по PRIOR_RATING
+RATING_PRIOR = 2
+RATING_PRIOR_VALUE = 3
+
+# Бонус за совпадение факультета
+SAME_FACULTY_BONUS = 1.1
+
+MENTORS_VERSION_KEY = "alumni:mentors:version"
+
+MATCHING_TEXT_FIELDS = ("faculty", "specialization", "expertise_areas")
+
+# Поля выпускника, от которых зависят рекомендации (тексты — на всех языках)
+MATCHING_FIELDS = (
+    "is_mentor",
+    "is_visible",
+    *(
+        build_localized_fieldname(field, code)
+        for field in MATCHING_TEXT_FIELDS
+        for code in mt_settings.AVAILABLE_LANGUAGES
+    ),
+)
+
+# update_fields, после которых рекомендации нужно пересчитать
+MATCHING_UPDATE_FIELDS = {*MATCHING_FIELDS, *MATCHING_TEXT_FIELDS}
+
+_memo: tuple[int, "MentorIndex"] | None = None
+
+
+def normalize_term(value):
+    """Каноническая форма навыка/области экспертизы ("Machine  Learning" -> "machine learning")"""
+    return normalize_search_text(value)
+
+
+def alumni_terms(alumni_ids=None):
+    """
+    Нормализованные термины экспертизы выпускников: {alumni_id: set(термины)}.
+
+    Термины — навыки (M2M), области экспертизы (строка через запятую) и
+    специализация. Два запроса на любой набор выпускников.
+    """
+    alumni = Alumni.objects.all()
+    links = Alumni.skills.through.objects.all()
+    if alumni_ids is not None:
+        alumni_ids = list(alumni_ids)
+        alumni = alumni.filter(pk__in=alumni_ids)
+        links = links.filter(alumni_id__in=alumni_ids)
+
+    terms = {}
+    for pk, expertise, specialization in alumni.values_list(
+        "pk", "expertise_areas", "specialization"
+    ).iterator(chunk_size=2000):
+        phrases = expertise.split(",") + [specialization]
+        terms[pk] = {term for term in map(normalize_term, phrases) if term}
+    for alumni_id, skill_name in links.values_list("alumni_id", "skill__name"):
+        term = normalize_term(skill_name)
+        if term and alumni_id in terms:
+            terms[alumni_id].add(term)
+    return terms
+
+
+class MentorIndex:
+    """
+    Инвертированный индекс менторов по словарю терминов.
+
+    Словарь отображает термин в целочисленный id, для каждого термина хранится
+    список менторов (postings). Векторы — бинарные TF с весами IDF, сходство —
+    косинусное; скалярные произведения накапливаются только по общим терминам,
+    поэтому подбор не перебирает всех менторов для каждого менти.
+    """
+
+    def __init__(self, mentors):
+        self.mentors = mentors
+        self.vocabulary: dict[str, int] = {}
+        postings: list[list[int]] = []
+        for position, mentor in enumerate(mentors):
+            for term in mentor["terms"]:
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                if term_id == len(postings):
+                    postings.append([])
+                postings[term_id].append(position)
+        self.postings = postings
+
+        total = len(mentors)
+        self.idf = [math.log((total + 1) / (len(p) + 1)) + 1 for p in postings]
+        self.unknown_idf = math.log(total + 1) + 1
+        self.norms = [
+            math.sqrt(sum(self.idf[self.vocabulary[t]] ** 2 for t in mentor["terms"])) or 1.0
+            for mentor in mentors
+        ]
+
+    @classmethod
+    def load(cls):
+        """Индекс всех доступных менторов с их нагрузкой и рейтингом (3 запроса)"""
+        rows = (
+            Alumni.objects.filter(is_mentor=True, is_visible=True)
+            .annotate(
+                active_mentees=Count(
+                    "mentor_relationships",
+                    filter=Q(mentor_relationships__status="active"),
+                ),
+                rating_sum=Sum("mentor_relationships__rating"),
+                rating_count=Count("mentor_relationships__rating"),
+            )
+            .values_list("pk", "faculty", "active_mentees", "rating_sum", "rating_count")
+        )
+        stats = list(rows)
+        terms = alumni_terms([row[0] for row in stats])
+        mentors = []
+        for pk, faculty, active, rating_sum, rating_count in stats:
+            if not terms.get(pk) or active >= MENTOR_CAPACITY:
+                continue
+            mentors.append(
+                {
+                    "id": pk,
+                    "faculty": faculty,
+                    "terms": terms[pk],
+                    "multiplier": mentor_multiplier(active, rating_sum or 0, rating_count),
+                }
+            )
+        return cls(mentors)
+
+    def match(self, terms, faculty="", exclude=(), top_k=MENTOR_MATCHES_TOP_K):
+        """Top-k менторов для набора терминов: [(mentor_id, score, общие термины)]"""
+        dots: dict[int, float] = {}
+        shared: dict[int, list[str]] = {}
+        norm_sq = 0.0
+        for term in terms:
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                norm_sq += self.unknown_idf ** 2
+                continue
+            weight = self.idf[term_id]
+            norm_sq += weight ** 2
+            for position in self.postings[term_id]:
+                dots[position] = dots.get(position, 0.0) + weight * weight
+                shared.setdefault(position, []).append(term)
+        if not dots:
+            return []
+
+        norm = math.sqrt(norm_sq)
+        scored = []
+        for position, dot in dots.items():
+            mentor = self.mentors[position]
+            if mentor["id"] in exclude:
+                continue
+            score = dot / (norm * self.norms[position]) * mentor["multiplier"]
+            if faculty and faculty == mentor["faculty"]:
+                score *= SAME_FACULTY_BONUS
+            scored.append((score, mentor["id"], position))
+
+        best = heapq.nlargest(top_k, scored)
+        return [(mentor_id, score, sorted(shared[position])) for score, mentor_id, position in best]
+
+
+def mentor_multiplier(active_mentees, rating_sum, rating_count):
+    """Множитель ментора: свободная емкость x сглаженный рейтинг"""
+    load = max(0.0, 1 - active_mentees / MENTOR_CAPACITY)
+    rating = (rating_sum + RATING_PRIOR * RATING_PRIOR_VALUE) / (rating_count + RATING_PRIOR)
+    return load * (0.5 + rating / 10)
+
+
+def _excluded_mentors(mentee_ids):
+    """Менторы, с которыми у менти уже есть ожидающее или активное менторство"""
+    excluded: dict[int, set[int]] = {}
+    rows = Mentorship.objects.filter(
+        mentee_id__in=mentee_ids, status__in=["pending", "active"]
+    ).values_list("mentee_id", "mentor_id")
+    for mentee_id, mentor_id in rows:
+        excluded.setdefault(mentee_id, set()).add(mentor_id)
+    return excluded
+
+
+def store_mentor_matches(index, mentee_ids, top_k=MENTOR_MATCHES_TOP_K):
+    """Пересчитать и сохранить рекомендации для набора менти"""
+    mentee_ids = list(mentee_ids)
+    terms = alumni_terms(mentee_ids)
+    faculties = dict(Alumni.objects.filter(pk__in=mentee_ids).values_list("pk", "faculty"))
+    excluded = _excluded_mentors(mentee_ids)
+
+    rows = []
+    for mentee_id in mentee_ids:
+        exclude = excluded.get(mentee_id, set()) | {mentee_id}
+        for mentor_id, score, shared in index.match(
+            terms.get(mentee_id, ()), faculties.get(mentee_id, ""), exclude, top_k
+        ):
+            rows.append(
+                MentorMatch(
+                    mentee_id=mentee_id,
+                    mentor_id=mentor_id,
+                    score=score,
+                    shared_terms=",".join(shared)[:500],
+                )
+            )
+
+    with transaction.atomic():
+        MentorMatch.objects.filter(mentee_id__in=mentee_ids).delete()
+        MentorMatch.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild_mentor_matches(top_k=MENTOR_MATCHES_TOP_K, batch_size=1000):
+    """Полный пересчет рекомендаций для всех видимых выпускников пачками"""
+    index = MentorIndex.load()
+    mentee_ids = list(
+        Alumni.objects.filter(is_visible=True).order_by("pk").values_list("pk", flat=True)
+    )
+    total = 0
+    for start in range(0, len(mentee_ids), batch_size):
+        total += store_mentor_matches(index, mentee_ids[start:start + batch_size], top_k)
+    MentorMatch.objects.exclude(mentee_id__in=mentee_ids).delete()
+    return total
+
+
+def refresh_mentor_matches(mentee_ids, top_k=MENTOR_MATCHES_TOP_K):
+    """Инкрементальный пересчет для нескольких менти"""
+    mentee_ids = list(set(mentee_ids))
+    if not mentee_ids:
+        return 0
+    return store_mentor_matches(get_mentor_index(), mentee_ids, top_k)
+
+
+def mentors_version():
+    version = cache.get(MENTORS_VERSION_KEY)
+    if version is None:
+        cache.add(MENTORS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(MENTORS_VERSION_KEY)
+    return version
+
+
+def invalidate_mentors():
+    try:
+        cache.incr(MENTORS_VERSION_KEY)
+    except ValueError:
+        cache.set(MENTORS_VERSION_KEY, time.time_ns(), None)
+
+
+def get_mentor_index():
+    """Индекс менторов текущей версии: из памяти процесса или загруженный заново"""
+    global _memo
+    version = mentors_version()
+    if _memo is None or _memo[0] != version:
+        _memo = (version, MentorIndex.load())
+    return _memo[1]
+
+
+def _mentees_listing(mentor_id):
+    return MentorMatch.objects.filter(mentor_id=mentor_id).values_list("mentee_id", flat=True)
+
+
+def _schedule_refresh(mentee_ids=(), mentor_id=None, mentors_changed=False):
+    """
+    Пересчет после коммита: указанные менти плюс менти, у которых ментор уже
+    в рекомендациях (изменились его нагрузка, рейтинг или экспертиза).
+    Новые пары, появившиеся из-за изменений ментора, добавит плановый пересчет.
+    mentors_changed — изменились данные индекса менторов.
+    """
+    def refresh():
+        if mentors_changed:
+            invalidate_mentors()
+        ids = set(mentee_ids)
+        if mentor_id is not None:
+            ids.update(_mentees_listing(mentor_id))
+        refresh_mentor_matches(ids)
+
+    transaction.on_commit(refresh)
+
+
+# ============ ИНКРЕМЕНТАЛЬНОЕ ОБНОВЛЕНИЕ ============
+
+
+def _matching_update(update_fields):
+    # Счетчики вроде profile_views на рекомендации не влияют
+    return update_fields is None or not MATCHING_UPDATE_FIELDS.isdisjoint(update_fields)
+
+
+@receiver(pre_save, sender=Alumni)
+def remember_matching_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    previous = None
+    if instance.pk and not raw and _matching_update(update_fields):
+        previous = Alumni.objects.filter(pk=instance.pk).values_list(*MATCHING_FIELDS).first()
+    instance._matching_before = previous
+
+
+@receiver(post_save, sender=Alumni)
+def refresh_on_alumni_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _matching_update(update_fields):
+        return
+    previous = getattr(instance, "_matching_before", None)
+    current = tuple(getattr(instance, field) for field in MATCHING_FIELDS)
+    if not created and previous == current:
+        return
+    was_mentor = bool(previous and previous[0])
+    _schedule_refresh(
+        [instance.pk], mentor_id=instance.pk, mentors_changed=instance.is_mentor or was_mentor
+    )
+
+
+@receiver(m2m_changed, sender=Alumni.skills.through)
+def refresh_on_skills_change(sender, instance, action, reverse, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and not reverse:
+        _schedule_refresh([instance.pk], mentor_id=instance.pk, mentors_changed=instance.is_mentor)
+
+
+@receiver(post_save, sender=Mentorship)
+@receiver(post_delete, sender=Mentorship)
+def refresh_on_mentorship_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _schedule_refresh([instance.mentee_id], mentor_id=instance.mentor_id, mentors_changed=True)
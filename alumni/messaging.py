@@ -0,0 +1,180 @@
+# alumni/messaging.py - переписка выпускников: ветки и сводки для входящих
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Conversation, ConversationParticipant, Message
+
+# Сколько сообщений ветки отдается за один запрос
+THREAD_PAGE_SIZE = 30
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def send_message(sender, receiver, subject, body, parent=None):
+    """Отправить сообщение; ответ попадает в ветку родительского сообщения"""
+    return Message.objects.create(
+        sender=sender,
+        receiver=receiver,
+        subject=subject,
+        body=body,
+        parent_message=parent,
+    )
+
+
+def inbox(alumni):
+    """
+    Входящие выпускника: строки участника с последним сообщением и его
+    отправителем/получателем одним запросом, от новых к старым.
+    Стоимость зависит от числа показанных веток, а не сообщений.
+    """
+    return (
+        ConversationParticipant.objects.filter(alumni=alumni, last_message_at__isnull=False)
+        .select_related(
+            "conversation__last_message__sender",
+            "conversation__last_message__receiver",
+        )
+        .order_by("-last_message_at", "-pk")
+    )
+
+
+def counterpart(participant):
+    """Собеседник в ветке (по последнему сообщению, без дополнительных запросов)"""
+    last = participant.conversation.last_message
+    if last is None:
+        return None
+    return last.receiver if last.sender_id == participant.alumni_id else last.sender
+
+
+def unread_total(alumni):
+    """Общее число непрочитанных сообщений выпускника"""
+    return sum(
+        ConversationParticipant.objects.filter(alumni=alumni, unread_count__gt=0)
+        .values_list("unread_count", flat=True)
+    )
+
+
+def encode_cursor(message):
+    micros = (message.created_at - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}-{message.pk}"
+
+
+def decode_cursor(cursor):
+    """(created_at, id) из курсора; ValueError при неверном формате"""
+    micros, _sep, pk = cursor.partition("-")
+    try:
+        return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except OverflowError:
+        raise ValueError(f"cursor {cursor!r} is out of range")
+
+
+def thread_messages(conversation, before=None, limit=THREAD_PAGE_SIZE):
+    """
+    Страница ветки: (сообщения по возрастанию времени, курсор для более старых).
+
+    Один упорядоченный запрос по индексу (conversation, created_at); курсор
+    before — значение из предыдущей страницы (None — самые новые сообщения).
+    """
+    messages = Message.objects.filter(conversation=conversation).select_related("sender")
+    if before:
+        created_at, pk = decode_cursor(before)
+        messages = messages.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+    page = list(messages.order_by("-created_at", "-pk")[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+    page.reverse()
+    return page, next_cursor
+
+
+def mark_conversation_read(conversation, alumni):
+    """Отметить входящие сообщения ветки прочитанными и обнулить счетчик"""
+    with transaction.atomic():
+        Message.objects.filter(
+            conversation=conversation, receiver=alumni, is_read=False
+        ).update(is_read=True)
+        ConversationParticipant.objects.filter(
+            conversation=conversation, alumni=alumni
+        ).update(unread_count=0, last_read_at=timezone.now())
+
+
+def recount_unread(conversation_id, alumni_id):
+    """Пересчитать счетчик непрочитанных одного участника"""
+    unread = Message.objects.filter(
+        conversation_id=conversation_id, receiver_id=alumni_id, is_read=False
+    ).exclude(sender_id=alumni_id).count()
+    ConversationParticipant.objects.filter(
+        conversation_id=conversation_id, alumni_id=alumni_id
+    ).update(unread_count=unread)
+
+
+def rebuild_conversation(conversation_id):
+    """Пересчитать сводку ветки по ее сообщениям"""
+    messages = Message.objects.filter(conversation_id=conversation_id)
+    last = messages.order_by("-created_at", "-pk").first()
+    Conversation.objects.filter(pk=conversation_id).update(
+        last_message=last,
+        last_message_at=last.created_at if last else None,
+        message_count=messages.count(),
+    )
+    participants = ConversationParticipant.objects.filter(conversation_id=conversation_id)
+    participants.update(last_message_at=last.created_at if last else None)
+    for alumni_id in participants.values_list("alumni_id", flat=True):
+        recount_unread(conversation_id, alumni_id)
+
+
+# ============ ОБНОВЛЕНИЕ СВОДОК ============
+
+
+@receiver(pre_save, sender=Message)
+def assign_conversation(sender, instance, **kwargs):
+    if instance.conversation_id is not None:
+        return
+    if instance.parent_message_id is not None:
+        instance.conversation_id = (
+            Message.objects.filter(pk=instance.parent_message_id)
+            .values_list("conversation_id", flat=True)
+            .first()
+        )
+    if instance.conversation_id is None:
+        instance.conversation = Conversation.objects.create(subject=instance.subject)
+
+
+@receiver(post_save, sender=Message)
+def update_conversation_summary(sender, instance, created, **kwargs):
+    if not created:
+        # Правка отдельного сообщения (например, is_read в админке)
+        recount_unread(instance.conversation_id, instance.receiver_id)
+        return
+    conversation_id = instance.conversation_id
+    Conversation.objects.filter(pk=conversation_id).update(
+        last_message=instance,
+        last_message_at=instance.created_at,
+        message_count=F("message_count") + 1,
+    )
+    ConversationParticipant.objects.bulk_create(
+        [
+            ConversationParticipant(conversation_id=conversation_id, alumni_id=alumni_id)
+            for alumni_id in {instance.sender_id, instance.receiver_id}
+        ],
+        ignore_conflicts=True,
+    )
+    ConversationParticipant.objects.filter(conversation_id=conversation_id).update(
+        last_message_at=instance.created_at
+    )
+    if not instance.is_read and instance.receiver_id != instance.sender_id:
+        ConversationParticipant.objects.filter(
+            conversation_id=conversation_id, alumni_id=instance.receiver_id
+        ).update(unread_count=F("unread_count") + 1)
+
+
+@receiver(post_delete, sender=Message)
+def update_summary_on_delete(sender, instance, **kwargs):
+    conversation_id = instance.conversation_id
+    if conversation_id is not None:
+        transaction.on_commit(lambda: rebuild_conversation(conversation_id))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0003_alumni_bio_en_alumni_bio_ru_alumni_bio_uz_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlumniSearchDocument',
+            fields=[
+                ('alumni', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='alumni.alumni', verbose_name='Alumni')),
+                ('name_tokens', models.TextField(blank=True, help_text='Normalized full name', verbose_name='Name Tokens')),
+                ('skill_tokens', models.TextField(blank=True, help_text='Normalized skills and expertise areas', verbose_name='Skill Tokens')),
+                ('profile_tokens', models.TextField(blank=True, help_text='Normalized profession, position, specialization, company and city', verbose_name='Profile Tokens')),
+                ('faculty', models.CharField(blank=True, max_length=100, verbose_name='Faculty')),
+                ('graduation_year', models.IntegerField(verbose_name='Graduation Year')),
+                ('is_mentor', models.BooleanField(default=False, verbose_name='Is Mentor')),
+                ('is_visible', models.BooleanField(default=True, verbose_name='Profile Visible')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Alumni Search Document',
+                'verbose_name_plural': 'Alumni Search Documents',
+                'indexes': [models.Index(fields=['is_visible', 'faculty'], name='alumni_alum_is_visi_b0dfea_idx'), models.Index(fields=['is_visible', 'graduation_year'], name='alumni_alum_is_visi_0414e3_idx'), models.Index(fields=['is_visible', 'is_mentor'], name='alumni_alum_is_visi_b97404_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0004_alumnisearchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConnectionSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mutual_count', models.PositiveIntegerField(default=0, help_text='Number of accepted connections both alumni share', verbose_name='Mutual Connections')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('alumni', models.ForeignKey(help_text='Alumni the suggestion is shown to', on_delete=django.db.models.deletion.CASCADE, related_name='connection_suggestions', to='alumni.alumni', verbose_name='Alumni')),
+                ('suggested', models.ForeignKey(help_text='Second-degree connection being suggested', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='alumni.alumni', verbose_name='Suggested Alumni')),
+            ],
+            options={
+                'verbose_name': 'Connection Suggestion',
+                'verbose_name_plural': 'Connection Suggestions',
+                'ordering': ['-mutual_count', 'suggested_id'],
+                'indexes': [models.Index(fields=['alumni', '-mutual_count'], name='alumni_conn_alumni__c5d3d9_idx')],
+                'unique_together': {('alumni', 'suggested')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0005_connectionsuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0, help_text='Match score combining expertise similarity, load and rating', verbose_name='Score')),
+                ('shared_terms', models.CharField(blank=True, help_text='Comma-separated expertise terms both profiles share', max_length=500, verbose_name='Shared Expertise')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='Computed At')),
+                ('mentee', models.ForeignKey(help_text='Alumni the recommendation is shown to', on_delete=django.db.models.deletion.CASCADE, related_name='mentor_matches', to='alumni.alumni', verbose_name='Mentee')),
+                ('mentor', models.ForeignKey(help_text='Recommended mentor', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='alumni.alumni', verbose_name='Mentor')),
+            ],
+            options={
+                'verbose_name': 'Mentor Match',
+                'verbose_name_plural': 'Mentor Matches',
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['mentee', '-score'], name='alumni_ment_mentee__ede7d7_idx'), models.Index(fields=['mentor'], name='alumni_ment_mentor__ae801b_idx')],
+                'unique_together': {('mentee', 'mentor')},
+            },
+        ),
+    ]
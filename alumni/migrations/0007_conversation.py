@@ -0,0 +1,113 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_conversations(apps, schema_editor):
+    """Group existing messages into threads by following parent_message"""
+    Message = apps.get_model("alumni", "Message")
+    Conversation = apps.get_model("alumni", "Conversation")
+    Participant = apps.get_model("alumni", "ConversationParticipant")
+
+    thread_of = {}
+    summaries = {}
+    for message in Message.objects.order_by("created_at", "pk").iterator():
+        conversation_id = thread_of.get(message.parent_message_id)
+        if conversation_id is None:
+            conversation_id = Conversation.objects.create(subject=message.subject).pk
+        thread_of[message.pk] = conversation_id
+        message.conversation_id = conversation_id
+        message.save(update_fields=["conversation"])
+
+        summary = summaries.setdefault(conversation_id, {"count": 0, "unread": {}})
+        summary["count"] += 1
+        summary["last"] = message
+        summary["unread"].setdefault(message.sender_id, 0)
+        unread = summary["unread"]
+        unread[message.receiver_id] = unread.get(message.receiver_id, 0) + (
+            not message.is_read and message.receiver_id != message.sender_id
+        )
+
+    for conversation_id, summary in summaries.items():
+        last = summary["last"]
+        Conversation.objects.filter(pk=conversation_id).update(
+            last_message=last, last_message_at=last.created_at, message_count=summary["count"]
+        )
+        Participant.objects.bulk_create(
+            Participant(
+                conversation_id=conversation_id,
+                alumni_id=alumni_id,
+                unread_count=unread,
+                last_message_at=last.created_at,
+            )
+            for alumni_id, unread in summary["unread"].items()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0006_mentormatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0, verbose_name='Unread Messages')),
+                ('last_message_at', models.DateTimeField(blank=True, help_text='Copy of the conversation timestamp for inbox ordering', null=True, verbose_name='Last Message At')),
+                ('last_read_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Read At')),
+            ],
+            options={
+                'verbose_name': 'Conversation Participant',
+                'verbose_name_plural': 'Conversation Participants',
+                'ordering': ['-last_message_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(blank=True, help_text='Subject of the first message in the thread', max_length=255, verbose_name='Subject')),
+                ('last_message_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Message At')),
+                ('message_count', models.PositiveIntegerField(default=0, verbose_name='Message Count')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('last_message', models.ForeignKey(blank=True, help_text='Most recent message in the thread', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='alumni.message', verbose_name='Last Message')),
+            ],
+            options={
+                'verbose_name': 'Conversation',
+                'verbose_name_plural': 'Conversations',
+                'ordering': ['-last_message_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, help_text='Thread the message belongs to (assigned automatically)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='alumni.conversation', verbose_name='Conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at'], name='alumni_mess_convers_3722a1_idx'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='alumni',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversations', to='alumni.alumni', verbose_name='Alumni'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='conversation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='alumni.conversation', verbose_name='Conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationparticipant',
+            index=models.Index(fields=['alumni', '-last_message_at'], name='alumni_conv_alumni__7c8a9c_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='conversationparticipant',
+            unique_together={('conversation', 'alumni')},
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alumni', '0007_conversation'),
+        ('core', '0004_canonicalskill_skillalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alumni_skills', to='core.canonicalskill', verbose_name='Canonical Skill'),
+        ),
+    ]
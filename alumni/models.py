@@ -8,6 +8,10 @@ from phonenumber_field.modelfields import PhoneNumberField
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from core.projection import CardQuerySetMixin
+from core.skills import resolve_skill
+from core.slugs import save_with_slug
+
 User = get_user_model()
 
 
@@ -145,6 +149,15 @@ class Skill(models.Model):
         verbose_name=_("Slug"),
         help_text=_("URL-friendly identifier")
     )
+    canonical = models.ForeignKey(
+        "core.CanonicalSkill",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="alumni_skills",
+        verbose_name=_("Canonical Skill")
+    )
 
     class Meta:
         verbose_name = _("Skill")
@@ -157,6 +170,7 @@ class Skill(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
+        self.canonical_id = resolve_skill(self.name, create=True)
         super().save(*args, **kwargs)
 
 
@@ -415,15 +429,14 @@ class Alumni(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(f"{self.name}-{self.graduation_year}")
-            slug = base_slug
-            counter = 1
-            while Alumni.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            save_with_slug(self, self.slug_source(), super().save, *args, **kwargs)
+            return
         super().save(*args, **kwargs)
 
+    def slug_source(self):
+        """Текст для slug'а (см. core.slugs)"""
+        return f"{self.name}-{self.graduation_year}"
+
     def get_absolute_url(self):
         return reverse("alumni:detail", kwargs={"slug": self.slug})
 
@@ -457,6 +470,73 @@ class Alumni(models.Model):
         return self.years_of_experience >= 5
 
 
+class AlumniSearchDocument(models.Model):
+    """Denormalized search document for the alumni directory.
+
+    Maintained by alumni.search from Alumni, its company and skills.
+    Token fields store normalized Latin tokens wrapped in spaces so that
+    `contains=" tok"` is a word-prefix match.
+    """
+
+    alumni = models.OneToOneField(
+        Alumni,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+        verbose_name=_("Alumni")
+    )
+    name_tokens = models.TextField(
+        blank=True,
+        verbose_name=_("Name Tokens"),
+        help_text=_("Normalized full name")
+    )
+    skill_tokens = models.TextField(
+        blank=True,
+        verbose_name=_("Skill Tokens"),
+        help_text=_("Normalized skills and expertise areas")
+    )
+    profile_tokens = models.TextField(
+        blank=True,
+        verbose_name=_("Profile Tokens"),
+        help_text=_("Normalized profession, position, specialization, company and city")
+    )
+
+    # Facets
+    faculty = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_("Faculty")
+    )
+    graduation_year = models.IntegerField(
+        verbose_name=_("Graduation Year")
+    )
+    is_mentor = models.BooleanField(
+        default=False,
+        verbose_name=_("Is Mentor")
+    )
+    is_visible = models.BooleanField(
+        default=True,
+        verbose_name=_("Profile Visible")
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At")
+    )
+
+    class Meta:
+        verbose_name = _("Alumni Search Document")
+        verbose_name_plural = _("Alumni Search Documents")
+        indexes = [
+            models.Index(fields=["is_visible", "faculty"]),
+            models.Index(fields=["is_visible", "graduation_year"]),
+            models.Index(fields=["is_visible", "is_mentor"]),
+        ]
+
+    def __str__(self):
+        return f"Search document for {self.alumni_id}"
+
+
 class Connection(models.Model):
     """Model for networking connections between alumni"""
 
@@ -514,6 +594,46 @@ class Connection(models.Model):
         return f"{self.from_user.name} → {self.to_user.name}"
 
 
+class ConnectionSuggestion(models.Model):
+    """Precomputed "people you may know" suggestion (second-degree connection)"""
+
+    alumni = models.ForeignKey(
+        Alumni,
+        on_delete=models.CASCADE,
+        related_name="connection_suggestions",
+        verbose_name=_("Alumni"),
+        help_text=_("Alumni the suggestion is shown to")
+    )
+    suggested = models.ForeignKey(
+        Alumni,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Suggested Alumni"),
+        help_text=_("Second-degree connection being suggested")
+    )
+    mutual_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Mutual Connections"),
+        help_text=_("Number of accepted connections both alumni share")
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated At")
+    )
+
+    class Meta:
+        verbose_name = _("Connection Suggestion")
+        verbose_name_plural = _("Connection Suggestions")
+        ordering = ["-mutual_count", "suggested_id"]
+        unique_together = ["alumni", "suggested"]
+        indexes = [
+            models.Index(fields=["alumni", "-mutual_count"]),
+        ]
+
+    def __str__(self):
+        return f"{self.alumni_id} → {self.suggested_id} ({self.mutual_count})"
+
+
 class Mentorship(models.Model):
     """Model for mentorship relationships between alumni"""
 
@@ -621,6 +741,75 @@ class Mentorship(models.Model):
         return f"{self.mentor.name} → {self.mentee.name}"
 
 
+class MentorMatch(models.Model):
+    """Precomputed mentor recommendation for a mentee (see alumni.matching)"""
+
+    mentee = models.ForeignKey(
+        Alumni,
+        on_delete=models.CASCADE,
+        related_name="mentor_matches",
+        verbose_name=_("Mentee"),
+        help_text=_("Alumni the recommendation is shown to")
+    )
+    mentor = models.ForeignKey(
+        Alumni,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Mentor"),
+        help_text=_("Recommended mentor")
+    )
+    score = models.FloatField(
+        default=0,
+        verbose_name=_("Score"),
+        help_text=_("Match score combining expertise similarity, load and rating")
+    )
+    shared_terms = models.CharField(
+        max_length=500,
+        blank=True,
+        verbose_name=_("Shared Expertise"),
+        help_text=_("Comma-separated expertise terms both profiles share")
+    )
+    computed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Computed At")
+    )
+
+    class Meta:
+        verbose_name = _("Mentor Match")
+        verbose_name_plural = _("Mentor Matches")
+        ordering = ["-score"]
+        unique_together = ["mentee", "mentor"]
+        indexes = [
+            models.Index(fields=["mentee", "-score"]),
+            models.Index(fields=["mentor"]),
+        ]
+
+    def __str__(self):
+        return f"{self.mentee_id} ← {self.mentor_id} ({self.score:.2f})"
+
+    @property
+    def shared_terms_list(self):
+        return [term for term in self.shared_terms.split(",") if term]
+
+
+class JobQuerySet(CardQuerySetMixin, models.QuerySet):
+    """Alumni job querysets for lists and feeds"""
+
+    # Feeds cut the description to a short excerpt, so it stays in the card
+    card_fields = (
+        "employment_type",
+        "remote_work",
+        "salary_min",
+        "salary_max",
+        "currency",
+        "is_active",
+        "expires_at",
+        "created_at",
+    )
+    card_translated = ("title", "location", "description")
+    card_related = {"company": (("logo",), ("name",))}
+
+
 class Job(models.Model):
     """Model for job postings by alumni"""
 
@@ -763,6 +952,8 @@ class Job(models.Model):
         help_text=_("Last update to the job posting")
     )
 
+    objects = JobQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Job")
         verbose_name_plural = _("Jobs")
@@ -1059,6 +1250,15 @@ class Message(models.Model):
         verbose_name=_("Parent Message"),
         help_text=_("Parent message for replies")
     )
+    conversation = models.ForeignKey(
+        "Conversation",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="messages",
+        verbose_name=_("Conversation"),
+        help_text=_("Thread the message belongs to (assigned automatically)")
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_("Created At"),
@@ -1069,11 +1269,99 @@ class Message(models.Model):
         verbose_name = _("Message")
         verbose_name_plural = _("Messages")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["conversation", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.sender.name} to {self.receiver.name}: {self.subject}"
 
 
+class Conversation(models.Model):
+    """Message thread summary maintained by alumni.messaging"""
+
+    subject = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("Subject"),
+        help_text=_("Subject of the first message in the thread")
+    )
+    last_message = models.ForeignKey(
+        Message,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Last Message"),
+        help_text=_("Most recent message in the thread")
+    )
+    last_message_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Last Message At")
+    )
+    message_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Message Count")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Created At")
+    )
+
+    class Meta:
+        verbose_name = _("Conversation")
+        verbose_name_plural = _("Conversations")
+        ordering = ["-last_message_at"]
+
+    def __str__(self):
+        return f"{self.subject} ({self.message_count})"
+
+
+class ConversationParticipant(models.Model):
+    """Per-participant view of a conversation: inbox ordering and unread counter"""
+
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="participants",
+        verbose_name=_("Conversation")
+    )
+    alumni = models.ForeignKey(
+        Alumni,
+        on_delete=models.CASCADE,
+        related_name="conversations",
+        verbose_name=_("Alumni")
+    )
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Unread Messages")
+    )
+    last_message_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Last Message At"),
+        help_text=_("Copy of the conversation timestamp for inbox ordering")
+    )
+    last_read_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Last Read At")
+    )
+
+    class Meta:
+        verbose_name = _("Conversation Participant")
+        verbose_name_plural = _("Conversation Participants")
+        ordering = ["-last_message_at"]
+        unique_together = ["conversation", "alumni"]
+        indexes = [
+            models.Index(fields=["alumni", "-last_message_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.alumni_id} in {self.conversation_id} ({self.unread_count} unread)"
+
+
 # Signal handlers
 
 
@@ -1084,9 +1372,12 @@ def create_mentor_profile(sender, instance, created, **kwargs):
         # Resolve model dynamically to avoid import-time circular references
         from django.apps import apps
 
-        MentorProfile = apps.get_model("alumni", "MentorProfile")
-        if MentorProfile is not None:
-            MentorProfile.objects.create(alumni=instance)
+        try:
+            MentorProfile = apps.get_model("alumni", "MentorProfile")
+        except LookupError:
+            # Модели MentorProfile пока нет — данные ментора хранятся в Alumni
+            return
+        MentorProfile.objects.create(alumni=instance)
 
 
 @receiver(post_save, sender=Alumni)
@@ -0,0 +1,228 @@
+# alumni/search.py - поиск по каталогу выпускников с фасетами
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.search import facet_counts, token_filter, token_rank
+from core.utils import join_tokens, search_tokens
+
+from .models import Alumni, AlumniSearchDocument, Company, Skill
+
+# Поля документа, по которым считаются фасеты
+FACET_FIELDS = ("faculty", "graduation_year", "is_mentor")
+
+TOKEN_FIELDS = ("name_tokens", "skill_tokens", "profile_tokens")
+
+# Веса совпадений для ранжирования: (точное слово, префикс слова)
+RANK_WEIGHTS = {
+    "name_tokens": (4, 2),
+    "profile_tokens": (2, 1),
+    "skill_tokens": (2, 1),
+}
+
+# Кэш фасетов и статистики каталога без фильтров (сбрасывается при изменении Alumni)
+DIRECTORY_STATS_CACHE_KEY = "alumni:directory_stats"
+DIRECTORY_STATS_TTL = 60 * 60
+
+
+def skills_by_alumni(alumni_ids):
+    """Названия навыков выпускников: {alumni_id: [названия]} одним запросом"""
+    skills = {}
+    rows = Alumni.skills.through.objects.filter(alumni_id__in=alumni_ids).values_list(
+        "alumni_id", "skill__name"
+    )
+    for alumni_id, name in rows:
+        skills.setdefault(alumni_id, []).append(name)
+    return skills
+
+
+def build_search_document(alumni, skills=()):
+    """Несохраненный документ поиска (alumni.company должен быть загружен)"""
+    company_name = alumni.company.name if alumni.company_id else ""
+    return AlumniSearchDocument(
+        alumni=alumni,
+        name_tokens=join_tokens(search_tokens(alumni.name)),
+        skill_tokens=join_tokens(
+            search_tokens(*skills, *alumni.expertise_areas.split(","))
+        ),
+        profile_tokens=join_tokens(
+            search_tokens(
+                alumni.profession,
+                alumni.current_position,
+                alumni.specialization,
+                company_name,
+                alumni.industry,
+                alumni.city,
+            )
+        ),
+        faculty=alumni.faculty,
+        graduation_year=alumni.graduation_year,
+        is_mentor=alumni.is_mentor,
+        is_visible=alumni.is_visible,
+    )
+
+
+def index_alumni(alumni_list):
+    """Пересобрать документы для списка выпускников (upsert одним запросом)"""
+    alumni_list = list(alumni_list)
+    if not alumni_list:
+        return 0
+
+    skills = skills_by_alumni([alumni.pk for alumni in alumni_list])
+    documents = [
+        build_search_document(alumni, skills.get(alumni.pk, ()))
+        for alumni in alumni_list
+    ]
+    AlumniSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["alumni"],
+        update_fields=[
+            "name_tokens",
+            "skill_tokens",
+            "profile_tokens",
+            "faculty",
+            "graduation_year",
+            "is_mentor",
+            "is_visible",
+            "updated_at",
+        ],
+    )
+    return len(documents)
+
+
+def reindex_alumni(alumni_ids):
+    """Обновить документы выпускников по списку id"""
+    return index_alumni(
+        Alumni.objects.select_related("company").filter(pk__in=list(alumni_ids))
+    )
+
+
+def rebuild_alumni_index(batch_size=1000):
+    """Полная пересборка индекса пачками по batch_size выпускников"""
+    total = 0
+    batch = []
+    queryset = Alumni.objects.select_related("company").order_by("pk")
+    for alumni in queryset.iterator(chunk_size=batch_size):
+        batch.append(alumni)
+        if len(batch) >= batch_size:
+            total += index_alumni(batch)
+            batch = []
+    total += index_alumni(batch)
+    invalidate_directory_cache()
+    return total
+
+
+def _facet_filter(filters, exclude=None):
+    condition = Q()
+    for field in FACET_FIELDS:
+        if field != exclude and filters.get(field) not in (None, ""):
+            condition &= Q(**{field: filters[field]})
+    return condition
+
+
+def directory_facets(queryset, filters=None):
+    """
+    Счетчики по фасетам — один GROUP BY на измерение.
+
+    Для каждого измерения применяются все фильтры, кроме его собственного.
+    """
+    filters = filters or {}
+    return {
+        field: facet_counts(
+            queryset.filter(_facet_filter(filters, exclude=field)), field
+        )
+        for field in FACET_FIELDS
+    }
+
+
+def get_directory_stats():
+    """Фасеты и общие счетчики каталога без фильтров (из кэша)"""
+    stats = cache.get(DIRECTORY_STATS_CACHE_KEY)
+    if stats is None:
+        visible = Alumni.objects.filter(is_visible=True)
+        stats = visible.aggregate(
+            total_alumni=Count("pk"),
+            mentor_count=Count("pk", filter=Q(is_mentor=True)),
+            companies_count=Count("company", distinct=True),
+            countries_count=Count("country", distinct=True, filter=~Q(country="")),
+        )
+        stats["facets"] = directory_facets(
+            AlumniSearchDocument.objects.filter(is_visible=True)
+        )
+        cache.set(DIRECTORY_STATS_CACHE_KEY, stats, DIRECTORY_STATS_TTL)
+    return stats
+
+
+def invalidate_directory_cache():
+    cache.delete(DIRECTORY_STATS_CACHE_KEY)
+
+
+def search_alumni(query="", profession="", company="", **filters):
+    """
+    Поиск по каталогу выпускников.
+
+    query ищется во всех полях документа, profession и company — только в
+    профессиональных полях. Фильтры: faculty, graduation_year, is_mentor.
+    Возвращает (queryset документов с select_related выпускника, фасеты).
+    """
+    tokens = search_tokens(query)
+    profile_only = search_tokens(profession, company)
+
+    base = AlumniSearchDocument.objects.filter(is_visible=True).filter(
+        token_filter(tokens, TOKEN_FIELDS),
+        token_filter(profile_only, ("profile_tokens",)),
+    )
+    documents = base.filter(_facet_filter(filters)).select_related("alumni__company")
+
+    rank_tokens = tokens + profile_only
+    if rank_tokens:
+        documents = documents.annotate(
+            rank=token_rank(rank_tokens, RANK_WEIGHTS)
+        ).order_by("-rank", "-graduation_year", "alumni__name")
+        facets = directory_facets(base, filters)
+    else:
+        documents = documents.order_by("-graduation_year", "alumni__name")
+        has_filters = any(filters.get(field) not in (None, "") for field in FACET_FIELDS)
+        facets = directory_facets(base, filters) if has_filters else get_directory_stats()["facets"]
+
+    return documents, facets
+
+
+# ============ ОБНОВЛЕНИЕ ИНДЕКСА ============
+
+
+@receiver(post_save, sender=Alumni)
+def index_saved_alumni(sender, instance, **kwargs):
+    reindex_alumni([instance.pk])
+    invalidate_directory_cache()
+
+
+@receiver(post_delete, sender=Alumni)
+def invalidate_deleted_alumni(sender, instance, **kwargs):
+    invalidate_directory_cache()
+
+
+@receiver(m2m_changed, sender=Alumni.skills.through)
+def index_alumni_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # instance — навык; при post_clear pk_set пуст, затронутые уже не найти
+        if pk_set:
+            reindex_alumni(pk_set)
+    else:
+        reindex_alumni([instance.pk])
+
+
+@receiver(post_save, sender=Company)
+def index_company_alumni(sender, instance, created, **kwargs):
+    if not created:
+        reindex_alumni(instance.alumni_set.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Skill)
+def index_skill_alumni(sender, instance, created, **kwargs):
+    if not created:
+        reindex_alumni(instance.alumni_set.values_list("pk", flat=True))
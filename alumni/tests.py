@@ -1,2 +1,346 @@
+import io
+import os
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from .feeds import AllUpdatesFeed
+from .graph import ConnectionGraph, mutual_connection_ids, rebuild_connection_suggestions
+from .importer import AlumniImportError, import_alumni
+from .matching import MENTOR_CAPACITY, get_mentor_index, rebuild_mentor_matches
+from .messaging import inbox, mark_conversation_read, send_message, thread_messages
+from .models import (
+	Alumni,
+	Company,
+	Connection,
+	ConnectionSuggestion,
+	ConversationParticipant,
+	Job,
+	MentorMatch,
+	Mentorship,
+	News,
+	Skill,
+)
+from .search import get_directory_stats, search_alumni
+
+
+class AlumniDirectorySearchTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		company = Company.objects.create(name="Uzcard", industry="finance")
+		self.python = Skill.objects.create(name="Python", category="technical")
+		self.alisher = Alumni.objects.create(
+			name="Алишер Каримов",
+			graduation_year=2020,
+			faculty="engineering",
+			profession="Backend developer",
+			company=company,
+			is_mentor=True,
+		)
+		self.alisher.skills.add(self.python)
+		Alumni.objects.create(
+			name="Dilnoza Rahimova",
+			graduation_year=2022,
+			faculty="economics",
+			profession="Analyst",
+		)
+
+	def test_search_by_transliterated_name_and_skill(self):
+		documents, _facets = search_alumni("alisher python")
+		self.assertEqual([d.alumni for d in documents], [self.alisher])
+
+	def test_company_filter_uses_profile_tokens(self):
+		documents, _facets = search_alumni(company="uzcard")
+		self.assertEqual([d.alumni for d in documents], [self.alisher])
+
+	def test_facets_with_filters(self):
+		documents, facets = search_alumni(faculty="economics")
+		self.assertEqual(documents.count(), 1)
+		self.assertEqual(dict(facets["faculty"]), {"engineering": 1, "economics": 1})
+		self.assertEqual(dict(facets["is_mentor"]), {False: 1})
+
+	def test_directory_stats_cache_invalidated_on_save(self):
+		self.assertEqual(get_directory_stats()["total_alumni"], 2)
+		Alumni.objects.create(name="New Graduate", graduation_year=2024, faculty="law")
+		self.assertEqual(get_directory_stats()["total_alumni"], 3)
+		self.assertIn((2024, 1), get_directory_stats()["facets"]["graduation_year"])
+
+	def test_alumni_list_view(self):
+		response = self.client.get(reverse("alumni:list"), {"mentors": "on"})
+		self.assertEqual(response.status_code, 200)
+		self.assertContains(response, "Алишер Каримов")
+		self.assertNotContains(response, "Dilnoza Rahimova")
+
+
+class ConnectionSuggestionTests(TestCase):
+	def setUp(self):
+		self.a, self.b, self.c, self.d = [
+			Alumni.objects.create(name=name, graduation_year=2021, faculty="law")
+			for name in ("Aziz", "Bekzod", "Charos", "Dilshod")
+		]
+
+	def connect(self, first, second):
+		with self.captureOnCommitCallbacks(execute=True):
+			return Connection.objects.create(from_user=first, to_user=second, status="accepted")
+
+	def test_graph_mutual_counts_and_suggestions(self):
+		graph = ConnectionGraph.from_edges([(1, 2), (1, 3), (4, 2), (4, 3), (5, 2)])
+		self.assertEqual(graph.suggestions(1), [(4, 2), (5, 1)])
+		self.assertEqual(graph.mutual_count(graph.index[1], graph.index[4]), 2)
+
+	def test_suggestions_follow_accept_and_remove(self):
+		self.connect(self.a, self.b)
+		connection = self.connect(self.b, self.c)
+		self.connect(self.d, self.c)
+
+		suggested = ConnectionSuggestion.objects.filter(alumni=self.a)
+		self.assertEqual([(s.suggested, s.mutual_count) for s in suggested], [(self.c, 1)])
+		self.assertEqual(mutual_connection_ids(self.a.pk, self.c.pk), {self.b.pk})
+
+		with self.captureOnCommitCallbacks(execute=True):
+			connection.delete()
+		self.assertFalse(ConnectionSuggestion.objects.filter(alumni=self.a).exists())
+		self.assertFalse(ConnectionSuggestion.objects.filter(alumni=self.d, suggested=self.b).exists())
+
+	def test_full_rebuild_matches_incremental(self):
+		self.connect(self.a, self.b)
+		self.connect(self.b, self.c)
+		before = set(ConnectionSuggestion.objects.values_list("alumni", "suggested", "mutual_count"))
+		rebuild_connection_suggestions()
+		after = set(ConnectionSuggestion.objects.values_list("alumni", "suggested", "mutual_count"))
+		self.assertEqual(before, after)
+
+
+class MentorMatchingTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.ml = Skill.objects.create(name="Machine Learning", category="technical")
+		self.mentor = Alumni.objects.create(
+			name="Mentor One", graduation_year=2010, faculty="engineering",
+			is_mentor=True, expertise_areas="Machine learning, Data Science",
+		)
+		self.busy = Alumni.objects.create(
+			name="Mentor Busy", graduation_year=2011, faculty="engineering",
+			is_mentor=True, expertise_areas="Machine Learning",
+		)
+		self.other = Alumni.objects.create(
+			name="Mentor Law", graduation_year=2012, faculty="law",
+			is_mentor=True, expertise_areas="Contract law",
+		)
+		self.mentee = Alumni.objects.create(
+			name="Mentee", graduation_year=2024, faculty="engineering",
+			expertise_areas="data science",
+		)
+		self.mentee.skills.add(self.ml)
+
+	def test_matches_rank_by_similarity_and_load(self):
+		for i in range(MENTOR_CAPACITY):
+			student = Alumni.objects.create(name=f"Student {i}", graduation_year=2024, faculty="law")
+			Mentorship.objects.create(mentor=self.busy, mentee=student, status="active")
+
+		rebuild_mentor_matches()
+		matches = list(MentorMatch.objects.filter(mentee=self.mentee))
+		self.assertEqual([m.mentor for m in matches], [self.mentor])
+		self.assertEqual(matches[0].shared_terms_list, ["data science", "machine learning"])
+
+	def test_request_refreshes_matches_incrementally(self):
+		rebuild_mentor_matches()
+		self.assertTrue(MentorMatch.objects.filter(mentee=self.mentee, mentor=self.mentor).exists())
+		with self.captureOnCommitCallbacks(execute=True):
+			Mentorship.objects.create(mentor=self.mentor, mentee=self.mentee)
+		self.assertFalse(MentorMatch.objects.filter(mentee=self.mentee, mentor=self.mentor).exists())
+
+	def test_mentor_index_reloads_only_for_mentor_changes(self):
+		rebuild_mentor_matches()
+		index = get_mentor_index()
+		with self.captureOnCommitCallbacks(execute=True):
+			self.mentee.bio = "Hello"
+			self.mentee.save()
+			self.mentee.expertise_areas = "contract law"
+			self.mentee.save()
+		self.assertIs(get_mentor_index(), index)
+		self.assertTrue(MentorMatch.objects.filter(mentee=self.mentee, mentor=self.other).exists())
+
+		with self.captureOnCommitCallbacks(execute=True):
+			self.other.is_visible = False
+			self.other.save()
+		self.assertIsNot(get_mentor_index(), index)
+		self.assertFalse(MentorMatch.objects.filter(mentee=self.mentee, mentor=self.other).exists())
+
+
+class ConversationTests(TestCase):
+	def setUp(self):
+		from accounts.models import CustomUser
+
+		self.user = CustomUser.objects.create_user(
+			username="aziza", email="aziza@example.com", password="pass12345"
+		)
+		self.aziza = Alumni.objects.create(name="Aziza", graduation_year=2019, user=self.user)
+		self.bobur = Alumni.objects.create(name="Bobur", graduation_year=2018)
+
+	def test_replies_share_conversation_summary(self):
+		first = send_message(self.bobur, self.aziza, "Hello", "Salom")
+		reply = send_message(self.aziza, self.bobur, "Re: Hello", "Va alaykum", parent=first)
+		send_message(self.bobur, self.aziza, "Re: Hello", "Qalaysiz?", parent=reply)
+
+		conversation = first.conversation
+		conversation.refresh_from_db()
+		self.assertEqual(reply.conversation_id, conversation.pk)
+		self.assertEqual(conversation.message_count, 3)
+		self.assertEqual(conversation.last_message.body, "Qalaysiz?")
+		unread = dict(conversation.participants.values_list("alumni__name", "unread_count"))
+		self.assertEqual(unread, {"Aziza": 2, "Bobur": 1})
+
+		mark_conversation_read(conversation, self.aziza)
+		self.assertEqual(
+			ConversationParticipant.objects.get(conversation=conversation, alumni=self.aziza).unread_count,
+			0,
+		)
+		self.assertFalse(conversation.messages.filter(receiver=self.aziza, is_read=False).exists())
+
+	def test_thread_cursor_pages_backwards(self):
+		first = send_message(self.bobur, self.aziza, "Thread", "0")
+		parent = first
+		for i in range(1, 5):
+			parent = send_message(self.aziza, self.bobur, "Thread", str(i), parent=parent)
+
+		page, cursor = thread_messages(first.conversation, limit=2)
+		self.assertEqual([m.body for m in page], ["3", "4"])
+		page, cursor = thread_messages(first.conversation, before=cursor, limit=2)
+		self.assertEqual([m.body for m in page], ["1", "2"])
+		page, cursor = thread_messages(first.conversation, before=cursor, limit=2)
+		self.assertEqual([m.body for m in page], ["0"])
+		self.assertIsNone(cursor)
+		with self.assertRaises(ValueError):
+			thread_messages(first.conversation, before=f"{10 ** 20}-1")
+
+	def test_inbox_query_count_independent_of_messages(self):
+		for i in range(3):
+			other = Alumni.objects.create(name=f"Sender {i}", graduation_year=2020)
+			message = send_message(other, self.aziza, f"Topic {i}", "Body")
+			for _ in range(3):
+				message = send_message(self.aziza, other, "Re", "Reply", parent=message)
+
+		with self.assertNumQueries(1):
+			rows = [
+				(p.conversation.subject, p.conversation.last_message.sender.name)
+				for p in inbox(self.aziza)
+			]
+		self.assertEqual(len(rows), 3)
+
+		self.client.force_login(self.user)
+		response = self.client.get(reverse("alumni:inbox"))
+		self.assertEqual(response.status_code, 200)
+		self.assertContains(response, "Sender 2")
+
+	def test_conversation_view_marks_read_and_history_api(self):
+		message = send_message(self.bobur, self.aziza, "Hi", "Salom")
+		self.client.force_login(self.user)
+
+		response = self.client.get(reverse("alumni:conversation_detail", args=[message.conversation_id]))
+		self.assertEqual(response.status_code, 200)
+		message.refresh_from_db()
+		self.assertTrue(message.is_read)
+
+		response = self.client.get(
+			reverse("alumni:conversation_messages", args=[message.conversation_id]),
+			{"before": "bad"},
+		)
+		self.assertEqual(response.status_code, 400)
+		response = self.client.get(reverse("alumni:conversation_messages", args=[message.conversation_id]))
+		self.assertEqual([m["body"] for m in response.json()["results"]], ["Salom"])
+
+
+class CachedFeedTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.author = Alumni.objects.create(name="Editor", graduation_year=2015)
+		self.company = Company.objects.create(name="Uzcard", industry="finance")
+		self.news = News.objects.create(title="Old news", slug="old-news", content="Text", author=self.author)
+		self.job = Job.objects.create(
+			title="Backend developer", company=self.company, posted_by=self.author,
+			employment_type="full_time", location="Tashkent", description="Python",
+		)
+
+	def test_cached_feed_and_conditional_get(self):
+		url = reverse("alumni:news_feed")
+		first = self.client.get(url)
+		self.assertEqual(first.status_code, 200)
+		self.assertIn("ETag", first)
+
+		with self.assertNumQueries(0):
+			second = self.client.get(url)
+		self.assertEqual(second.content, first.content)
+
+		not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+		self.assertEqual(not_modified.status_code, 304)
+
+		self.news.title = "Fresh news"
+		self.news.save()
+		changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+		self.assertEqual(changed.status_code, 200)
+		self.assertContains(changed, "Fresh news")
+
+	def test_all_updates_merges_sources_by_date(self):
+		items = AllUpdatesFeed().items()
+		self.assertEqual(items, [self.job, self.news])
+		self.assertIn("Uzcard", AllUpdatesFeed().item_title(self.job))
+
+
+IMPORT_CSV = """Name,Graduation Year,Faculty,Degree,Email,Company,Industry,Skills,Is Mentor
+Alisher Karimov,2024,engineering,master,alisher@example.com,Uzcard,finance,Python; Django,yes
+Alisher Karimov,2024,Software Engineering,,alisher2@example.com,uzcard,,python,
+Bad Year,19xx,engineering,,,,,,
+Duplicate,2024,law,,alisher@example.com,,,,
+Nodir Aliev,2023,law,,,New Corp,,Contract Law,
+"""
+
+
+class AlumniImportTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.python = Skill.objects.create(name="Python", category="technical")
+
+	def test_import_batches_resolve_references_and_skip_bad_rows(self):
+		stream = io.BytesIO(IMPORT_CSV.encode("utf-8-sig"))
+		report = import_alumni(stream, "class-2024.csv", batch_size=2)
+
+		self.assertEqual(report.created, 3)
+		self.assertEqual([row for row, _message in report.errors], [4, 5])
+		alisher = Alumni.objects.filter(name="Alisher Karimov").order_by("pk")
+		self.assertEqual([a.slug for a in alisher], ["alisher-karimov-2024", "alisher-karimov-2024-1"])
+		self.assertEqual(alisher[1].faculty, "engineering")
+		self.assertTrue(alisher[0].is_mentor)
+		self.assertEqual(Company.objects.filter(name__iexact="uzcard").count(), 1)
+		self.assertEqual(
+			sorted(alisher[0].skills.values_list("name", flat=True)), ["Django", "Python"]
+		)
+		self.assertEqual(Skill.objects.filter(name="Python").count(), 1)
+		# Побочные эффекты сигналов выполнены пакетно
+		documents, _facets = search_alumni("nodir")
+		self.assertEqual([d.alumni.name for d in documents], ["Nodir Aliev"])
+
+	def test_command_dry_run_writes_nothing(self):
+		with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as handle:
+			handle.write(IMPORT_CSV)
+		self.addCleanup(os.remove, handle.name)
+
+		out = io.StringIO()
+		call_command("import_alumni", handle.name, "--dry-run", stdout=out, stderr=io.StringIO())
+		self.assertIn("Validated 3 alumni", out.getvalue())
+		self.assertFalse(Alumni.objects.exists())
+
+	def test_non_utf8_file_and_overflowing_numbers_are_reported(self):
+		stream = io.BytesIO("Name,Graduation Year,Faculty\nАлишер,2024,law\n".encode("cp1251"))
+		with self.assertRaisesMessage(AlumniImportError, "File must be UTF-8 encoded"):
+			import_alumni(stream, "export.csv")
+
+		stream = io.BytesIO(
+			b"Name,Graduation Year,Faculty,Years Of Experience\nA,inf,law,\nB,2024,law,1e400\n"
+		)
+		report = import_alumni(stream, "export.csv")
+		self.assertEqual(report.created, 0)
+		self.assertEqual([row for row, _message in report.errors], [2, 3])
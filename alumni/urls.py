@@ -8,6 +8,7 @@ app_name = "alumni"
 urlpatterns = [
     # Основные маршруты
     path("", views.alumni_list, name="list"),
+    path("export/", views.alumni_export, name="export"),
     path("profile/", views.alumni_profile, name="profile"),
     path("profile/edit/", views.alumni_profile_edit, name="profile_edit"),
     path("dashboard/", views.dashboard, name="dashboard"),
@@ -25,6 +26,11 @@ urlpatterns = [
     path("news/", views.news_list, name="news_list"),
     path("news/<slug:slug>/", views.news_detail, name="news_detail"),
     # Менторство
+    path(
+        "mentorship/recommendations/",
+        views.mentor_recommendations,
+        name="mentor_recommendations",
+    ),
     path(
         "mentorship/<slug:alumni_slug>/request/",
         views.mentorship_request,
@@ -36,6 +42,24 @@ urlpatterns = [
         views.connection_request,
         name="connection_request",
     ),
+    path(
+        "connections/suggestions/",
+        views.connection_suggestions,
+        name="connection_suggestions",
+    ),
+    # Сообщения
+    path("messages/", views.inbox, name="inbox"),
+    path("messages/<int:pk>/", views.conversation_detail, name="conversation_detail"),
+    path(
+        "messages/<int:pk>/history/",
+        views.conversation_messages,
+        name="conversation_messages",
+    ),
+    path(
+        "messages/new/<slug:alumni_slug>/",
+        views.message_compose,
+        name="message_compose",
+    ),
     # RSS feeds
     path("feeds/news/", LatestNewsFeed(), name="news_feed"),
     path("feeds/jobs/", LatestJobsFeed(), name="jobs_feed"),
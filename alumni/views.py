@@ -1,72 +1,145 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import F, Q
+from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+
+from core.exports import export_response
+from core.utils import mark_viewed
 
 from .forms import (
     AlumniProfileForm,
     JobApplicationForm,
     MentorshipRequestForm,
+    MessageForm,
+)
+from .graph import mutual_connection_ids
+from .messaging import (
+    counterpart,
+    encode_cursor,
+    inbox as inbox_for,
+    mark_conversation_read,
+    send_message,
+    thread_messages,
 )
 from .models import (
     Alumni,
     Company,
     Connection,
+    ConnectionSuggestion,
+    ConversationParticipant,
     Event,
     Job,
+    MentorMatch,
     Mentorship,
     News,
 )
+from .search import get_directory_stats, search_alumni
 
 
-def alumni_list(request):
-    """Список всех выпускников"""
-    alumni_list = Alumni.objects.filter(is_visible=True)
+def directory_filters(request):
+    """Фильтры каталога из GET-параметров (общие для списка и выгрузки)"""
+    graduation_year = request.GET.get("graduation_year") or request.GET.get("year")
+    return {
+        "faculty": request.GET.get("faculty", ""),
+        "graduation_year": int(graduation_year) if graduation_year and graduation_year.isdigit() else None,
+        "is_mentor": True if request.GET.get("mentors") else None,
+    }
 
-    # Фильтрация
-    faculty = request.GET.get("faculty")
-    graduation_year = request.GET.get("graduation_year")
-    search_query = request.GET.get("search")
 
-    if faculty:
-        alumni_list = alumni_list.filter(faculty=faculty)
-    if graduation_year:
-        alumni_list = alumni_list.filter(graduation_year=graduation_year)
-    if search_query:
-        alumni_list = alumni_list.filter(
-            Q(name__icontains=search_query)
-            | Q(profession__icontains=search_query)
-            | Q(company__name__icontains=search_query)
-            | Q(specialization__icontains=search_query)
-        )
+def search_directory(request, filters):
+    return search_alumni(
+        request.GET.get("search", ""),
+        profession=request.GET.get("profession", ""),
+        company=request.GET.get("company", ""),
+        **filters,
+    )
+
+
+def alumni_list(request):
+    """Список всех выпускников (поиск по индексу AlumniSearchDocument)"""
+    filters = directory_filters(request)
+    documents, facets = search_directory(request, filters)
 
     # Пагинация
-    paginator = Paginator(alumni_list, 20)
+    paginator = Paginator(documents, 20)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
+    faculty_labels = dict(Alumni.FACULTY_CHOICES)
+    stats = get_directory_stats()
+
     context = {
         "page_obj": page_obj,
-        "faculties": Alumni.FACULTY_CHOICES,
-        "graduation_years": sorted(
-            set(Alumni.objects.values_list("graduation_year", flat=True)), reverse=True
-        ),
+        "alumni": page_obj,
+        "alumni_results": [document.alumni for document in page_obj.object_list],
+        "filters": filters,
+        "faculties": [
+            (value, faculty_labels.get(value, value), count)
+            for value, count in facets["faculty"]
+        ],
+        "graduation_years": facets["graduation_year"],
+        "mentor_facet": dict(facets["is_mentor"]).get(True, 0),
+        "total_alumni": stats["total_alumni"],
+        "mentor_count": stats["mentor_count"],
+        "companies_count": stats["companies_count"],
+        "countries_count": stats["countries_count"],
     }
     return render(request, "alumni/alumni_list.html", context)
 
 
+# Колонки выгрузки каталога: {ключ: (заголовок, значение из документа поиска)}
+ALUMNI_EXPORT_COLUMNS = {
+    "name": ("Name", lambda doc: doc.alumni.name),
+    "graduation_year": ("Graduation year", lambda doc: doc.alumni.graduation_year),
+    "faculty": ("Faculty", lambda doc: doc.alumni.get_faculty_display()),
+    "degree": ("Degree", lambda doc: doc.alumni.get_degree_display()),
+    "specialization": ("Specialization", lambda doc: doc.alumni.specialization),
+    "position": ("Current position", lambda doc: doc.alumni.current_position),
+    "company": ("Company", lambda doc: doc.alumni.company.name if doc.alumni.company else ""),
+    "profession": ("Profession", lambda doc: doc.alumni.profession),
+    "industry": ("Industry", lambda doc: doc.alumni.industry),
+    "city": ("City", lambda doc: doc.alumni.city),
+    "country": ("Country", lambda doc: str(doc.alumni.country.name) if doc.alumni.country else ""),
+    "email": ("Email", lambda doc: doc.alumni.email),
+    "is_mentor": ("Mentor", lambda doc: "yes" if doc.alumni.is_mentor else "no"),
+    "url": ("Profile", lambda doc: reverse("alumni:alumni_detail", kwargs={"slug": doc.alumni.slug})),
+}
+
+
+@login_required
+def alumni_export(request):
+    """Выгрузка каталога (CSV/XLSX) с фильтрами списка выпускников; для админов"""
+    if not (request.user.is_staff or getattr(request.user, "can_manage_users", False)):
+        return HttpResponseForbidden()
+
+    documents, _facets = search_directory(request, directory_filters(request))
+    return export_response(request, documents, ALUMNI_EXPORT_COLUMNS, "alumni")
+
+
 def alumni_detail(request, slug):
     """Детальная страница выпускника"""
     alumni = get_object_or_404(Alumni, slug=slug, is_visible=True)
 
-    # Увеличиваем счетчик просмотров
-    if request.user != alumni.user:
+    # Увеличиваем счетчик просмотров (без полного save() и сигналов индексации)
+    if request.user != alumni.user and mark_viewed(request, "alumni", alumni.pk):
+        Alumni.objects.filter(pk=alumni.pk).update(profile_views=F("profile_views") + 1)
         alumni.profile_views += 1
-        alumni.save()
+
+    # Общие связи с текущим пользователем
+    mutual_connections_count = 0
+    if request.user.is_authenticated and request.user != alumni.user:
+        viewer_id = (
+            Alumni.objects.filter(user=request.user).values_list("pk", flat=True).first()
+        )
+        if viewer_id:
+            mutual_connections_count = len(mutual_connection_ids(viewer_id, alumni.pk))
 
     context = {
         "alumni": alumni,
+        "mutual_connections_count": mutual_connections_count,
     }
     return render(request, "alumni/alumni_detail.html", context)
 
@@ -112,7 +185,7 @@ def alumni_profile(request):
 
 def job_list(request):
     """Список вакансий"""
-    job_list = Job.objects.filter(is_active=True)
+    job_list = Job.objects.filter(is_active=True).for_card()
 
     # Фильтрация
     employment_type = request.GET.get("employment_type")
@@ -403,8 +476,15 @@ def dashboard(request):
         connection_requests = Connection.objects.filter(
             to_user=alumni, status="pending"
         )
-        recent_jobs = Job.objects.filter(is_active=True).order_by("-created_at")[:5]
+        recent_jobs = Job.objects.filter(is_active=True).for_card().order_by("-created_at")[:5]
         upcoming_events = Event.objects.filter(is_active=True).order_by("date")[:5]
+        connection_suggestions = (
+            ConnectionSuggestion.objects.filter(alumni=alumni, suggested__is_visible=True)
+            .select_related("suggested")[:5]
+        )
+        mentor_matches = (
+            MentorMatch.objects.filter(mentee=alumni).select_related("mentor")[:5]
+        )
 
         context = {
             "alumni": alumni,
@@ -412,9 +492,185 @@ def dashboard(request):
             "connection_requests": connection_requests,
             "recent_jobs": recent_jobs,
             "upcoming_events": upcoming_events,
+            "connection_suggestions": connection_suggestions,
+            "mentor_matches": mentor_matches,
         }
         return render(request, "alumni/dashboard.html", context)
 
     except Alumni.DoesNotExist:
         messages.info(request, "Iltimos, profilingizni to'ldiring.")
         return redirect("alumni:profile_edit")
+
+
+@login_required
+def connection_suggestions(request):
+    """API: рекомендации "возможно, вы знакомы" (предрассчитанные)"""
+    alumni = Alumni.objects.filter(user=request.user).first()
+    if alumni is None:
+        return JsonResponse({"error": "Alumni profile not found"}, status=404)
+
+    suggestions = ConnectionSuggestion.objects.filter(
+        alumni=alumni, suggested__is_visible=True
+    ).select_related("suggested")
+
+    data = [
+        {
+            "id": suggestion.suggested_id,
+            "name": suggestion.suggested.name,
+            "url": reverse("alumni:alumni_detail", kwargs={"slug": suggestion.suggested.slug}),
+            "mutual_connections": suggestion.mutual_count,
+        }
+        for suggestion in suggestions
+    ]
+    return JsonResponse({"results": data})
+
+
+@login_required
+def mentor_recommendations(request):
+    """API: рекомендованные менторы (предрассчитанные)"""
+    alumni = Alumni.objects.filter(user=request.user).first()
+    if alumni is None:
+        return JsonResponse({"error": "Alumni profile not found"}, status=404)
+
+    matches = MentorMatch.objects.filter(mentee=alumni).select_related("mentor")
+    data = [
+        {
+            "id": match.mentor_id,
+            "name": match.mentor.name,
+            "url": reverse("alumni:alumni_detail", kwargs={"slug": match.mentor.slug}),
+            "score": round(match.score, 4),
+            "shared_expertise": match.shared_terms_list,
+        }
+        for match in matches
+    ]
+    return JsonResponse({"results": data})
+
+
+@login_required
+def inbox(request):
+    """Входящие: ветки переписки с последним сообщением и счетчиком непрочитанных"""
+    alumni = Alumni.objects.filter(user=request.user).first()
+    if alumni is None:
+        messages.info(request, "Iltimos, profilingizni to'ldiring.")
+        return redirect("alumni:profile_edit")
+
+    paginator = Paginator(inbox_for(alumni), 20)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    for participant in page_obj:
+        participant.counterpart = counterpart(participant)
+
+    context = {
+        "alumni": alumni,
+        "page_obj": page_obj,
+        "conversations": page_obj,
+    }
+    return render(request, "alumni/inbox.html", context)
+
+
+def _get_participant(request, pk):
+    alumni = get_object_or_404(Alumni, user=request.user)
+    return get_object_or_404(
+        ConversationParticipant.objects.select_related(
+            "conversation__last_message__sender",
+            "conversation__last_message__receiver",
+        ),
+        conversation_id=pk,
+        alumni=alumni,
+    )
+
+
+@login_required
+def conversation_detail(request, pk):
+    """Ветка переписки: последние сообщения, отметка о прочтении и ответ"""
+    participant = _get_participant(request, pk)
+    conversation = participant.conversation
+    other = counterpart(participant)
+
+    if request.method == "POST":
+        form = MessageForm(request.POST)
+        if form.is_valid() and other is not None:
+            send_message(
+                participant.alumni,
+                other,
+                form.cleaned_data["subject"],
+                form.cleaned_data["body"],
+                parent=conversation.last_message,
+            )
+            return redirect("alumni:conversation_detail", pk=pk)
+    else:
+        form = MessageForm(initial={"subject": conversation.subject})
+
+    thread, next_cursor = thread_messages(conversation)
+    if participant.unread_count:
+        mark_conversation_read(conversation, participant.alumni)
+
+    context = {
+        "conversation": conversation,
+        "counterpart": other,
+        "thread": thread,
+        "next_cursor": next_cursor,
+        "form": form,
+    }
+    return render(request, "alumni/conversation.html", context)
+
+
+@login_required
+def conversation_messages(request, pk):
+    """API: более старые сообщения ветки по курсору ?before=..."""
+    participant = _get_participant(request, pk)
+    try:
+        thread, next_cursor = thread_messages(
+            participant.conversation, before=request.GET.get("before")
+        )
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+    data = [
+        {
+            "id": message.pk,
+            "sender": message.sender.name,
+            "is_mine": message.sender_id == participant.alumni_id,
+            "subject": message.subject,
+            "body": message.body,
+            "created_at": message.created_at.isoformat(),
+            "cursor": encode_cursor(message),
+        }
+        for message in thread
+    ]
+    return JsonResponse({"results": data, "next_cursor": next_cursor})
+
+
+@login_required
+def message_compose(request, alumni_slug):
+    """Новое сообщение выпускнику (начинает новую ветку)"""
+    receiver = get_object_or_404(Alumni, slug=alumni_slug, is_visible=True)
+
+    try:
+        sender = Alumni.objects.get(user=request.user)
+    except Alumni.DoesNotExist:
+        messages.error(request, "Iltimos, avval profilingizni to'ldiring.")
+        return redirect("alumni:profile_edit")
+
+    if sender == receiver:
+        messages.error(request, "Siz o'zingizga xabar yubora olmaysiz.")
+        return redirect("alumni:alumni_detail", slug=alumni_slug)
+
+    if request.method == "POST":
+        form = MessageForm(request.POST)
+        if form.is_valid():
+            message = send_message(
+                sender,
+                receiver,
+                form.cleaned_data["subject"],
+                form.cleaned_data["body"],
+            )
+            messages.success(request, "Xabar yuborildi!")
+            return redirect("alumni:conversation_detail", pk=message.conversation_id)
+    else:
+        form = MessageForm()
+
+    context = {
+        "form": form,
+        "receiver": receiver,
+    }
+    return render(request, "alumni/message_compose.html", context)
@@ -114,6 +114,23 @@ DATABASES = {
 # }
 
 
+# Кэш (в продакшене заменить на Redis/Memcached, общий для всех процессов)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "oxu-career",
+    }
+}
+
+# Сессии: "cached_db" читает из кэша и пишет в БД только при изменении сессии.
+# Альтернативы: "django.contrib.sessions.backends.db",
+# "django.contrib.sessions.backends.signed_cookies".
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# Дедупликация просмотров (core.utils.mark_viewed) — bloom-фильтр в кэше
+VIEW_DEDUP_TTL = 86400  # 24 часа
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -3,7 +3,8 @@ from django.contrib.admin import display
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
-from .models import ContactMessage
+from .models import CanonicalSkill, ContactMessage, SkillAlias
+from .skills import merge_skills
 
 
 class ContactMessageAdmin(admin.ModelAdmin):
@@ -145,6 +146,37 @@ class ContactMessageAdmin(admin.ModelAdmin):
 # Регистрация модели
 admin.site.register(ContactMessage, ContactMessageAdmin)
 
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+    fields = ("name", "key")
+    readonly_fields = ("key",)
+
+
+@admin.register(CanonicalSkill)
+class CanonicalSkillAdmin(admin.ModelAdmin):
+    """Shared skill vocabulary with aliases and synonyms"""
+
+    list_display = ("name", "key", "created_at")
+    search_fields = ("name", "key", "aliases__name")
+    readonly_fields = ("key", "created_at")
+    inlines = [SkillAliasInline]
+    actions = ["merge_selected"]
+
+    @admin.action(description=_("Merge selected skills into the oldest one"))
+    def merge_selected(self, request, queryset):
+        skills = list(queryset.order_by("created_at", "pk"))
+        if len(skills) < 2:
+            self.message_user(request, _("Select at least two skills to merge."))
+            return
+        merge_skills(skills[0], skills[1:])
+        self.message_user(
+            request,
+            _("%(count)d skills merged into %(name)s.")
+            % {"count": len(skills) - 1, "name": skills[0].name},
+        )
+
 # Дополнительно: если у вас есть другие модели в core, добавьте их здесь
 # Например, для модели Settings (если есть)
 
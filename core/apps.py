@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        # Сброс словаря навыков в памяти процессов при изменении навыков
+        from . import skills  # noqa: F401
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from alumni.models import Skill as AlumniSkill
+from core.skills import skill_ids
+from core.utils import skill_key
+from cvbuilder.models import Skill as CVSkill
+from jobs.models import Job
+from jobs.skills import SKILL_COLUMNS, sync_job_skills
+
+
+def chunks(queryset, size):
+    """Пачки объектов по возрастанию pk (без OFFSET)"""
+    last = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last).order_by("pk")[:size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1].pk
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse existing job, CV and alumni skills into the shared skill "
+        "vocabulary and link them to canonical skills"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Relink CV and alumni skills that already have a canonical skill",
+        )
+
+    def handle(self, *args, **options):
+        size = max(options["chunk_size"], 1)
+
+        columns = [column for names in SKILL_COLUMNS.values() for column in names]
+        links = 0
+        for jobs in chunks(Job.objects.only("pk", *columns), size):
+            links += sync_job_skills(jobs)
+        self.stdout.write(f"Jobs: {links} skill links")
+
+        for label, model in (("CV skills", CVSkill), ("Alumni skills", AlumniSkill)):
+            skills = model.objects.only("pk", "name")
+            if not options["all"]:
+                skills = skills.filter(canonical__isnull=True)
+            linked = 0
+            for batch in chunks(skills, size):
+                canonical = skill_ids([skill.name for skill in batch], create=True)
+                for skill in batch:
+                    skill.canonical_id = canonical.get(skill_key(skill.name))
+                model.objects.bulk_update(batch, ["canonical"])
+                linked += len(batch)
+            self.stdout.write(f"{label}: {linked} linked")
+
+        self.stdout.write(self.style.SUCCESS("Skill vocabulary backfill finished"))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_contactmessage_admin_notes_en_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Skill Name')),
+                ('key', models.CharField(editable=False, help_text='Lowercase Latin form used to match spelling variants', max_length=100, unique=True, verbose_name='Normalized Name')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Canonical Skill',
+                'verbose_name_plural': 'Canonical Skills',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Alias')),
+                ('key', models.CharField(editable=False, max_length=100, unique=True, verbose_name='Normalized Name')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='core.canonicalskill', verbose_name='Skill')),
+            ],
+            options={
+                'verbose_name': 'Skill Alias',
+                'verbose_name_plural': 'Skill Aliases',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -1,7 +1,10 @@
 # core/models.py
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from .utils import skill_key
+
 class ContactMessage(models.Model):
     STATUS_CHOICES = [
         ("new", _("New")),
@@ -53,3 +56,66 @@ class ContactMessage(models.Model):
             "spam": "red",
         }
         return colors.get(self.status, "gray")
+
+
+class CanonicalSkill(models.Model):
+    """Skill shared by jobs, CVs and alumni profiles; spelling variants are aliases"""
+
+    name = models.CharField(max_length=100, verbose_name=_("Skill Name"))
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        editable=False,
+        verbose_name=_("Normalized Name"),
+        help_text=_("Lowercase Latin form used to match spelling variants")
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+
+    class Meta:
+        verbose_name = _("Canonical Skill")
+        verbose_name_plural = _("Canonical Skills")
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.key = skill_key(self.name)
+        super().save(*args, **kwargs)
+
+
+class SkillAlias(models.Model):
+    """Alternative spelling or synonym resolved to a canonical skill"""
+
+    skill = models.ForeignKey(
+        CanonicalSkill,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+        verbose_name=_("Skill")
+    )
+    name = models.CharField(max_length=100, verbose_name=_("Alias"))
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        editable=False,
+        verbose_name=_("Normalized Name")
+    )
+
+    class Meta:
+        verbose_name = _("Skill Alias")
+        verbose_name_plural = _("Skill Aliases")
+        ordering = ["name"]
+
+    def __str__(self):
+        return f"{self.name} → {self.skill}"
+
+    def clean(self):
+        duplicate = CanonicalSkill.objects.filter(key=skill_key(self.name))
+        if duplicate.exclude(pk=self.skill_id).exists():
+            raise ValidationError(
+                {"name": _("This name is already a separate skill; merge the skills instead.")}
+            )
+
+    def save(self, *args, **kwargs):
+        self.key = skill_key(self.name)
+        super().save(*args, **kwargs)
@@ -0,0 +1,53 @@
+# core/projection.py - выборка только нужных колонок для карточек списков
+#
+# modeltranslation хранит каждое переводимое поле в колонке на каждый язык
+# (title_uz, title_ru, title_en), и SELECT * в списках тянет тексты всех
+# языков, включая длинные описания. for_card() загружает поля карточки, а из
+# переводимых — только колонки активного языка и его запасных языков: этого
+# достаточно дескриптору modeltranslation, чтобы вернуть значение с откатом.
+from django.db import models
+from modeltranslation import settings as mt_settings
+from modeltranslation.utils import build_localized_fieldname, get_language, resolution_order
+
+
+def card_languages(lang=None):
+    """Язык и его запасные языки в порядке, в котором их читает modeltranslation"""
+    if lang not in mt_settings.AVAILABLE_LANGUAGES:
+        lang = get_language()
+    return [code for code in resolution_order(lang) if code in mt_settings.AVAILABLE_LANGUAGES]
+
+
+def localized_fields(fields, lang=None, prefix=""):
+    """Колонки переводимых полей для языка и запасных: title -> title_ru, title_en"""
+    languages = card_languages(lang)
+    return [
+        f"{prefix}{build_localized_fieldname(field, code)}"
+        for field in fields
+        for code in languages
+    ]
+
+
+class CardQuerySetMixin(models.QuerySet):
+    """
+    QuerySet с методом for_card(lang) для списков.
+
+    card_fields — обычные поля карточки, card_translated — переводимые,
+    card_related — {путь связи: (поля, переводимые поля)} для select_related.
+    """
+
+    card_fields: tuple[str, ...] = ()
+    card_translated: tuple[str, ...] = ()
+    card_related: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+
+    def card_columns(self, lang=None):
+        columns = [*self.card_fields, *localized_fields(self.card_translated, lang)]
+        for relation, (fields, translated) in self.card_related.items():
+            prefix = f"{relation}__"
+            # Сама связь не может быть отложена при select_related
+            columns.append(relation)
+            columns += [f"{prefix}{field}" for field in fields]
+            columns += localized_fields(translated, lang, prefix)
+        return columns
+
+    def for_card(self, lang=None):
+        return self.select_related(*self.card_related).only(*self.card_columns(lang))
@@ -0,0 +1,48 @@
+# core/search.py - общие помощники для поиска по денормализованным документам
+#
+# Документ поиска хранит нормализованные токены (core.utils.search_tokens)
+# в текстовых полях вида " tok1 tok2 ", поэтому `contains=" tok"` означает
+# совпадение с началом слова, а `contains=" tok "` — точное совпадение слова.
+from django.db.models import Case, Count, Q, Value, When
+
+
+def token_filter(tokens, fields):
+    """Каждый токен должен совпасть с началом слова хотя бы в одном из полей"""
+    condition = Q()
+    for token in tokens:
+        prefix = f" {token}"
+        any_field = Q()
+        for field in fields:
+            any_field |= Q(**{f"{field}__contains": prefix})
+        condition &= any_field
+    return condition
+
+
+def token_rank(tokens, weights):
+    """
+    Выражение релевантности для annotate().
+
+    weights: {поле: (вес точного слова, вес префикса)}. Для каждого токена и
+    поля берется лучший из двух вариантов, результаты суммируются.
+    """
+    rank = Value(0)
+    for token in tokens:
+        exact, prefix = f" {token} ", f" {token}"
+        for field, (exact_weight, prefix_weight) in weights.items():
+            rank = rank + Case(
+                When(**{f"{field}__contains": exact}, then=Value(exact_weight)),
+                When(**{f"{field}__contains": prefix}, then=Value(prefix_weight)),
+                default=Value(0),
+            )
+    return rank
+
+
+def facet_counts(queryset, field):
+    """Счетчики значений поля одним GROUP BY: [(значение, количество), ...]"""
+    rows = (
+        queryset.exclude(**{f"{field}__isnull": True})
+        .values(field)
+        .annotate(count=Count("pk"))
+        .order_by("-count", field)
+    )
+    return [(row[field], row["count"]) for row in rows if row[field] != ""]
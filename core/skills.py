@@ -0,0 +1,294 @@
+# core/skills.py - общий словарь навыков
+#
+# Навыки вакансий (текст через запятую), резюме и выпускников сводятся к
+# записям CanonicalSkill. Другие написания и синонимы ("JS", "Javascript")
+# хранятся как SkillAlias. Ключ записи — skill_key() названия, поэтому
+# регистр, алфавит (кириллица/латиница) и пунктуация не различаются.
+# Приложения ссылаются на CanonicalSkill, и сравнение навыков сводится к
+# соединению по целым id вместо icontains по тексту.
+#
+# Словарь "ключ -> id" с префиксным индексом для подсказок загружается в
+# память процесса одним проходом и перечитывается, когда меняется номер
+# версии в кэше (при изменении навыков и синонимов). Подсказки на каждое
+# нажатие клавиши не обращаются к базе.
+import re
+import time
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CanonicalSkill, SkillAlias
+from .utils import skill_key
+
+SKILLS_VERSION_KEY = "core:skills:version"
+
+# Подсказки: по умолчанию и не больше
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+# Префиксы до этой длины отвечаются готовыми списками
+SHORT_PREFIX_LENGTH = 2
+
+# Через сколько секунд словарь перечитывается ради свежей популярности
+VOCABULARY_MAX_AGE = 60 * 60
+
+_SEPARATORS_RE = re.compile(r"[,;|\n]+")
+
+_memo: tuple[int, "SkillVocabulary"] | None = None
+
+
+def split_skills(text):
+    """Названия навыков из строки через запятую (а также ; | и перевод строки)"""
+    return [name.strip() for name in _SEPARATORS_RE.split(text or "") if name.strip()]
+
+
+def skills_version():
+    version = cache.get(SKILLS_VERSION_KEY)
+    if version is None:
+        cache.add(SKILLS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(SKILLS_VERSION_KEY)
+    return version
+
+
+def invalidate_skills():
+    try:
+        cache.incr(SKILLS_VERSION_KEY)
+    except ValueError:
+        cache.set(SKILLS_VERSION_KEY, time.time_ns(), None)
+
+
+def _link_relations():
+    """(модель, поле) ссылок приложений на CanonicalSkill, кроме синонимов"""
+    for relation in CanonicalSkill._meta.related_objects:
+        if relation.related_model is not SkillAlias and relation.one_to_many:
+            yield relation.related_model, relation.field.name
+
+
+def skill_weights():
+    """Популярность навыков: {id: число ссылок вакансий, резюме и выпускников}"""
+    weights = {}
+    for model, field in _link_relations():
+        rows = (
+            model.objects.filter(**{f"{field}__isnull": False})
+            .order_by()
+            .values_list(field)
+            .annotate(count=Count("pk"))
+        )
+        for pk, count in rows:
+            weights[pk] = weights.get(pk, 0) + count
+    return weights
+
+
+class SkillVocabulary:
+    """
+    Ключи навыков и синонимов -> id канонического навыка, id -> название,
+    и префиксный индекс для подсказок.
+
+    Индекс — отсортированный массив ключей (названия, синонимы и их хвосты с
+    начала каждого слова, чтобы "learn" находил "Machine Learning") с
+    параллельным массивом id; префикс — непрерывный диапазон, найденный
+    bisect. Для коротких префиксов, диапазон которых велик, лучшие навыки
+    по популярности посчитаны заранее.
+    """
+
+    def __init__(self, ids, names, weights=None):
+        self.ids = ids
+        self.names = names
+        self.weights = weights or {}
+        self.loaded_at = time.monotonic()
+
+        fragments = set()
+        for key, pk in ids.items():
+            words = key.split()
+            for position in range(len(words)):
+                fragments.add((" ".join(words[position:]), pk))
+        ordered = sorted(fragments)
+        self.prefix_keys = [fragment for fragment, _pk in ordered]
+        self.prefix_ids = [pk for _fragment, pk in ordered]
+
+        candidates = {}
+        for fragment, pk in ordered:
+            for length in range(1, min(len(fragment), SHORT_PREFIX_LENGTH) + 1):
+                candidates.setdefault(fragment[:length], set()).add(pk)
+        self.short_prefixes = {
+            prefix: self._ranked(pks)[:AUTOCOMPLETE_MAX_LIMIT]
+            for prefix, pks in candidates.items()
+        }
+
+    @classmethod
+    def load(cls):
+        ids = dict(SkillAlias.objects.order_by().values_list("key", "skill_id"))
+        names = {}
+        # Собственное название навыка важнее совпадающего синонима
+        for pk, key, name in CanonicalSkill.objects.order_by().values_list("pk", "key", "name"):
+            ids[key] = pk
+            names[pk] = name
+        return cls(ids, names, skill_weights())
+
+    def resolve(self, name):
+        return self.ids.get(skill_key(name))
+
+    def _ranked(self, pks):
+        return sorted(pks, key=lambda pk: (-self.weights.get(pk, 0), self.names[pk].lower()))
+
+    def complete(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """[(id, название)] навыков, ключ или синоним которых начинается с prefix"""
+        key = skill_key(prefix)
+        if not key:
+            return []
+        limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+        if len(key) <= SHORT_PREFIX_LENGTH:
+            pks = self.short_prefixes.get(key, [])[:limit]
+        else:
+            start = bisect_left(self.prefix_keys, key)
+            end = bisect_left(self.prefix_keys, key + "\uffff", start)
+            pks = self._ranked(set(self.prefix_ids[start:end]))[:limit]
+        return [(pk, self.names[pk]) for pk in pks]
+
+
+def get_vocabulary():
+    """
+    Словарь текущей версии: из памяти процесса или загруженный заново.
+
+    Новые навыки и синонимы меняют версию; популярность навыков меняется
+    постоянно, поэтому словарь перечитывается и по возрасту.
+    """
+    global _memo
+    version = skills_version()
+    if (
+        _memo is None
+        or _memo[0] != version
+        or time.monotonic() - _memo[1].loaded_at > VOCABULARY_MAX_AGE
+    ):
+        _memo = (version, SkillVocabulary.load())
+    return _memo[1]
+
+
+def complete_skills(prefix, limit=AUTOCOMPLETE_LIMIT):
+    """Подсказки навыков по началу названия без запросов к базе"""
+    return get_vocabulary().complete(prefix, limit)
+
+
+def skill_ids(names, create=False):
+    """
+    {ключ: id канонического навыка} для названий names.
+
+    Читается из базы (два запроса по уникальным ключам), а не из словаря в
+    памяти, поэтому годится для записи ссылок внутри транзакций. Неизвестные
+    названия пропускаются, а при create=True добавляются одним bulk_create.
+    """
+    wanted = {}
+    for name in names:
+        key = skill_key(name)
+        if key:
+            wanted.setdefault(key, name.strip())
+    if not wanted:
+        return {}
+
+    # Собственное название навыка важнее совпадающего синонима
+    ids = dict(SkillAlias.objects.filter(key__in=wanted).values_list("key", "skill_id"))
+    ids.update(CanonicalSkill.objects.filter(key__in=wanted).values_list("key", "pk"))
+
+    missing = [key for key in wanted if key not in ids]
+    if create and missing:
+        # Параллельный запрос мог добавить те же навыки — конфликты пропускаются
+        CanonicalSkill.objects.bulk_create(
+            [CanonicalSkill(name=wanted[key][:100], key=key) for key in missing],
+            ignore_conflicts=True,
+        )
+        ids.update(CanonicalSkill.objects.filter(key__in=missing).values_list("key", "pk"))
+        transaction.on_commit(invalidate_skills)
+    return {key: ids[key] for key in wanted if key in ids}
+
+
+def resolve_skills(names, create=False):
+    """id канонических навыков для названий (без повторов, в порядке появления)"""
+    return list(dict.fromkeys(skill_ids(names, create=create).values()))
+
+
+def resolve_skill(name, create=False):
+    ids = resolve_skills([name], create=create)
+    return ids[0] if ids else None
+
+
+def canonical_name(name):
+    """Каноническое название известного навыка, иначе name без лишних пробелов"""
+    vocabulary = get_vocabulary()
+    pk = vocabulary.resolve(name)
+    return vocabulary.names[pk] if pk is not None else " ".join(name.split())
+
+
+def canonical_names(text):
+    """
+    Строка навыков для сохранения из формы: известные навыки заменяются
+    каноническими названиями, повторы (с учетом синонимов) убираются.
+    """
+    vocabulary = get_vocabulary()
+    names = {}
+    for name in split_skills(text):
+        key = skill_key(name)
+        if not key:
+            continue
+        pk = vocabulary.ids.get(key)
+        names.setdefault(key if pk is None else pk, name if pk is None else vocabulary.names[pk])
+    return ", ".join(names.values())
+
+
+def merge_skills(target, others):
+    """
+    Объединить навыки others с target: ссылки приложений переводятся на
+    target, названия и синонимы others становятся синонимами target.
+    """
+    other_ids = [skill.pk for skill in others if skill.pk != target.pk]
+    if not other_ids:
+        return
+    with transaction.atomic():
+        for model, field in _link_relations():
+            partners = [
+                name
+                for constraint in model._meta.total_unique_constraints
+                if field in constraint.fields and len(constraint.fields) == 2
+                for name in constraint.fields
+                if name != field
+            ]
+            # По одному навыку: связи с уникальностью (объект, навык), которые
+            # уже есть у target, удаляются, остальные переводятся на target
+            for other_id in other_ids:
+                links = model.objects.filter(**{field: other_id})
+                for partner in partners:
+                    # Список, а не подзапрос: MySQL не удаляет по подзапросу к той же таблице
+                    owned = list(
+                        model.objects.filter(**{field: target}).values_list(partner, flat=True)
+                    )
+                    links.filter(**{f"{partner}__in": owned}).delete()
+                links.update(**{field: target})
+        SkillAlias.objects.filter(skill_id__in=other_ids).update(skill=target)
+        merged = CanonicalSkill.objects.filter(pk__in=other_ids)
+        names = list(merged.values_list("name", flat=True))
+        merged.delete()
+        SkillAlias.objects.bulk_create(
+            [SkillAlias(skill=target, name=name, key=skill_key(name)) for name in names],
+            ignore_conflicts=True,
+        )
+        transaction.on_commit(invalidate_skills)
+
+
+# ============ СБРОС СЛОВАРЯ ============
+
+
+@receiver(post_save, sender=CanonicalSkill)
+@receiver(post_save, sender=SkillAlias)
+def invalidate_skills_on_save(sender, raw=False, **kwargs):
+    # Версия меняется после фиксации, чтобы словарь не перечитали без новых строк
+    if not raw:
+        transaction.on_commit(invalidate_skills)
+
+
+@receiver(post_delete, sender=CanonicalSkill)
+@receiver(post_delete, sender=SkillAlias)
+def invalidate_skills_on_delete(sender, **kwargs):
+    transaction.on_commit(invalidate_skills)
@@ -0,0 +1,152 @@
+# core/slugs.py - выделение уникальных slug'ов без перебора запросами
+#
+# Вместо цикла `while Model.objects.filter(slug=slug).exists()` (запрос на
+# каждую коллизию) занятые суффиксы "base", "base-1", "base-2", ... читаются
+# одним запросом `slug__startswith=base`, и следующий свободный выбирается в
+# памяти. Гонку двух одновременных сохранений ловит уникальный индекс:
+# при IntegrityError slug выделяется заново.
+import re
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Место под суффикс "-NNNNNNN" при обрезке длинных base-slug'ов
+SLUG_SUFFIX_RESERVE = 8
+
+# Сколько раз повторять сохранение после конфликта уникального slug'а
+SLUG_RETRY_ATTEMPTS = 5
+
+# Сколько base-slug'ов проверяется одним запросом в пакетном режиме
+SLUG_BULK_CHUNK = 200
+
+_SUFFIX_RE = re.compile(r"(.+)-(\d+)")
+
+
+def base_slug(model, value, field="slug", fallback=None):
+    """slugify(value), обрезанный с запасом под суффикс"""
+    max_length = model._meta.get_field(field).max_length
+    base = slugify(value)[: max_length - SLUG_SUFFIX_RESERVE].strip("-")
+    return base or fallback or model._meta.model_name
+
+
+def _split(slug):
+    """
+    Возможные разборы slug'а на (base, суффикс): сам slug с суффиксом 0 и,
+    если он оканчивается на "-n", base без этого окончания с суффиксом n.
+    """
+    yield slug, 0
+    match = _SUFFIX_RE.fullmatch(slug)
+    if match:
+        yield match.group(1), int(match.group(2))
+
+
+def _first_free(used):
+    candidate = 0
+    while candidate in used:
+        candidate += 1
+    return candidate
+
+
+def _with_suffix(base, suffix):
+    return f"{base}-{suffix}" if suffix else base
+
+
+def taken_suffixes(model, bases, field="slug", exclude_pk=None):
+    """Занятые суффиксы для набора base-slug'ов: {base: set(суффиксы)}"""
+    bases = set(bases)
+    taken = {base: set() for base in bases}
+    queryset = model._default_manager.all()
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+
+    ordered = sorted(bases)
+    for start in range(0, len(ordered), SLUG_BULK_CHUNK):
+        condition = Q()
+        for base in ordered[start:start + SLUG_BULK_CHUNK]:
+            condition |= Q(**{f"{field}__startswith": base})
+        # "ivan-2020" — префикс и для "ivan-2020-3", и для "ivan-2020-smith";
+        # учитываются только slug'и вида base или base-n
+        for slug in queryset.filter(condition).values_list(field, flat=True):
+            _mark_taken(taken, slug)
+    return taken
+
+
+def _mark_taken(taken, slug):
+    for base, suffix in _split(slug):
+        if base in taken:
+            taken[base].add(suffix)
+
+
+def allocate_slug(instance, value, field="slug", fallback=None):
+    """Свободный slug для объекта (один запрос)"""
+    model = type(instance)
+    base = base_slug(model, value, field, fallback)
+    used = taken_suffixes(model, [base], field, exclude_pk=instance.pk)[base]
+    return _with_suffix(base, _first_free(used))
+
+
+def save_with_slug(instance, value, save, *args, field="slug", fallback=None, **kwargs):
+    """
+    Сохранить объект, выделив ему slug из value.
+
+    save — метод сохранения модели (обычно super().save). Если параллельное
+    сохранение заняло тот же slug, вставка откатывается до точки сохранения
+    и slug выделяется заново.
+    """
+    using = kwargs.get("using") or router.db_for_write(type(instance), instance=instance)
+    for attempt in range(SLUG_RETRY_ATTEMPTS):
+        setattr(instance, field, allocate_slug(instance, value, field, fallback))
+        try:
+            with transaction.atomic(using=using):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            slug = getattr(instance, field)
+            conflict = (
+                type(instance)._default_manager.using(using)
+                .filter(**{field: slug})
+                .exclude(pk=instance.pk)
+                .exists()
+            )
+            if not conflict or attempt == SLUG_RETRY_ATTEMPTS - 1:
+                setattr(instance, field, "")
+                raise
+
+
+def assign_slugs(instances, source, field="slug", fallback=None):
+    """
+    Пакетный режим для импорта: проставить slug'и новым объектам в памяти
+    перед bulk_create.
+
+    source(instance) возвращает текст для slug'а. Занятые slug'и читаются
+    одним запросом на SLUG_BULK_CHUNK разных base, коллизии внутри пакета
+    разрешаются в памяти. Объекты с уже заданным slug'ом не меняются, но их
+    slug'и учитываются как занятые.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+    model = type(instances[0])
+
+    pending = []
+    for instance in instances:
+        if not getattr(instance, field):
+            pending.append((instance, base_slug(model, source(instance), field, fallback)))
+    if not pending:
+        return instances
+
+    taken = taken_suffixes(model, {base for _instance, base in pending}, field)
+    for instance in instances:
+        if getattr(instance, field):
+            _mark_taken(taken, getattr(instance, field))
+
+    next_candidate = {}
+    for instance, base in pending:
+        used = taken[base]
+        suffix = next_candidate.get(base, 0)
+        while suffix in used:
+            suffix += 1
+        used.add(suffix)
+        next_candidate[base] = suffix + 1
+        setattr(instance, field, _with_suffix(base, suffix))
+    return instances
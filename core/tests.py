@@ -1,2 +1,203 @@
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from alumni.models import Alumni, Skill as AlumniSkill
+
+from . import slugs
+from .exports import export_rows, select_columns
+from .models import CanonicalSkill, SkillAlias
+from .skills import (
+	canonical_names,
+	complete_skills,
+	get_vocabulary,
+	merge_skills,
+	resolve_skills,
+)
+from .slugs import allocate_slug, assign_slugs
+from .utils import mark_viewed
+
+
+class MarkViewedTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.factory = RequestFactory()
+
+	def test_first_view_only_counted_once(self):
+		request = self.factory.get("/", REMOTE_ADDR="10.0.0.1")
+		self.assertTrue(mark_viewed(request, "event", 1))
+		self.assertFalse(mark_viewed(request, "event", 1))
+		self.assertTrue(mark_viewed(request, "event", 2))
+
+	def test_namespaces_and_clients_are_independent(self):
+		first = self.factory.get("/", REMOTE_ADDR="10.0.0.1")
+		second = self.factory.get("/", REMOTE_ADDR="10.0.0.2")
+		self.assertTrue(mark_viewed(first, "event", 1))
+		self.assertTrue(mark_viewed(first, "profile", 1))
+		self.assertTrue(mark_viewed(second, "event", 1))
+
+
+class SlugAllocatorTests(TestCase):
+	def test_next_free_suffix_in_one_query(self):
+		for _ in range(3):
+			Alumni.objects.create(name="John Doe", graduation_year=2020)
+		Alumni.objects.create(name="John Doe 2020 Smith", graduation_year=1999)
+
+		with self.assertNumQueries(1):
+			slug = allocate_slug(Alumni(name="John Doe", graduation_year=2020), "John Doe-2020")
+		self.assertEqual(slug, "john-doe-2020-3")
+		self.assertEqual(
+			sorted(Alumni.objects.filter(name="John Doe").values_list("slug", flat=True)),
+			["john-doe-2020", "john-doe-2020-1", "john-doe-2020-2"],
+		)
+
+	def test_bulk_assignment_resolves_collisions_in_memory(self):
+		Alumni.objects.create(name="Ann Lee", graduation_year=2021)
+		rows = [Alumni(name="Ann Lee", graduation_year=2021) for _ in range(3)]
+		rows.append(Alumni(name="Bob Ray", graduation_year=2021))
+
+		with self.assertNumQueries(1):
+			assign_slugs(rows, Alumni.slug_source)
+		self.assertEqual(
+			[row.slug for row in rows],
+			["ann-lee-2021-1", "ann-lee-2021-2", "ann-lee-2021-3", "bob-ray-2021"],
+		)
+
+	def test_save_retries_after_integrity_error(self):
+		Alumni.objects.create(name="Race Case", graduation_year=2022)
+		stale = {"race-case-2022": set()}
+		real = slugs.taken_suffixes
+		with mock.patch.object(
+			slugs, "taken_suffixes", side_effect=[stale, real(Alumni, ["race-case-2022"])]
+		):
+			alumni = Alumni.objects.create(name="Race Case", graduation_year=2022)
+		self.assertEqual(alumni.slug, "race-case-2022-1")
+
+
+class ExportTests(TestCase):
+	def test_column_selection_and_rows(self):
+		Alumni.objects.create(name="Export Me", graduation_year=2020, faculty="law")
+		columns = {
+			"name": ("Name", lambda alumni: alumni.name),
+			"year": ("Year", lambda alumni: alumni.graduation_year),
+			"city": ("City", lambda alumni: alumni.city or None),
+		}
+		self.assertEqual(select_columns(columns, "year, bogus"), ["year"])
+		self.assertEqual(select_columns(columns, ""), ["name", "year", "city"])
+		rows = list(export_rows(Alumni.objects.all(), columns, ["name", "city"]))
+		self.assertEqual(rows, [["Name", "City"], ["Export Me", ""]])
+
+
+class SkillVocabularyTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.python = CanonicalSkill.objects.create(name="Python")
+		self.js = CanonicalSkill.objects.create(name="JavaScript")
+		SkillAlias.objects.create(skill=self.js, name="JS")
+		SkillAlias.objects.create(skill=self.python, name="Python3")
+
+	def test_aliases_and_spelling_variants_resolve_to_one_skill(self):
+		self.assertEqual(
+			resolve_skills(["python", " PYTHON3 ", "Пайтон", "js", "JavaScript"]),
+			[self.python.pk, self.js.pk],
+		)
+		SkillAlias.objects.create(skill=self.python, name="Пайтон")
+		self.assertEqual(resolve_skills(["Пайтон"]), [self.python.pk])
+		get_vocabulary()
+		with self.assertNumQueries(0):
+			self.assertEqual(get_vocabulary().resolve("Пайтон"), self.python.pk)
+
+	def test_unknown_skills_created_in_one_batch(self):
+		ids = resolve_skills(["Docker", "docker", "Go"], create=True)
+		self.assertEqual(len(ids), 2)
+		self.assertEqual(
+			set(CanonicalSkill.objects.filter(pk__in=ids).values_list("key", flat=True)),
+			{"docker", "go"},
+		)
+		self.assertEqual(canonical_names("js, python3;  docker, Rust"), "JavaScript, Python, Docker, Rust")
+
+	def test_merge_moves_links_and_keeps_names_as_aliases(self):
+		duplicate = CanonicalSkill.objects.create(name="Pyhton")
+		skill = AlumniSkill.objects.create(name="Pyhton", category="technical")
+		self.assertEqual(skill.canonical_id, duplicate.pk)
+
+		merge_skills(self.python, [duplicate])
+		skill.refresh_from_db()
+		self.assertEqual(skill.canonical_id, self.python.pk)
+		self.assertFalse(CanonicalSkill.objects.filter(pk=duplicate.pk).exists())
+		self.assertEqual(resolve_skills(["pyhton"]), [self.python.pk])
+
+	def test_backfill_links_existing_rows(self):
+		AlumniSkill.objects.bulk_create([AlumniSkill(name="js", category="technical", slug="js")])
+		call_command("backfill_skills", stdout=StringIO())
+		self.assertEqual(AlumniSkill.objects.get(slug="js").canonical_id, self.js.pk)
+
+
+class SkillAutocompleteTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.python = CanonicalSkill.objects.create(name="Python")
+		self.php = CanonicalSkill.objects.create(name="PHP")
+		self.ml = CanonicalSkill.objects.create(name="Machine Learning")
+		self.accounting = CanonicalSkill.objects.create(name="Бухгалтерия")
+		SkillAlias.objects.create(skill=self.python, name="Пайтон")
+		# PHP популярнее: две ссылки против одной
+		AlumniSkill.objects.bulk_create([
+			AlumniSkill(name="php", slug="php", category="technical", canonical=self.php),
+			AlumniSkill(name="php 8", slug="php-8", category="technical", canonical=self.php),
+			AlumniSkill(name="python", slug="python", category="technical", canonical=self.python),
+		])
+
+	def names(self, prefix, limit=10):
+		return [name for _pk, name in complete_skills(prefix, limit)]
+
+	def test_prefixes_ranked_by_popularity(self):
+		self.assertEqual(self.names("p"), ["PHP", "Python"])
+		self.assertEqual(self.names("p", limit=1), ["PHP"])
+		self.assertEqual(self.names("pyt"), ["Python"])
+		self.assertEqual(self.names("learn"), ["Machine Learning"])
+		self.assertEqual(self.names("rust"), [])
+
+	def test_cyrillic_and_latin_input(self):
+		self.assertEqual(self.names("бух"), ["Бухгалтерия"])
+		self.assertEqual(self.names("buxg"), ["Бухгалтерия"])
+		self.assertEqual(self.names("пайт"), ["Python"])
+
+	def test_endpoint_served_from_memory(self):
+		url = reverse("core:skill_autocomplete")
+		self.client.get(url, {"q": "py"})
+		with self.assertNumQueries(0):
+			response = self.client.get(url, {"q": "ph", "limit": "bogus"})
+		self.assertEqual(response.json(), {"results": [{"id": self.php.pk, "name": "PHP"}]})
+
+		with self.captureOnCommitCallbacks(execute=True):
+			CanonicalSkill.objects.create(name="Photoshop")
+			# До фиксации словарь не перечитывается
+			self.assertEqual(self.names("pho"), [])
+		self.assertEqual(self.names("pho"), ["Photoshop"])
+
+	def test_opted_in_widgets(self):
+		from alumni.forms import AlumniProfileForm
+		from cvbuilder.forms import QuickCVForm, SkillForm
+		from jobs.forms import JobForm
+
+		opted_in = {
+			(form.__name__, name, type(field.widget).__name__)
+			for form in (AlumniProfileForm, QuickCVForm, SkillForm, JobForm)
+			for name, field in form.base_fields.items()
+			if "data-skill-autocomplete" in field.widget.attrs
+		}
+		self.assertEqual(opted_in, {
+			("AlumniProfileForm", "expertise_areas", "Textarea"),
+			("QuickCVForm", "skills_text", "Textarea"),
+			("SkillForm", "name", "TextInput"),
+			("JobForm", "skills_required", "TextInput"),
+			("JobForm", "preferred_skills", "TextInput"),
+		})
+		# <input> получает <datalist>, а textarea — собственный список
+		script = self.client.get(reverse("core:home")).content.decode()
+		self.assertIn('field.tagName === "TEXTAREA"', script)
@@ -17,6 +17,7 @@ urlpatterns = [
     path("api/stats/", views.api_stats, name="api_stats"),
     path("api/health/", views.health_check, name="health_check"),
     path("api/welcome/", views.welcome_api, name="welcome_api"),
+    path("api/skills/", views.skill_autocomplete, name="skill_autocomplete"),
     # Административные страницы (только для staff)
     path(
         "admin/contact-messages/",
@@ -0,0 +1,118 @@
+import hashlib
+import re
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Параметры bloom-фильтра для дедупликации просмотров.
+# 2048 бит (256 байт) на сессию и пространство имён дают < 1% ложных
+# срабатываний примерно до 200 просмотренных объектов.
+VIEW_DEDUP_BITS = getattr(settings, "VIEW_DEDUP_BITS", 2048)
+VIEW_DEDUP_HASHES = getattr(settings, "VIEW_DEDUP_HASHES", 5)
+VIEW_DEDUP_TTL = getattr(settings, "VIEW_DEDUP_TTL", 86400)  # 24 часа
+
+
+def _client_fingerprint(request):
+    """Идентификатор посетителя без создания/изменения сессии"""
+    session_key = getattr(getattr(request, "session", None), "session_key", None)
+    if session_key:
+        return f"s:{session_key}"
+
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"u:{user.pk}"
+
+    raw = "{}|{}".format(
+        request.META.get("REMOTE_ADDR", ""),
+        request.META.get("HTTP_USER_AGENT", ""),
+    )
+    return "a:" + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+def _bit_positions(object_id, bits=VIEW_DEDUP_BITS, hashes=VIEW_DEDUP_HASHES):
+    """Позиции битов объекта в фильтре (double hashing по одному blake2b)"""
+    digest = hashlib.blake2b(str(object_id).encode(), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def mark_viewed(request, namespace, object_id):
+    """
+    Отмечает просмотр объекта посетителем.
+
+    Возвращает True, если объект просматривается впервые за VIEW_DEDUP_TTL.
+    Состояние хранится в кэше как компактный bloom-фильтр на посетителя и
+    пространство имён, поэтому просмотры не пишут в таблицу сессий.
+    """
+    key = f"viewdedup:{namespace}:{_client_fingerprint(request)}"
+    data = cache.get(key)
+    bitset = bytearray(data) if data else bytearray(VIEW_DEDUP_BITS // 8)
+
+    positions = _bit_positions(object_id, bits=len(bitset) * 8)
+    if all(bitset[p >> 3] & (1 << (p & 7)) for p in positions):
+        return False
+
+    for p in positions:
+        bitset[p >> 3] |= 1 << (p & 7)
+    cache.set(key, bytes(bitset), VIEW_DEDUP_TTL)
+    return True
+
+
+# ============ НОРМАЛИЗАЦИЯ ТЕКСТА ДЛЯ ПОИСКА ============
+
+# Кириллица (русский и узбекский) -> узбекская латиница
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya", "ў": "o", "қ": "q",
+    "ғ": "g", "ҳ": "h",
+}
+_TRANSLIT_TABLE = str.maketrans(CYRILLIC_TO_LATIN)
+
+# Разные латинские написания одного звука (русская и узбекская транслитерация)
+_LATIN_FOLDS = (("kh", "x"), ("zh", "j"))
+
+_APOSTROPHES_RE = re.compile("['`\u2018\u2019\u02bb\u02bc]")
+_NON_WORD_RE = re.compile(r"[^0-9a-z+#]+")
+
+
+def normalize_search_text(value):
+    """
+    Приводит текст к канонической латинской форме для поиска.
+
+    "Шохрух", "Shoxrux", "Shokhrukh" и "G‘ulomov"/"Ғуломов" дают одинаковые
+    токены, поэтому поиск не зависит от алфавита, которым набрано имя.
+    """
+    if not value:
+        return ""
+    text = str(value).lower().translate(_TRANSLIT_TABLE)
+    text = _APOSTROPHES_RE.sub("", text)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_WORD_RE.sub(" ", text)
+    for source, target in _LATIN_FOLDS:
+        text = text.replace(source, target)
+    return " ".join(text.split())
+
+
+def search_tokens(*values):
+    """Уникальные нормализованные токены (в порядке появления)"""
+    seen = {}
+    for value in values:
+        for token in normalize_search_text(value).split():
+            seen.setdefault(token, None)
+    return list(seen)
+
+
+def skill_key(name):
+    """Ключ навыка в общем словаре (core.CanonicalSkill): "Node.JS" -> "node js" """
+    return normalize_search_text(name)[:100]
+
+
+def join_tokens(tokens):
+    """Строка токенов с пробелами по краям, для поиска через contains=" tok" """
+    return f" {' '.join(tokens)} " if tokens else ""
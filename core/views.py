@@ -4,6 +4,8 @@ from django.core.paginator import Paginator
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
 from django.views.generic import TemplateView
 
 from alumni.models import Alumni
@@ -13,6 +15,7 @@ from resources.models import Resource
 
 from .forms import ContactForm
 from .models import ContactMessage
+from .skills import AUTOCOMPLETE_LIMIT, complete_skills
 
 # Set up logger for API requests
 logger = logging.getLogger(__name__)
@@ -23,13 +26,13 @@ def home(request):
     # Получаем данные для главной страницы
     stats = {
         "alumni_count": Alumni.objects.count(),
-        "jobs_count": Job.objects.filter(is_active=True).count(),
+        "jobs_count": Job.objects.live().count(),
         "companies_count": 50,
         "resources_count": Resource.objects.filter(is_published=True).count(),
     }
 
     # Последние вакансии
-    latest_jobs = Job.objects.filter(is_active=True).select_related("employer")[:6]
+    latest_jobs = Job.objects.live().for_card()[:6]
 
     latest_resources = Resource.objects.filter(is_published=True).order_by('-created_at')[:3]
 
@@ -229,6 +232,18 @@ def welcome_api(request):
     return JsonResponse(response_data)
 
 
+@require_GET
+@cache_control(public=True, max_age=300)
+def skill_autocomplete(request):
+    """Подсказки навыков: ?q=<начало названия>&limit=<N>, из словаря в памяти"""
+    try:
+        limit = int(request.GET.get("limit", AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    results = complete_skills(request.GET.get("q", ""), limit)
+    return JsonResponse({"results": [{"id": pk, "name": name} for pk, name in results]})
+
+
 # Обработчики ошибок
 def handler404(request, exception):
     """Кастомная страница 404"""
@@ -1,5 +1,7 @@
 from django import forms
 
+from core.skills import canonical_name
+
 from .models import CV, Education, Experience, Language, Skill
 
 
@@ -141,11 +143,16 @@ class SkillForm(forms.ModelForm):
                 attrs={
                     "class": "form-control",
                     "placeholder": "Masalan: Python, JavaScript, Loyiha boshqaruv",
+                    "data-skill-autocomplete": "single",
                 }
             ),
             "level": forms.Select(attrs={"class": "form-control"}),
         }
 
+    def clean_name(self):
+        # Известный навык сохраняется под каноническим названием ("js" -> "JavaScript")
+        return canonical_name(self.cleaned_data["name"])
+
 
 class LanguageForm(forms.ModelForm):
     """Форма языков"""
@@ -175,6 +182,7 @@ class QuickCVForm(forms.ModelForm):
                     "Asosiy ko'nikmalaringizni vergul bilan ajratib sanab o'ting.\n"
                     "Masalan: Python, Django, PostgreSQL, Git, Docker"
                 ),
+                "data-skill-autocomplete": "list",
             }
         ),
     )
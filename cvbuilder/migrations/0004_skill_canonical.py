@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_canonicalskill_skillalias'),
+        ('cvbuilder', '0003_cv_full_name_en_cv_full_name_ru_cv_full_name_uz_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='canonical',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cv_skills', to='core.canonicalskill', verbose_name='Canonical Skill'),
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from core.skills import resolve_skill
+
 User = get_user_model()
 
 
@@ -259,6 +261,15 @@ class Skill(models.Model):
         verbose_name=_("Proficiency Level"),
         help_text=_("Your level of expertise in this skill")
     )
+    canonical = models.ForeignKey(
+        "core.CanonicalSkill",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="cv_skills",
+        verbose_name=_("Canonical Skill")
+    )
 
     class Meta:
         verbose_name = _("Skill")
@@ -267,6 +278,10 @@ class Skill(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.canonical_id = resolve_skill(self.name, create=True)
+        super().save(*args, **kwargs)
+
 
 class Language(models.Model):
     """Languages model for CVs"""
@@ -67,3 +67,24 @@ class PublicCVAccessTests(TestCase):
 		resp = self.client.get(url)
 		# Redirect to cv_list with error
 		self.assertIn(resp.status_code, (302, 301))
+
+	def test_export_streams_filtered_columns(self):
+		CV.objects.create(
+			user=self.user, title="Draft", template=self.template, status="draft",
+			full_name="Hidden", email="h@example.com", phone="1", location="City", summary="",
+		)
+		self.cv.skills.create(name="Python")
+		self.client.login(username="employer", password="emppass")
+		resp = self.client.get(
+			reverse("cvbuilder:public_cv_export"),
+			{"columns": "full_name,skills,unknown", "location": "city"},
+		)
+		self.assertEqual(resp.status_code, 200)
+		self.assertTrue(resp.streaming)
+		content = b"".join(resp.streaming_content).decode("utf-8-sig")
+		self.assertEqual(content.splitlines(), ["Full name,Skills", "Alice,Python"])
+
+	def test_student_cannot_export(self):
+		self.client.login(username="alice", password="pass123")
+		resp = self.client.get(reverse("cvbuilder:public_cv_export"))
+		self.assertEqual(resp.status_code, 403)
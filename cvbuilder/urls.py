@@ -31,6 +31,7 @@ urlpatterns = [
     # Дополнительные маршруты
     path("stats/", views.cv_stats, name="cv_stats"),
     path("public/", views.public_cv_list, name="public_cv_list"),
+    path("public/export/", views.public_cv_export, name="public_cv_export"),
     path(
         "template/<int:template_id>/preview/",
         views.template_preview,
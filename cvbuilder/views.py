@@ -1,6 +1,6 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.utils.translation import gettext_lazy as _
@@ -9,6 +9,8 @@ from django.db.models import Q
 from typing import Any, cast
 from django.core.paginator import Paginator
 
+from core.exports import export_response
+
 from .forms import CVForm, EducationForm, ExperienceForm, SkillForm, LanguageForm
 from .models import CV, CVTemplate, Education, Experience, Skill, Language
 
@@ -411,33 +413,31 @@ def cv_stats(request):
     return render(request, "cvbuilder/cv_stats.html", {"stats": stats})
 
 
-@login_required
-def public_cv_list(request):
-    """Список публичных (published) резюме для работодателей и админов"""
-    user = request.user
-    user_type = getattr(user, "user_type", None)
-    
-    # Проверка прав доступа
-    if user_type not in ["employer", "admin", "main_admin"]:
-        messages.error(request, _("Sizda ushbu sahifaga kirish huquqi yo'q."))
-        return redirect("cvbuilder:cv_list")
+def can_view_public_cvs(user):
+    return getattr(user, "user_type", None) in ["employer", "admin", "main_admin"]
 
-    # Оптимизированный запрос с prefetch_related для всех связанных данных
-    cvs = CV.objects.filter(status="published").select_related(
-        "template", 
-        "user"
-    ).prefetch_related(
-        "skills",        # Навыки через related_name
-        "experiences",   # Опыт работы
-        "educations",    # Образование
-        "languages"      # Языки
-    ).order_by("-created_at")  # Сортировка по умолчанию
 
-    # Фильтры
-    q = request.GET.get("q", "").strip()
-    template_id = request.GET.get("template")
-    location = request.GET.get("location", "").strip()
-    sort = request.GET.get("sort", "newest")
+# Варианты сортировки публичных резюме
+PUBLIC_CV_SORTS = {
+    "newest": "-created_at",
+    "oldest": "created_at",
+    "name_asc": "full_name",
+    "name_desc": "-full_name",
+}
+
+
+def filter_public_cvs(params):
+    """
+    Опубликованные резюме с фильтрами из GET-параметров (q, template,
+    location, sort). Общие для списка и выгрузки; возвращает
+    (queryset, примененные фильтры).
+    """
+    cvs = CV.objects.filter(status="published")
+
+    q = params.get("q", "").strip()
+    template_id = params.get("template")
+    location = params.get("location", "").strip()
+    sort = params.get("sort", "newest")
 
     # Поиск по тексту
     if q:
@@ -460,15 +460,40 @@ def public_cv_list(request):
         cvs = cvs.filter(location__icontains=location)
 
     # Сортировка
-    sort_mapping = {
-        "newest": "-created_at",
-        "oldest": "created_at",
-        "name_asc": "full_name",
-        "name_desc": "-full_name",
+    cvs = cvs.order_by(PUBLIC_CV_SORTS.get(sort, "-created_at"))
+
+    filters = {
+        "q": q,
+        "location": location,
+        "selected_template": template_id,
+        "sort": sort,
     }
+    return cvs, filters
+
+
+@login_required
+def public_cv_list(request):
+    """Список публичных (published) резюме для работодателей и админов"""
+    user = request.user
+    user_type = getattr(user, "user_type", None)
     
-    sort_field = sort_mapping.get(sort, "-created_at")
-    cvs = cvs.order_by(sort_field)
+    # Проверка прав доступа
+    if not can_view_public_cvs(user):
+        messages.error(request, _("Sizda ushbu sahifaga kirish huquqi yo'q."))
+        return redirect("cvbuilder:cv_list")
+
+    cvs, filters = filter_public_cvs(request.GET)
+
+    # Оптимизированный запрос с prefetch_related для всех связанных данных
+    cvs = cvs.select_related(
+        "template", 
+        "user"
+    ).prefetch_related(
+        "skills",        # Навыки через related_name
+        "experiences",   # Опыт работы
+        "educations",    # Образование
+        "languages"      # Языки
+    )
 
     # Пагинация
     paginator = Paginator(cvs, 20)
@@ -482,16 +507,46 @@ def public_cv_list(request):
         "page_obj": page_obj,
         "cvs": page_obj.object_list,
         "templates": templates,
-        "q": q,
-        "location": location,
-        "selected_template": template_id,
-        "sort": sort,
+        **filters,
         "user_type": user_type,
     }
 
     return render(request, "cvbuilder/public_cv_list.html", context)
 
 
+def _latest_experience(cv):
+    # Опыт отсортирован по -start_date (Meta.ordering), первый — последний
+    latest = next(iter(cv.experiences.all()), None)
+    return f"{latest.position}, {latest.company}" if latest else ""
+
+
+# Колонки выгрузки резюме: {ключ: (заголовок, значение из CV)}
+CV_EXPORT_COLUMNS = {
+    "full_name": ("Full name", lambda cv: cv.full_name),
+    "title": ("Title", lambda cv: cv.title),
+    "email": ("Email", lambda cv: cv.email),
+    "phone": ("Phone", lambda cv: cv.phone),
+    "location": ("Location", lambda cv: cv.location),
+    "salary_expectation": ("Salary expectation", lambda cv: cv.salary_expectation),
+    "skills": ("Skills", lambda cv: ", ".join(skill.name for skill in cv.skills.all())),
+    "languages": ("Languages", lambda cv: ", ".join(language.name for language in cv.languages.all())),
+    "experience": ("Latest experience", _latest_experience),
+    "created_at": ("Published", lambda cv: cv.created_at),
+}
+
+
+@login_required
+def public_cv_export(request):
+    """Выгрузка публичных резюме (CSV/XLSX) с фильтрами списка"""
+    if not can_view_public_cvs(request.user):
+        return HttpResponseForbidden()
+
+    cvs, _filters = filter_public_cvs(request.GET)
+    # prefetch_related выполняется для каждой пачки iterator(chunk_size)
+    cvs = cvs.prefetch_related("skills", "languages", "experiences")
+    return export_response(request, cvs, CV_EXPORT_COLUMNS, "cvs", chunk_size=500)
+
+
 @login_required
 def cv_delete(request, pk):
     """Удаление резюме"""
@@ -3,6 +3,7 @@ from django.contrib.admin import display
 from django.utils.translation import gettext_lazy as _
 
 from .models import (
+    ApplicationStatusChange,
     CandidateNote,
     Company,
     CompanyReview,
@@ -11,6 +12,8 @@ from .models import (
     Job,
     JobApplication,
 )
+from .pipeline import set_status
+from .ratings import refresh_company_ratings
 
 
 class EmployerProfileInline(admin.TabularInline):
@@ -42,6 +45,8 @@ class CompanyAdmin(admin.ModelAdmin):
         "name",
         "industry",
         "company_size",
+        "rating_avg",
+        "rating_count",
         "is_verified",
         "is_active",
         "created_at",
@@ -190,6 +195,21 @@ class InterviewInline(admin.TabularInline):
     verbose_name_plural = "Interviews"
 
 
+class StatusChangeInline(admin.TabularInline):
+    """Read-only status history within application admin"""
+
+    model = ApplicationStatusChange
+    extra = 0
+    can_delete = False
+    fields = ("from_status", "to_status", "changed_by", "changed_at")
+    readonly_fields = fields
+    verbose_name = "Status Change"
+    verbose_name_plural = "Status History"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
     """Admin interface for managing job applications"""
@@ -205,7 +225,7 @@ class JobApplicationAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at", "updated_at", "status_changed_at")
     date_hierarchy = "created_at"
     list_per_page = 20
-    inlines = [InterviewInline]
+    inlines = [InterviewInline, StatusChangeInline]
 
     fieldsets = (
         (
@@ -240,14 +260,14 @@ class JobApplicationAdmin(admin.ModelAdmin):
 
     @display(description=_("Set status to new"))
     def set_status_new(self, request, queryset):
-        updated = queryset.update(status="new")
+        updated = set_status(queryset, "new", changed_by=request.user)
         self.message_user(
             request, _("%(count)d applications set to new status") % {"count": updated}
         )
 
     @display(description=_("Set status to reviewed"))
     def set_status_reviewed(self, request, queryset):
-        updated = queryset.update(status="reviewed")
+        updated = set_status(queryset, "reviewed", changed_by=request.user)
         self.message_user(
             request,
             _("%(count)d applications set to reviewed status") % {"count": updated},
@@ -346,14 +366,18 @@ class CompanyReviewAdmin(admin.ModelAdmin):
 
     @display(description=_("Publish selected reviews"))
     def publish_reviews(self, request, queryset):
+        company_ids = set(queryset.values_list("company_id", flat=True))
         updated = queryset.update(is_published=True)
+        refresh_company_ratings(company_ids)
         self.message_user(
             request, _("%(count)d reviews published") % {"count": updated}
         )
 
     @display(description=_("Unpublish selected reviews"))
     def unpublish_reviews(self, request, queryset):
+        company_ids = set(queryset.values_list("company_id", flat=True))
         updated = queryset.update(is_published=False)
+        refresh_company_ratings(company_ids)
         self.message_user(
             request, _("%(count)d reviews unpublished") % {"count": updated}
         )
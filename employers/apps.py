@@ -8,4 +8,4 @@ class EmployersConfig(AppConfig):
     verbose_name = _("Employers")
 
     def ready(self):
-        pass
+        from . import listing, pipeline, ratings  # noqa: F401
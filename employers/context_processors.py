@@ -2,18 +2,19 @@
 
 def employers_context(request):
     """Контекстный процессор для employers"""
+    from .listing import top_companies
     from .models import Company
 
     try:
         total_companies = Company.objects.filter(
             is_active=True, is_verified=True
         ).count()
-        top_companies = Company.objects.filter(is_active=True, is_verified=True)[:8]
+        leaders = top_companies()
     except Exception:
         total_companies = 0
-        top_companies = Company.objects.none()
+        leaders = []
 
     return {
         "total_companies": total_companies,
-        "top_companies": top_companies,
+        "top_companies": leaders,
     }
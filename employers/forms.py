@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, cast
 
 from django import forms
 from django.utils.translation import gettext_lazy as _
@@ -12,6 +12,7 @@ from .models import (
     Job,
     JobApplication,
 )
+from .scheduling import MAX_INTERVIEW_MINUTES, find_conflicts
 
 
 class CompanyForm(forms.ModelForm):
@@ -296,8 +297,9 @@ class InterviewForm(forms.ModelForm):
 
     class Meta:
         model = Interview
-        fields = ["scheduled_date", "duration", "location", "notes", "interviewer"]
+        fields = ["application", "scheduled_date", "duration", "location", "notes", "interviewer"]
         widgets = {
+            "application": forms.Select(attrs={"class": "form-control"}),
             "scheduled_date": forms.DateTimeInput(
                 attrs={"class": "form-control", "type": "datetime-local"}
             ),
@@ -314,6 +316,7 @@ class InterviewForm(forms.ModelForm):
             "interviewer": forms.Select(attrs={"class": "form-control"}),
         }
         labels = {
+            "application": _("Application"),
             "scheduled_date": _("Scheduled Date"),
             "duration": _("Duration (minutes)"),
             "location": _("Location"),
@@ -321,6 +324,45 @@ class InterviewForm(forms.ModelForm):
             "interviewer": _("Interviewer"),
         }
 
+    def __init__(self, *args, company=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if company is not None:
+            # Только отклики на вакансии компании и ее активные сотрудники
+            application_field = cast(forms.ModelChoiceField, self.fields["application"])
+            application_field.queryset = JobApplication.objects.filter(
+                job__company=company
+            ).select_related("candidate", "job")
+            interviewer_field = cast(forms.ModelChoiceField, self.fields["interviewer"])
+            interviewer_field.queryset = EmployerProfile.objects.filter(
+                company=company, is_active=True
+            ).select_related("user")
+
+    def clean(self) -> Dict[str, Any]:
+        cleaned_data: Dict[str, Any] = super().clean() or {}
+        start = cleaned_data.get("scheduled_date")
+        duration = cleaned_data.get("duration")
+        interviewer = cleaned_data.get("interviewer")
+        if start and duration and interviewer:
+            if not 1 <= duration <= MAX_INTERVIEW_MINUTES:
+                self.add_error("duration", _("Invalid interview duration."))
+                return cleaned_data
+
+            # У нового собеседования instance.application еще не задан
+            application = cleaned_data.get("application")
+            conflicts = find_conflicts(
+                interviewer.pk,
+                application.candidate_id if application else None,
+                start,
+                duration,
+                exclude_pk=self.instance.pk,
+            )
+            if conflicts:
+                self.add_error(
+                    "scheduled_date",
+                    _("The interviewer or the candidate already has an interview at this time."),
+                )
+        return cleaned_data
+
 
 class CompanyReviewForm(forms.ModelForm):
     """Форма для отзыва о компании"""
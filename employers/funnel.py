@@ -0,0 +1,301 @@
+# employers/funnel.py - воронка откликов по журналу смен статусов
+#
+# Воронки наращиваются по новым строкам журнала после отметки
+# RollupCheckpoint — полного пересчета нет. Журналов два (FUNNEL_SOURCES):
+# отклики employers.JobApplication сворачиваются в воронки вакансий
+# (JobFunnel) и компаний (CompanyFunnel), отклики jobs.JobApplication — в
+# воронки вакансий jobs.JobFunnel и работодателей jobs.EmployerFunnel.
+# Длительности этапов копятся в гистограммах с фиксированными интервалами:
+# гистограммы складываются, а медиана оценивается интерполяцией внутри
+# интервала.
+from bisect import bisect_right
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from jobs import models as jobs_models
+
+from .models import ApplicationStatusChange, CompanyFunnel, JobFunnel, RollupCheckpoint
+
+CHECKPOINT_NAME = "employers.funnel"
+JOBS_CHECKPOINT_NAME = "jobs.funnel"
+
+ROLLUP_BATCH_SIZE = 5000
+
+# События моложе этого срока откладываются до следующего запуска: транзакция
+# с меньшим id может зафиксироваться позже уже обработанного события
+ROLLUP_SETTLE_DELAY = timedelta(minutes=1)
+
+# Границы интервалов гистограммы длительностей, в часах
+DURATION_BUCKETS = (
+    1, 2, 4, 8, 12, 24, 36, 48, 72, 96, 120, 168, 240, 336, 504, 720, 1080, 1440, 2160,
+)
+
+# Счетчик воронки: статус, достижение которого он считает (один раз на отклик)
+STAGE_COUNTERS = {
+    "reviewed": "reviewed",
+    "interview": "interviewed",
+    "hired": "hired",
+    "rejected": "rejected",
+}
+
+# Длительности от подачи отклика до первого достижения статуса
+MILESTONE_METRICS = {
+    "reviewed": "time_to_review",
+    "interview": "time_to_interview",
+    "hired": "time_to_hire",
+}
+
+# Этапы, время пребывания в которых измеряется (метрика time_in_<статус>)
+TIMED_STAGES = ("new", "reviewed", "interview")
+JOBS_TIMED_STAGES = ("applied", "reviewed", "shortlisted", "interview")
+
+FUNNEL_COUNTERS = ("applications", "reviewed", "interviewed", "hired", "rejected")
+
+
+class FunnelSource:
+    """
+    Журнал смен статусов и воронки, в которые он сворачивается: по вакансии
+    (поле job) и по ее владельцу (поле owner_field вакансии и воронки).
+    """
+
+    def __init__(self, checkpoint, events, job_funnel, owner_funnel, owner_field, timed_stages):
+        self.checkpoint = checkpoint
+        self.events = events
+        self.job_funnel = job_funnel
+        self.owner_funnel = owner_funnel
+        self.owner_field = owner_field
+        self.timed_stages = timed_stages
+
+
+EMPLOYER_FUNNELS = FunnelSource(
+    CHECKPOINT_NAME, ApplicationStatusChange, JobFunnel, CompanyFunnel, "company", TIMED_STAGES
+)
+JOBS_FUNNELS = FunnelSource(
+    JOBS_CHECKPOINT_NAME,
+    jobs_models.ApplicationStatusChange,
+    jobs_models.JobFunnel,
+    jobs_models.EmployerFunnel,
+    "employer",
+    JOBS_TIMED_STAGES,
+)
+FUNNEL_SOURCES = (EMPLOYER_FUNNELS, JOBS_FUNNELS)
+
+
+def bucket_index(hours):
+    return bisect_right(DURATION_BUCKETS, hours)
+
+
+def histogram_median(counts):
+    """Оценка медианы (в часах) по гистограмме; None, если она пуста"""
+    total = sum(counts or ())
+    if not total:
+        return None
+    half = total / 2
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= half:
+            lower = DURATION_BUCKETS[index - 1] if index else 0
+            # Последний интервал открыт: берем его нижнюю границу
+            if index >= len(DURATION_BUCKETS):
+                return float(lower)
+            upper = DURATION_BUCKETS[index]
+            return lower + (upper - lower) * (half - seen) / count
+        seen += count
+    return None
+
+
+class FunnelDelta:
+    """Приращения счетчиков и гистограмм одной воронки за пакет событий"""
+
+    def __init__(self):
+        self.counters = dict.fromkeys(FUNNEL_COUNTERS, 0)
+        self.durations = {}
+
+    def add_duration(self, metric, duration):
+        counts = self.durations.setdefault(metric, [0] * (len(DURATION_BUCKETS) + 1))
+        counts[bucket_index(max(duration.total_seconds(), 0) / 3600)] += 1
+
+    def merge_into(self, funnel):
+        for field, value in self.counters.items():
+            setattr(funnel, field, getattr(funnel, field) + value)
+        durations = dict(funnel.durations or {})
+        for metric, counts in self.durations.items():
+            current = durations.get(metric) or [0] * len(counts)
+            durations[metric] = [a + b for a, b in zip(current, counts)]
+        funnel.durations = durations
+
+
+class ApplicationState:
+    """Что известно об отклике из уже учтенных событий"""
+
+    def __init__(self):
+        self.reached = set()
+        self.entered = None  # (статус, время входа в него)
+
+
+def _load_states(events, application_ids, before_pk):
+    """Состояния откликов по их событиям с id <= before_pk (один запрос)"""
+    states = {pk: ApplicationState() for pk in application_ids}
+    rows = (
+        events.objects.filter(
+            application_id__in=application_ids, pk__lte=before_pk
+        )
+        .order_by("pk")
+        .values_list("application_id", "to_status", "changed_at")
+    )
+    for application_id, to_status, changed_at in rows:
+        state = states[application_id]
+        state.reached.add(to_status)
+        state.entered = (to_status, changed_at)
+    return states
+
+
+def _apply_event(event, state, deltas, timed_stages=TIMED_STAGES):
+    from_status, to_status = event["from_status"], event["to_status"]
+    changed_at = event["changed_at"]
+
+    for delta in deltas:
+        if not from_status:
+            delta.counters["applications"] += 1
+        elif state.entered and state.entered[0] == from_status and from_status in timed_stages:
+            delta.add_duration(f"time_in_{from_status}", changed_at - state.entered[1])
+
+        if to_status not in state.reached:
+            counter = STAGE_COUNTERS.get(to_status)
+            if counter:
+                delta.counters[counter] += 1
+            metric = MILESTONE_METRICS.get(to_status)
+            if metric:
+                delta.add_duration(metric, changed_at - event["application__created_at"])
+
+    state.reached.add(to_status)
+    state.entered = (to_status, changed_at)
+
+
+def _store(model, key_field, deltas):
+    """Слить приращения с воронками: одно чтение, bulk_create + bulk_update"""
+    existing = {
+        getattr(funnel, f"{key_field}_id"): funnel
+        for funnel in model.objects.select_for_update().filter(
+            **{f"{key_field}_id__in": list(deltas)}
+        )
+    }
+    created, updated = [], []
+    now = timezone.now()
+    for key, delta in deltas.items():
+        funnel = existing.get(key)
+        if funnel is None:
+            funnel = model(**{f"{key_field}_id": key})
+            created.append(funnel)
+        else:
+            # bulk_update не заполняет auto_now
+            funnel.updated_at = now
+            updated.append(funnel)
+        delta.merge_into(funnel)
+    model.objects.bulk_create(created)
+    model.objects.bulk_update(updated, [*FUNNEL_COUNTERS, "durations", "updated_at"])
+
+
+def rollup_funnels(batch_size=ROLLUP_BATCH_SIZE, now=None):
+    """Учесть новые события всех журналов; возвращает число учтенных событий"""
+    return sum(rollup_source(source, batch_size, now) for source in FUNNEL_SOURCES)
+
+
+def rollup_source(source, batch_size=ROLLUP_BATCH_SIZE, now=None):
+    """
+    Учесть события журнала source после отметки в воронках вакансий и их
+    владельцев.
+
+    Каждый пакет обрабатывается в своей транзакции вместе со сдвигом
+    отметки, поэтому прерванный запуск не учитывает события дважды.
+    Возвращает число учтенных событий.
+    """
+    cutoff = (now or timezone.now()) - ROLLUP_SETTLE_DELAY
+    owner_path = f"application__job__{source.owner_field}_id"
+    processed = 0
+    while True:
+        with transaction.atomic():
+            checkpoint, _created = RollupCheckpoint.objects.select_for_update().get_or_create(
+                name=source.checkpoint
+            )
+            events = list(
+                source.events.objects.filter(pk__gt=checkpoint.last_event_id)
+                .order_by("pk")
+                .values(
+                    "pk",
+                    "application_id",
+                    "from_status",
+                    "to_status",
+                    "changed_at",
+                    "application__created_at",
+                    "application__job_id",
+                    owner_path,
+                )[:batch_size]
+            )
+            # Останавливаемся на первом слишком свежем событии
+            for position, event in enumerate(events):
+                if event["changed_at"] > cutoff:
+                    events = events[:position]
+                    break
+            if not events:
+                return processed
+
+            states = _load_states(
+                source.events,
+                {event["application_id"] for event in events},
+                checkpoint.last_event_id,
+            )
+            job_deltas, owner_deltas = {}, {}
+            for event in events:
+                job_delta = job_deltas.setdefault(event["application__job_id"], FunnelDelta())
+                owner_delta = owner_deltas.setdefault(event[owner_path], FunnelDelta())
+                _apply_event(
+                    event,
+                    states[event["application_id"]],
+                    (job_delta, owner_delta),
+                    source.timed_stages,
+                )
+
+            _store(source.job_funnel, "job", job_deltas)
+            _store(source.owner_funnel, source.owner_field, owner_deltas)
+            checkpoint.last_event_id = events[-1]["pk"]
+            checkpoint.save(update_fields=["last_event_id", "updated_at"])
+
+        processed += len(events)
+        if len(events) < batch_size:
+            return processed
+
+
+def reset_funnels():
+    """Удалить воронки и отметки (следующий rollup_funnels пересчитает все)"""
+    with transaction.atomic():
+        for source in FUNNEL_SOURCES:
+            source.job_funnel.objects.all().delete()
+            source.owner_funnel.objects.all().delete()
+            RollupCheckpoint.objects.filter(name=source.checkpoint).delete()
+
+
+def funnel_summary(funnel, timed_stages=TIMED_STAGES):
+    """Конверсии этапов и медианы длительностей (часы) для дашборда"""
+    if funnel is None:
+        return None
+    total = funnel.applications
+
+    def rate(value):
+        return round(value * 100 / total, 1) if total else 0
+
+    return {
+        "applications": total,
+        "stages": [
+            ("reviewed", funnel.reviewed, rate(funnel.reviewed)),
+            ("interview", funnel.interviewed, rate(funnel.interviewed)),
+            ("hired", funnel.hired, rate(funnel.hired)),
+            ("rejected", funnel.rejected, rate(funnel.rejected)),
+        ],
+        "medians": {
+            metric: funnel.median_hours(metric)
+            for metric in (*MILESTONE_METRICS.values(), *(f"time_in_{s}" for s in timed_stages))
+        },
+    }
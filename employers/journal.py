@@ -0,0 +1,96 @@
+# employers/journal.py - журнал смен статусов откликов
+#
+# Общий код для employers.JobApplication и jobs.JobApplication: каждая смена
+# статуса — пакетно через set_status или через save() — добавляет строку в
+# модель журнала (ApplicationStatusChange своего приложения). По журналам
+# employers.funnel наращивает воронки.
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.utils import timezone
+
+
+class StatusJournal:
+    """
+    Журнал смен статусов модели откликов: application_model — отклики с
+    полями status/status_changed_at/updated_at, log_model — строки журнала
+    (application, from_status, to_status, changed_by, changed_at).
+    """
+
+    def __init__(self, application_model, log_model):
+        self.application_model = application_model
+        self.log_model = log_model
+
+    def set_status(self, applications, status, changed_by=None):
+        """
+        Выставить статус queryset'у откликов (действия админки) с записью в
+        журнал. Возвращает число измененных.
+        """
+        with transaction.atomic():
+            current = dict(
+                applications.select_for_update()
+                .exclude(status=status)
+                .order_by()
+                .values_list("pk", "status")
+            )
+            now = timezone.now()
+            self.application_model.objects.filter(pk__in=list(current)).update(
+                status=status, status_changed_at=now, updated_at=now
+            )
+            self.log_model.objects.bulk_create(
+                self.log_model(
+                    application_id=pk,
+                    from_status=from_status,
+                    to_status=status,
+                    changed_by=changed_by,
+                    changed_at=now,
+                )
+                for pk, from_status in current.items()
+            )
+        return len(current)
+
+    # ============ ЖУРНАЛ ДЛЯ save() ============
+
+    def remember_status(self, sender, instance, raw=False, **kwargs):
+        previous = None
+        if instance.pk and not raw:
+            previous = (
+                self.application_model.objects.filter(pk=instance.pk)
+                .values_list("status", flat=True)
+                .first()
+            )
+            if previous is not None and previous != instance.status:
+                instance.status_changed_at = timezone.now()
+        instance._status_before = previous
+
+    def log_status(self, sender, instance, created, raw=False, **kwargs):
+        if raw:
+            return
+        previous = getattr(instance, "_status_before", None)
+        if created or previous is None:
+            from_status = ""
+        elif previous != instance.status:
+            from_status = previous
+        else:
+            return
+        self.log_model.objects.create(
+            application=instance,
+            from_status=from_status,
+            to_status=instance.status,
+            changed_at=instance.status_changed_at,
+        )
+
+    def connect(self):
+        """Подключить журнал к save() модели откликов"""
+        label = self.application_model._meta.label_lower
+        pre_save.connect(
+            self.remember_status,
+            sender=self.application_model,
+            weak=False,
+            dispatch_uid=f"{label}.remember_status",
+        )
+        post_save.connect(
+            self.log_status,
+            sender=self.application_model,
+            weak=False,
+            dispatch_uid=f"{label}.log_status",
+        )
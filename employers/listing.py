@@ -0,0 +1,158 @@
+# employers/listing.py - список компаний с числом открытых вакансий
+#
+# Число активных вакансий добавляется к запросу списка аннотацией (один
+# GROUP BY на страницу вместо job_count() на каждую карточку). Рейтинг
+# "компании по открытым вакансиям" для контекстных процессоров хранится в
+# кэше и сбрасывается, когда вакансия включается, выключается, переходит в
+# другую компанию или удаляется.
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Company, Job
+
+# Сортировки списка компаний: ?sort=<ключ>
+COMPANY_SORTS = {
+    "name": ("name",),
+    "rating": ("-rating_avg", "-rating_count", "name"),
+    "reviews": ("-rating_count", "-rating_avg", "name"),
+    "jobs": ("-open_jobs", "name"),
+    "newest": ("-created_at",),
+}
+
+TOP_COMPANIES_CACHE_KEY = "employers:top_companies"
+TOP_COMPANIES_TTL = 60 * 60
+# Сколько компаний хранится в рейтинге (контекстные процессоры берут срез)
+TOP_COMPANIES_LIMIT = 8
+
+# Поля компании, нужные карточке рейтинга
+TOP_COMPANY_FIELDS = ("pk", "name", "logo", "industry", "headquarters", "rating_avg")
+
+
+def with_open_jobs(companies):
+    """Аннотировать open_jobs — число активных вакансий компании"""
+    return companies.annotate(open_jobs=Count("jobs", filter=Q(jobs__is_active=True)))
+
+
+def _int_param(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float_param(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_companies(params):
+    """
+    Компании для списка по GET-параметрам: industry, q, min_rating,
+    min_reviews, min_jobs, has_jobs и sort. Возвращает (queryset с
+    аннотацией open_jobs, примененная сортировка).
+    """
+    companies = Company.objects.filter(is_active=True, is_verified=True)
+
+    industry = params.get("industry")
+    if industry:
+        companies = companies.filter(industry=industry)
+
+    query = params.get("q")
+    if query:
+        companies = companies.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+
+    # Фильтры по сводке рейтинга (колонки Company, без агрегатов по отзывам)
+    min_rating = _float_param(params.get("min_rating"))
+    if min_rating is not None:
+        companies = companies.filter(rating_avg__gte=min_rating)
+    min_reviews = _int_param(params.get("min_reviews"))
+    if min_reviews is not None:
+        companies = companies.filter(rating_count__gte=min_reviews)
+
+    companies = with_open_jobs(companies)
+    min_jobs = _int_param(params.get("min_jobs"))
+    if params.get("has_jobs"):
+        min_jobs = max(min_jobs or 0, 1)
+    if min_jobs:
+        companies = companies.filter(open_jobs__gte=min_jobs)
+
+    sort = params.get("sort")
+    if sort not in COMPANY_SORTS:
+        sort = "name"
+    return companies.order_by(*COMPANY_SORTS[sort]), sort
+
+
+def top_companies(limit=TOP_COMPANIES_LIMIT):
+    """Проверенные компании с наибольшим числом открытых вакансий (из кэша)"""
+    leaders = cache.get(TOP_COMPANIES_CACHE_KEY)
+    if leaders is None:
+        leaders = list(
+            with_open_jobs(
+                Company.objects.filter(is_active=True, is_verified=True).only(*TOP_COMPANY_FIELDS)
+            )
+            .filter(open_jobs__gt=0)
+            .order_by("-open_jobs", "name")[:TOP_COMPANIES_LIMIT]
+        )
+        cache.set(TOP_COMPANIES_CACHE_KEY, leaders, TOP_COMPANIES_TTL)
+    return leaders[:limit]
+
+
+def invalidate_top_companies():
+    cache.delete(TOP_COMPANIES_CACHE_KEY)
+
+
+def _invalidate_on_commit():
+    transaction.on_commit(invalidate_top_companies)
+
+
+# ============ СБРОС РЕЙТИНГА ============
+
+
+@receiver(pre_save, sender=Job)
+def remember_job_activation(sender, instance, raw=False, **kwargs):
+    previous = None
+    if instance.pk and not raw:
+        previous = (
+            Job.objects.filter(pk=instance.pk).values_list("is_active", "company_id").first()
+        )
+    instance._activation_before = previous
+
+
+@receiver(post_save, sender=Job)
+def refresh_top_companies_on_job_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_activation_before", None)
+    after = (instance.is_active, instance.company_id)
+    if before is None:
+        changed = instance.is_active
+    else:
+        # Неактивная вакансия в рейтинге не участвует, где бы она ни была
+        changed = before != after and (before[0] or after[0])
+    if changed:
+        _invalidate_on_commit()
+
+
+@receiver(post_delete, sender=Job)
+def refresh_top_companies_on_job_delete(sender, instance, **kwargs):
+    if instance.is_active:
+        _invalidate_on_commit()
+
+
+@receiver(post_save, sender=Company)
+def refresh_top_companies_on_company_save(sender, instance, created, raw=False, **kwargs):
+    # Название, логотип, проверка и активность компании видны в рейтинге
+    if not created and not raw:
+        _invalidate_on_commit()
+
+
+@receiver(post_delete, sender=Company)
+def refresh_top_companies_on_company_delete(sender, instance, **kwargs):
+    _invalidate_on_commit()
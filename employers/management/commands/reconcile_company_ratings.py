@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from employers.ratings import refresh_company_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute company rating aggregates from published reviews and fix drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company",
+            type=int,
+            action="append",
+            dest="company_ids",
+            help="Reconcile only this company id (can be repeated)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of companies compared and updated per batch",
+        )
+
+    def handle(self, *args, **options):
+        fixed = refresh_company_ratings(
+            options["company_ids"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} companies"))
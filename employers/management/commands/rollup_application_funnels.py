@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employers.funnel import ROLLUP_BATCH_SIZE, reset_funnels, rollup_funnels
+
+
+class Command(BaseCommand):
+    help = "Fold new application status events into job, company and employer funnels"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ROLLUP_BATCH_SIZE,
+            help="Number of status events processed per transaction",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop the funnels and the checkpoint and recompute from the whole log",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["rebuild"]:
+            reset_funnels()
+        processed = rollup_funnels(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {processed} status events in {elapsed:.2f}s")
+        )
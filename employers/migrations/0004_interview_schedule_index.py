@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employers', '0003_candidatenote_note_en_candidatenote_note_ru_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interviewer', 'scheduled_date'], name='employers_i_intervi_f66aa6_idx'),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    """Fill rating aggregates from the published reviews"""
+    Company = apps.get_model("employers", "Company")
+    CompanyReview = apps.get_model("employers", "CompanyReview")
+
+    summaries = {}
+    rows = (
+        CompanyReview.objects.filter(is_published=True)
+        .order_by()
+        .values("company_id", "rating")
+        .annotate(reviews=Count("pk"))
+    )
+    for row in rows:
+        summary = summaries.setdefault(row["company_id"], {"rating_count": 0, "rating_sum": 0})
+        summary[f"rating_{row['rating']}"] = row["reviews"]
+        summary["rating_count"] += row["reviews"]
+        summary["rating_sum"] += row["rating"] * row["reviews"]
+    for company_id, summary in summaries.items():
+        summary["rating_avg"] = summary["rating_sum"] / summary["rating_count"]
+        Company.objects.filter(pk=company_id).update(**summary)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employers', '0004_interview_schedule_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_avg',
+            field=models.FloatField(default=0, editable=False, help_text='Average rating of published reviews', verbose_name='Average Rating'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of published reviews', verbose_name='Rating Count'),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Sum of published review ratings', verbose_name='Rating Sum'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['is_active', 'is_verified', '-rating_avg', '-rating_count'], name='company_rating_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employers', '0005_company_rating_aggregates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('new', 'New'), ('reviewed', 'Reviewed'), ('interview', 'Interview'), ('rejected', 'Rejected'), ('hired', 'Hired')], help_text='Previous status (empty for a new application)', max_length=20, verbose_name='From Status')),
+                ('to_status', models.CharField(choices=[('new', 'New'), ('reviewed', 'Reviewed'), ('interview', 'Interview'), ('rejected', 'Rejected'), ('hired', 'Hired')], help_text='New status', max_length=20, verbose_name='To Status')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the status was changed', verbose_name='Changed At')),
+                ('application', models.ForeignKey(help_text='Application whose status changed', on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='employers.jobapplication', verbose_name='Application')),
+                ('changed_by', models.ForeignKey(blank=True, help_text='User who changed the status', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Changed By')),
+            ],
+            options={
+                'verbose_name': 'Application Status Change',
+                'verbose_name_plural': 'Application Status Changes',
+                'ordering': ['changed_at', 'pk'],
+                'indexes': [models.Index(fields=['application', 'changed_at'], name='employers_a_applica_1c4e9e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:21
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_status_history(apps, schema_editor):
+    """Give applications without history an entry event and, if moved on, their current status"""
+    JobApplication = apps.get_model("employers", "JobApplication")
+    ApplicationStatusChange = apps.get_model("employers", "ApplicationStatusChange")
+
+    events = []
+    applications = JobApplication.objects.filter(status_changes__isnull=True).values_list(
+        "pk", "status", "created_at", "status_changed_at"
+    )
+    for pk, status, created_at, changed_at in applications.iterator():
+        events.append(
+            ApplicationStatusChange(
+                application_id=pk, from_status="", to_status="new", changed_at=created_at
+            )
+        )
+        if status != "new":
+            events.append(
+                ApplicationStatusChange(
+                    application_id=pk,
+                    from_status="new",
+                    to_status=status,
+                    changed_at=max(changed_at, created_at),
+                )
+            )
+    ApplicationStatusChange.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employers', '0006_application_status_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Name')),
+                ('last_event_id', models.BigIntegerField(default=0, verbose_name='Last Event ID')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Rollup Checkpoint',
+                'verbose_name_plural': 'Rollup Checkpoints',
+            },
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When the status was last changed', verbose_name='Status Changed'),
+        ),
+        migrations.CreateModel(
+            name='CompanyFunnel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applications', models.PositiveIntegerField(default=0, verbose_name='Applications')),
+                ('reviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Review')),
+                ('interviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Interview')),
+                ('hired', models.PositiveIntegerField(default=0, verbose_name='Hired')),
+                ('rejected', models.PositiveIntegerField(default=0, verbose_name='Rejected')),
+                ('durations', models.JSONField(blank=True, default=dict, help_text='Stage duration histograms by metric', verbose_name='Duration Histograms')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='funnel', to='employers.company', verbose_name='Company')),
+            ],
+            options={
+                'verbose_name': 'Company Funnel',
+                'verbose_name_plural': 'Company Funnels',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobFunnel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applications', models.PositiveIntegerField(default=0, verbose_name='Applications')),
+                ('reviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Review')),
+                ('interviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Interview')),
+                ('hired', models.PositiveIntegerField(default=0, verbose_name='Hired')),
+                ('rejected', models.PositiveIntegerField(default=0, verbose_name='Rejected')),
+                ('durations', models.JSONField(blank=True, default=dict, help_text='Stage duration histograms by metric', verbose_name='Duration Histograms')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='funnel', to='employers.job', verbose_name='Job')),
+            ],
+            options={
+                'verbose_name': 'Job Funnel',
+                'verbose_name_plural': 'Job Funnels',
+            },
+        ),
+        migrations.RunPython(backfill_status_history, migrations.RunPython.noop),
+    ]
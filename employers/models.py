@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 User = get_user_model()
@@ -116,6 +117,31 @@ class Company(models.Model):
         help_text=_("Whether the company profile is active")
     )
 
+    # Сводка опубликованных отзывов (обновляется в employers.ratings)
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Rating Count"),
+        help_text=_("Number of published reviews")
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Rating Sum"),
+        help_text=_("Sum of published review ratings")
+    )
+    rating_avg = models.FloatField(
+        default=0,
+        editable=False,
+        verbose_name=_("Average Rating"),
+        help_text=_("Average rating of published reviews")
+    )
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_("Created At"),
@@ -131,6 +157,12 @@ class Company(models.Model):
         verbose_name = _("Company")
         verbose_name_plural = _("Companies")
         ordering = ["name"]
+        indexes = [
+            models.Index(
+                fields=["is_active", "is_verified", "-rating_avg", "-rating_count"],
+                name="company_rating_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -138,7 +170,20 @@ class Company(models.Model):
     def get_absolute_url(self):
         return reverse("employers:company_detail", kwargs={"pk": self.pk})
 
+    @property
+    def rating_histogram(self):
+        """[(звезды, число отзывов, процент)] от 5 до 1"""
+        total = self.rating_count
+        return [
+            (stars, count, round(count * 100 / total) if total else 0)
+            for stars in range(5, 0, -1)
+            for count in [getattr(self, f"rating_{stars}")]
+        ]
+
     def job_count(self):
+        # В списках значение уже посчитано аннотацией (employers.listing)
+        if hasattr(self, "open_jobs"):
+            return self.open_jobs
         return self.jobs.filter(is_active=True).count()
 
     def active_jobs(self):
@@ -490,7 +535,7 @@ class JobApplication(models.Model):
         help_text=_("Current status of the application")
     )
     status_changed_at = models.DateTimeField(
-        auto_now=True,
+        default=timezone.now,
         verbose_name=_("Status Changed"),
         help_text=_("When the status was last changed")
     )
@@ -522,6 +567,133 @@ class JobApplication(models.Model):
         return f"Application from {self.candidate.username} for {self.job.title}"
 
 
+class ApplicationStatusChange(models.Model):
+    """Status transition of a job application (append-only history)"""
+
+    application = models.ForeignKey(
+        JobApplication,
+        on_delete=models.CASCADE,
+        related_name="status_changes",
+        verbose_name=_("Application"),
+        help_text=_("Application whose status changed")
+    )
+    from_status = models.CharField(
+        max_length=20,
+        blank=True,
+        choices=JobApplication.STATUS_CHOICES,
+        verbose_name=_("From Status"),
+        help_text=_("Previous status (empty for a new application)")
+    )
+    to_status = models.CharField(
+        max_length=20,
+        choices=JobApplication.STATUS_CHOICES,
+        verbose_name=_("To Status"),
+        help_text=_("New status")
+    )
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Changed By"),
+        help_text=_("User who changed the status")
+    )
+    changed_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Changed At"),
+        help_text=_("When the status was changed")
+    )
+
+    class Meta:
+        verbose_name = _("Application Status Change")
+        verbose_name_plural = _("Application Status Changes")
+        ordering = ["changed_at", "pk"]
+        indexes = [
+            models.Index(fields=["application", "changed_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
+class FunnelStats(models.Model):
+    """Application funnel counters and stage duration histograms"""
+
+    applications = models.PositiveIntegerField(default=0, verbose_name=_("Applications"))
+    reviewed = models.PositiveIntegerField(default=0, verbose_name=_("Reached Review"))
+    interviewed = models.PositiveIntegerField(default=0, verbose_name=_("Reached Interview"))
+    hired = models.PositiveIntegerField(default=0, verbose_name=_("Hired"))
+    rejected = models.PositiveIntegerField(default=0, verbose_name=_("Rejected"))
+    # {метрика: [число переходов в каждом интервале employers.funnel.DURATION_BUCKETS]}
+    durations = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_("Duration Histograms"),
+        help_text=_("Stage duration histograms by metric")
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        abstract = True
+
+    def median_hours(self, metric):
+        from .funnel import histogram_median
+
+        return histogram_median(self.durations.get(metric))
+
+
+class JobFunnel(FunnelStats):
+    """Funnel rollup of one job"""
+
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="funnel",
+        verbose_name=_("Job"),
+    )
+
+    class Meta:
+        verbose_name = _("Job Funnel")
+        verbose_name_plural = _("Job Funnels")
+
+    def __str__(self):
+        return f"Funnel of {self.job_id}"
+
+
+class CompanyFunnel(FunnelStats):
+    """Funnel rollup of all jobs of a company"""
+
+    company = models.OneToOneField(
+        Company,
+        on_delete=models.CASCADE,
+        related_name="funnel",
+        verbose_name=_("Company"),
+    )
+
+    class Meta:
+        verbose_name = _("Company Funnel")
+        verbose_name_plural = _("Company Funnels")
+
+    def __str__(self):
+        return f"Funnel of {self.company_id}"
+
+
+class RollupCheckpoint(models.Model):
+    """High-water mark of an incremental rollup (last processed event id)"""
+
+    name = models.CharField(max_length=100, unique=True, verbose_name=_("Name"))
+    last_event_id = models.BigIntegerField(default=0, verbose_name=_("Last Event ID"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Rollup Checkpoint")
+        verbose_name_plural = _("Rollup Checkpoints")
+
+    def __str__(self):
+        return f"{self.name}: {self.last_event_id}"
+
+
 class CandidateNote(models.Model):
     """Employer notes about candidates"""
 
@@ -653,6 +825,10 @@ class Interview(models.Model):
         verbose_name = _("Interview")
         verbose_name_plural = _("Interviews")
         ordering = ["scheduled_date"]
+        indexes = [
+            # Загрузка расписания интервьюера за день (employers.scheduling)
+            models.Index(fields=["interviewer", "scheduled_date"]),
+        ]
 
     def __str__(self):
         return f"Interview for {self.application.candidate.username}"
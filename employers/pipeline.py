@@ -0,0 +1,201 @@
+# employers/pipeline.py - доска откликов: пакетная смена статусов
+#
+# Пакет [(id отклика, новый статус)] применяется за фиксированное число
+# запросов независимо от размера: принадлежность откликов компании и их
+# текущие статусы читаются одним запросом (с блокировкой строк), статусы
+# меняются одним UPDATE на каждый целевой статус, история и уведомления
+# кандидатам пишутся через bulk_create.
+# save() и сигналы post_save при этом не вызываются.
+#
+# Каждая смена статуса — пакетная, через set_status или через save() —
+# добавляет строку в журнал ApplicationStatusChange (по нему считаются
+# воронки в employers.funnel); set_status и запись для save() — в
+# employers.journal, общем с jobs.history.
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from accounts.models import Notification
+
+from .journal import StatusJournal
+from .models import ApplicationStatusChange, JobApplication
+
+# Наибольший размер пакета за один запрос
+PIPELINE_BATCH_LIMIT = 1000
+
+STATUSES = dict(JobApplication.STATUS_CHOICES)
+
+# Статусы, о смене на которые кандидат получает уведомление
+NOTIFY_STATUSES = ("reviewed", "interview", "rejected", "hired")
+
+JOURNAL = StatusJournal(JobApplication, ApplicationStatusChange)
+JOURNAL.connect()
+
+set_status = JOURNAL.set_status
+
+# Причины пропуска отклика в пакете
+SKIP_NOT_FOUND = "not_found"
+SKIP_INVALID_STATUS = "invalid_status"
+SKIP_UNCHANGED = "unchanged"
+
+
+class PipelineError(ValueError):
+    """Пакет нельзя принять целиком (пустой или слишком большой)"""
+
+
+class TransitionResult:
+    """Итоги пакета: {id: новый статус} для примененных, {id: причина} для пропущенных"""
+
+    def __init__(self):
+        self.updated = {}
+        self.skipped = {}
+
+    def as_dict(self):
+        return {
+            "updated": {str(pk): status for pk, status in self.updated.items()},
+            "skipped": {str(pk): reason for pk, reason in self.skipped.items()},
+        }
+
+
+def parse_changes(payload):
+    """
+    Пакет из JSON: {"changes": [{"id": 1, "status": "rejected"}, ...]} или
+    {"ids": [1, 2], "status": "rejected"}. Возвращает [(id, статус)].
+    """
+    if not isinstance(payload, dict):
+        raise PipelineError("Expected a JSON object")
+    if "changes" in payload:
+        items = payload["changes"]
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise PipelineError("changes must be a list of objects")
+        changes = [(item.get("id"), item.get("status")) for item in items]
+    else:
+        ids = payload.get("ids")
+        if not isinstance(ids, list):
+            raise PipelineError("ids must be a list")
+        changes = [(pk, payload.get("status")) for pk in ids]
+
+    try:
+        changes = [(int(pk), status) for pk, status in changes]
+    except (TypeError, ValueError):
+        raise PipelineError("Application ids must be integers")
+    if not changes:
+        raise PipelineError("No changes given")
+    if len(changes) > PIPELINE_BATCH_LIMIT:
+        raise PipelineError(f"At most {PIPELINE_BATCH_LIMIT} changes per request")
+    return changes
+
+
+def _notification(candidate_id, job_title, status):
+    label = STATUSES[status]
+    return Notification(
+        user_id=candidate_id,
+        notification_type="application_update",
+        title=_("Application status updated"),
+        message=_("Your application for %(job)s is now: %(status)s")
+        % {"job": job_title, "status": label},
+    )
+
+
+def apply_transitions(company, changes, changed_by=None, notify=True):
+    """
+    Применить пакет смен статусов к откликам на вакансии компании.
+
+    Отклики чужих компаний пропускаются как not_found. Для повторяющегося id
+    действует последняя смена. Все изменения — в одной транзакции.
+    """
+    result = TransitionResult()
+    targets = {}
+    for pk, status in changes:
+        if status not in STATUSES:
+            result.skipped[pk] = SKIP_INVALID_STATUS
+            targets.pop(pk, None)
+        else:
+            result.skipped.pop(pk, None)
+            targets[pk] = status
+    if not targets:
+        return result
+
+    with transaction.atomic():
+        rows = (
+            JobApplication.objects.select_for_update()
+            .filter(pk__in=list(targets), job__company=company)
+            .order_by()
+            .values_list("pk", "status", "candidate_id", "job__title")
+        )
+        current = {pk: (status, candidate_id, title) for pk, status, candidate_id, title in rows}
+
+        by_target = {}
+        for pk, status in targets.items():
+            if pk not in current:
+                result.skipped[pk] = SKIP_NOT_FOUND
+            elif current[pk][0] == status:
+                result.skipped[pk] = SKIP_UNCHANGED
+            else:
+                by_target.setdefault(status, []).append(pk)
+
+        now = timezone.now()
+        history, notifications = [], []
+        for status, pks in by_target.items():
+            JobApplication.objects.filter(pk__in=pks).update(
+                status=status, status_changed_at=now, updated_at=now
+            )
+            for pk in pks:
+                from_status, candidate_id, job_title = current[pk]
+                result.updated[pk] = status
+                history.append(
+                    ApplicationStatusChange(
+                        application_id=pk,
+                        from_status=from_status,
+                        to_status=status,
+                        changed_by=changed_by,
+                        changed_at=now,
+                    )
+                )
+                if notify and status in NOTIFY_STATUSES:
+                    notifications.append(_notification(candidate_id, job_title, status))
+
+        ApplicationStatusChange.objects.bulk_create(history)
+        Notification.objects.bulk_create(notifications)
+    return result
+
+
+def pipeline_board(company, job_id=None, limit=50):
+    """
+    Колонки доски: {статус: {"count": n, "applications": [...]}} — счетчики
+    одним GROUP BY и до limit последних откликов в каждой колонке.
+    """
+    applications = JobApplication.objects.filter(job__company=company)
+    if job_id is not None:
+        applications = applications.filter(job_id=job_id)
+
+    counts = dict(
+        applications.order_by()
+        .values("status")
+        .annotate(total=Count("pk"))
+        .values_list("status", "total")
+    )
+    board = {}
+    for status, label in JobApplication.STATUS_CHOICES:
+        cards = (
+            applications.filter(status=status)
+            .select_related("candidate", "job")
+            .order_by("-status_changed_at", "-pk")[:limit]
+        )
+        board[status] = {
+            "label": str(label),
+            "count": counts.get(status, 0),
+            "applications": [
+                {
+                    "id": application.pk,
+                    "candidate": application.candidate.get_full_name()
+                    or application.candidate.username,
+                    "job": application.job.title,
+                    "job_id": application.job_id,
+                    "status_changed_at": application.status_changed_at.isoformat(),
+                }
+                for application in cards
+            ],
+        }
+    return board
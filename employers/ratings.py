@@ -0,0 +1,148 @@
+# employers/ratings.py - сводка рейтинга компании по опубликованным отзывам
+#
+# Company хранит число отзывов, сумму оценок, среднее и гистограмму 1–5.
+# Публикация, снятие с публикации, смена оценки и удаление отзыва меняют
+# сводку одним UPDATE с F()-выражениями, поэтому параллельные изменения не
+# теряются. Массовые queryset.update() сигналов не вызывают — после них (и
+# для исправления расхождений) сводка пересчитывается refresh_company_ratings.
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Company, CompanyReview
+
+RATING_VALUES = range(1, 6)
+
+RATING_FIELDS = (
+    "rating_count",
+    "rating_sum",
+    "rating_avg",
+    *(f"rating_{stars}" for stars in RATING_VALUES),
+)
+
+
+def apply_rating_delta(company_id, rating, sign):
+    """
+    Добавить (sign=1) или убрать (sign=-1) одну оценку из сводки компании
+    одним UPDATE. Если сводка уже разошлась с отзывами и уменьшать нечего,
+    она пересчитывается целиком.
+    """
+    count = F("rating_count") + sign
+    total = F("rating_sum") + sign * rating
+    # В UPDATE F() ссылается на старые значения: после вычитания останется
+    # хотя бы один отзыв, только если rating_count > 1
+    average = Case(
+        When(
+            rating_count__gt=-sign,
+            then=Cast(total, FloatField()) / Cast(count, FloatField()),
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    companies = Company.objects.filter(pk=company_id)
+    if sign < 0:
+        companies = companies.filter(
+            rating_count__gt=0, rating_sum__gte=rating, **{f"rating_{rating}__gt": 0}
+        )
+    updated = companies.update(
+        rating_count=count,
+        rating_sum=total,
+        rating_avg=average,
+        **{f"rating_{rating}": F(f"rating_{rating}") + sign},
+    )
+    if not updated and sign < 0:
+        refresh_company_ratings([company_id])
+
+
+def compute_ratings(company_ids=None):
+    """{company_id: {поле сводки: значение}} по опубликованным отзывам (один запрос)"""
+    reviews = CompanyReview.objects.filter(is_published=True)
+    if company_ids is not None:
+        reviews = reviews.filter(company_id__in=company_ids)
+
+    summary: defaultdict[int, dict[str, float]] = defaultdict(
+        lambda: dict.fromkeys(RATING_FIELDS, 0)
+    )
+    rows = (
+        reviews.order_by()
+        .values("company_id", "rating")
+        .annotate(reviews=Count("pk"))
+        .values_list("company_id", "rating", "reviews")
+    )
+    for company_id, rating, reviews_count in rows:
+        values = summary[company_id]
+        values[f"rating_{rating}"] += reviews_count
+        values["rating_count"] += reviews_count
+        values["rating_sum"] += rating * reviews_count
+    for values in summary.values():
+        values["rating_avg"] = values["rating_sum"] / values["rating_count"]
+    return summary
+
+
+def refresh_company_ratings(company_ids=None, batch_size=500):
+    """
+    Пересчитать сводку компаний (всех, если company_ids=None) и записать
+    только расходящиеся строки. Возвращает число исправленных компаний.
+    """
+    summary = compute_ratings(company_ids)
+    empty = dict.fromkeys(RATING_FIELDS, 0)
+
+    companies = Company.objects.only("pk", *RATING_FIELDS).order_by("pk")
+    if company_ids is not None:
+        companies = companies.filter(pk__in=company_ids)
+
+    changed = []
+    for company in companies.iterator(chunk_size=batch_size):
+        values = summary.get(company.pk, empty)
+        if any(getattr(company, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(company, field, value)
+            changed.append(company)
+    Company.objects.bulk_update(changed, RATING_FIELDS, batch_size=batch_size)
+    return len(changed)
+
+
+def _contribution(company_id, rating, is_published) -> tuple[int, int] | None:
+    return (company_id, rating) if is_published else None
+
+
+# ============ ОБНОВЛЕНИЕ СВОДКИ ============
+
+
+@receiver(pre_save, sender=CompanyReview)
+def remember_review_state(sender, instance, raw=False, **kwargs):
+    previous = None
+    if instance.pk and not raw:
+        previous = (
+            CompanyReview.objects.filter(pk=instance.pk)
+            .values_list("company_id", "rating", "is_published")
+            .first()
+        )
+    instance._rating_before = _contribution(*previous) if previous else None
+
+
+@receiver(post_save, sender=CompanyReview)
+def update_rating_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_rating_before", None)
+    after = _contribution(instance.company_id, instance.rating, instance.is_published)
+    if before == after:
+        return
+    with transaction.atomic():
+        if before:
+            company_id, rating = before
+            apply_rating_delta(company_id, rating, sign=-1)
+        if after:
+            company_id, rating = after
+            apply_rating_delta(company_id, rating, sign=1)
+
+
+@receiver(post_delete, sender=CompanyReview)
+def update_rating_on_delete(sender, instance, **kwargs):
+    if instance.is_published:
+        apply_rating_delta(instance.company_id, instance.rating, sign=-1)
@@ -0,0 +1,282 @@
+# employers/scheduling.py - планирование собеседований без двойных бронирований
+#
+# Занятость интервьюера или кандидата за день хранится в IntervalIndex —
+# отсортированных массивах начал и концов интервалов с префиксным максимумом
+# концов. Проверка пересечения — бинарный поиск, поиск свободных окон —
+# один проход по дню. Интервалы дня загружаются одним запросом по индексу
+# (interviewer, scheduled_date).
+from bisect import bisect_left, insort
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmployerProfile, Interview
+
+# Ограничение длительности: собеседование, начавшееся накануне, может
+# пересекаться с текущим днем не более чем на это время
+MAX_INTERVIEW_MINUTES = 480
+
+# Рабочие часы по умолчанию для подбора свободных окон
+WORKDAY_START = time(9, 0)
+WORKDAY_END = time(18, 0)
+
+# Статусы, которые занимают время в расписании
+BLOCKING_STATUSES = ("scheduled",)
+
+
+class SchedulingConflict(ValidationError):
+    """Интервал пересекается с уже назначенными собеседованиями"""
+
+    def __init__(self, message, conflicts=()):
+        super().__init__(message, code="conflict")
+        self.conflicts = list(conflicts)
+
+
+class IntervalIndex:
+    """
+    Занятые интервалы одного ресурса (интервьюер или кандидат).
+
+    starts отсортированы; max_ends[i] — максимальный конец среди первых
+    i + 1 интервалов, поэтому пересечение с [start, end) проверяется за
+    O(log n) даже при пересекающихся исторических записях.
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+        self._rebuild()
+
+    def _rebuild(self):
+        self.starts = [start for start, _end, _key in self.intervals]
+        self.max_ends = []
+        current = None
+        for _start, end, _key in self.intervals:
+            current = end if current is None or end > current else current
+            self.max_ends.append(current)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def overlaps(self, start, end):
+        # Интервалы, начавшиеся до конца нового, — это префикс [0, k)
+        k = bisect_left(self.starts, end)
+        return k > 0 and self.max_ends[k - 1] > start
+
+    def _overlapping(self, start, end):
+        """Позиции интервалов, пересекающихся с [start, end), по возрастанию"""
+        found = []
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_ends[i] > start:
+            if self.intervals[i][1] > start:
+                found.append(i)
+            i -= 1
+        found.reverse()
+        return found
+
+    def conflicts(self, start, end):
+        """Ключи интервалов, пересекающихся с [start, end)"""
+        return [self.intervals[i][2] for i in self._overlapping(start, end)]
+
+    def add(self, start, end, key):
+        insort(self.intervals, (start, end, key))
+        self._rebuild()
+
+    def next_free(self, start, length, until):
+        """Самое раннее t >= start, при котором [t, t + length) свободен и t + length <= until"""
+        candidate = start
+        while candidate + length <= until:
+            blocking = self._overlapping(candidate, candidate + length)
+            if not blocking:
+                return candidate
+            candidate = max(self.intervals[i][1] for i in blocking)
+        return None
+
+    def gaps(self, start, end):
+        """Свободные промежутки [a, b) внутри [start, end)"""
+        cursor = start
+        for interval_start, interval_end, _key in self.intervals:
+            if interval_end <= cursor:
+                continue
+            if interval_start >= end:
+                break
+            if interval_start > cursor:
+                yield cursor, interval_start
+            cursor = max(cursor, interval_end)
+        if cursor < end:
+            yield cursor, end
+
+
+def _interval(interview):
+    start = interview["scheduled_date"]
+    return start, start + timedelta(minutes=interview["duration"]), interview["pk"]
+
+
+def _window(start, end):
+    """Фильтр собеседований, которые могут пересекаться с [start, end)"""
+    return {
+        "scheduled_date__lt": end,
+        "scheduled_date__gte": start - timedelta(minutes=MAX_INTERVIEW_MINUTES),
+        "status__in": BLOCKING_STATUSES,
+    }
+
+
+def load_indexes(start, end, interviewer_ids=(), candidate_ids=(), exclude_pk=None):
+    """
+    Индексы занятости для интервьюеров и кандидатов на отрезке [start, end):
+    ({interviewer_id: IntervalIndex}, {candidate_id: IntervalIndex}).
+    Не более двух запросов.
+    """
+    fields = ("pk", "scheduled_date", "duration", "interviewer_id", "application__candidate_id")
+
+    def collect(lookup, ids, key_field):
+        grouped = {pk: [] for pk in ids}
+        if ids:
+            rows = Interview.objects.filter(**{lookup: list(ids)}, **_window(start, end))
+            if exclude_pk is not None:
+                rows = rows.exclude(pk=exclude_pk)
+            for row in rows.order_by().values(*fields):
+                grouped[row[key_field]].append(_interval(row))
+        return {pk: IntervalIndex(intervals) for pk, intervals in grouped.items()}
+
+    return (
+        collect("interviewer_id__in", set(interviewer_ids), "interviewer_id"),
+        collect("application__candidate_id__in", set(candidate_ids), "application__candidate_id"),
+    )
+
+
+def _validate_duration(duration):
+    if not 1 <= duration <= MAX_INTERVIEW_MINUTES:
+        raise ValidationError(
+            f"Interview duration must be between 1 and {MAX_INTERVIEW_MINUTES} minutes",
+            code="invalid_duration",
+        )
+
+
+def find_conflicts(interviewer_id, candidate_id, start, duration, exclude_pk=None):
+    """id собеседований, пересекающихся с новым у интервьюера или кандидата"""
+    end = start + timedelta(minutes=duration)
+    interviewers, candidates = load_indexes(
+        start,
+        end,
+        [interviewer_id],
+        [candidate_id] if candidate_id else [],
+        exclude_pk=exclude_pk,
+    )
+    conflicts = interviewers[interviewer_id].conflicts(start, end)
+    if candidate_id:
+        conflicts += candidates[candidate_id].conflicts(start, end)
+    return sorted(set(conflicts))
+
+
+def _day_bounds(day, work_start=WORKDAY_START, work_end=WORKDAY_END):
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(day, work_start), tz),
+        timezone.make_aware(datetime.combine(day, work_end), tz),
+    )
+
+
+def free_slots(interviewer, day, duration, candidate=None, work_start=WORKDAY_START, work_end=WORKDAY_END):
+    """
+    Свободные окна интервьюера (и кандидата, если указан) в рабочий день:
+    начала слотов длительностью duration, идущих подряд внутри промежутков.
+    """
+    _validate_duration(duration)
+    day_start, day_end = _day_bounds(day, work_start, work_end)
+    interviewer_id = getattr(interviewer, "pk", interviewer)
+    candidate_id = getattr(candidate, "pk", candidate)
+    interviewers, candidates = load_indexes(
+        day_start, day_end, [interviewer_id], [candidate_id] if candidate_id else []
+    )
+    busy = interviewers[interviewer_id]
+    if candidate_id:
+        busy = IntervalIndex(busy.intervals + candidates[candidate_id].intervals)
+
+    length = timedelta(minutes=duration)
+    slots = []
+    for gap_start, gap_end in busy.gaps(day_start, day_end):
+        slot = gap_start
+        while slot + length <= gap_end:
+            slots.append(slot)
+            slot += length
+    return slots
+
+
+def schedule_interview(application, interviewer, start, duration, location, notes=""):
+    """
+    Назначить собеседование, если интервьюер и кандидат свободны.
+
+    Строка интервьюера блокируется (select_for_update), поэтому два
+    одновременных назначения одному интервьюеру не пройдут оба.
+    """
+    _validate_duration(duration)
+    with transaction.atomic():
+        EmployerProfile.objects.select_for_update().filter(pk=interviewer.pk).exists()
+        conflicts = find_conflicts(interviewer.pk, application.candidate_id, start, duration)
+        if conflicts:
+            raise SchedulingConflict("The interviewer or the candidate is busy at this time", conflicts)
+        return Interview.objects.create(
+            application=application,
+            interviewer=interviewer,
+            scheduled_date=start,
+            duration=duration,
+            location=location,
+            notes=notes,
+        )
+
+
+def schedule_shortlist(applications, interviewer, start, duration, location, gap=0, until=None):
+    """
+    Назначить собеседования по списку откликов подряд, начиная со start.
+
+    Каждый отклик получает ближайший слот, свободный и у интервьюера, и у
+    кандидата; между слотами — gap минут. Все записи создаются одним
+    bulk_create в одной транзакции. Возвращает (назначенные, не
+    поместившиеся до until отклики); until по умолчанию — конец рабочего дня.
+    """
+    _validate_duration(duration)
+    applications = list(applications)
+    if until is None:
+        until = _day_bounds(timezone.localtime(start).date())[1]
+    length = timedelta(minutes=duration)
+    step = timedelta(minutes=gap)
+
+    with transaction.atomic():
+        EmployerProfile.objects.select_for_update().filter(pk=interviewer.pk).exists()
+        interviewers, candidates = load_indexes(
+            start, until, [interviewer.pk], {app.candidate_id for app in applications}
+        )
+        busy = interviewers[interviewer.pk]
+
+        planned, unscheduled = [], []
+        cursor = start
+        for application in applications:
+            candidate_busy = candidates[application.candidate_id]
+            slot = cursor
+            while slot is not None:
+                slot = busy.next_free(slot, length, until)
+                if slot is None or not candidate_busy.overlaps(slot, slot + length):
+                    break
+                slot = candidate_busy.next_free(slot, length, until)
+            if slot is None:
+                unscheduled.append(application)
+                continue
+
+            # Отрицательные ключи отличают новые интервалы от сохраненных
+            key = -(len(planned) + 1)
+            busy.add(slot, slot + length, key)
+            candidate_busy.add(slot, slot + length, key)
+            planned.append(
+                Interview(
+                    application=application,
+                    interviewer=interviewer,
+                    scheduled_date=slot,
+                    duration=duration,
+                    location=location,
+                )
+            )
+            cursor = slot + length + step
+
+        Interview.objects.bulk_create(planned)
+    return planned, unscheduled
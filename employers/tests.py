@@ -1,2 +1,481 @@
+from datetime import datetime, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+
+from accounts.models import Notification
+
+from .models import (
+	ApplicationStatusChange,
+	Company,
+	CompanyFunnel,
+	CompanyReview,
+	EmployerProfile,
+	Interview,
+	Job,
+	JobApplication,
+	JobFunnel,
+)
+from .forms import InterviewForm
+from .funnel import (
+	DURATION_BUCKETS,
+	EMPLOYER_FUNNELS,
+	histogram_median,
+	rollup_funnels,
+	rollup_source,
+)
+from .pipeline import (
+	SKIP_INVALID_STATUS,
+	SKIP_NOT_FOUND,
+	SKIP_UNCHANGED,
+	apply_transitions,
+	set_status,
+)
+from .listing import TOP_COMPANIES_CACHE_KEY, top_companies
+from .ratings import refresh_company_ratings
+from .scheduling import (
+	IntervalIndex,
+	SchedulingConflict,
+	free_slots,
+	schedule_interview,
+	schedule_shortlist,
+)
+
+
+def make_company(name="Acme", **extra):
+	return Company.objects.create(
+		name=name, description="Acme", website="https://acme.example.com",
+		industry="it", company_size="11-50", headquarters="Tashkent",
+		contact_email="hr@acme.example.com", contact_phone="+998901234567",
+		**extra,
+	)
+
+
+def make_employer(company, username="hr"):
+	user = CustomUser.objects.create_user(
+		username=username, email=f"{username}@acme.example.com", password="pass12345",
+		user_type="employer",
+	)
+	return EmployerProfile.objects.create(
+		user=user, company=company, position="HR", department="HR", phone="+998901234567",
+	)
+
+
+def make_job(company, employer, **extra):
+	return Job.objects.create(
+		company=company, posted_by=employer, title="Developer", description="Build",
+		requirements="Python", responsibilities="Code", employment_type="full_time",
+		experience_level="junior", location="Tashkent", contact_email="hr@acme.example.com",
+		skills_required="Python", **extra,
+	)
+
+
+def make_application(job, username):
+	candidate = CustomUser.objects.create_user(
+		username=username, email=f"{username}@example.com", password="pass12345",
+		user_type="student",
+	)
+	return JobApplication.objects.create(job=job, candidate=candidate, cover_letter="Hi")
+
+
+class InterviewSchedulingTests(TestCase):
+	def setUp(self):
+		company = make_company()
+		self.interviewer = make_employer(company)
+		self.job = make_job(company, self.interviewer)
+		self.applications = [make_application(self.job, f"candidate{i}") for i in range(4)]
+		self.day = timezone.localdate() + timedelta(days=1)
+		self.nine = timezone.make_aware(datetime.combine(self.day, datetime.min.time())) + timedelta(hours=9)
+
+	def test_interval_index_overlaps_and_gaps(self):
+		index = IntervalIndex([(10, 20, 1), (12, 14, 2), (30, 40, 3)])
+		self.assertTrue(index.overlaps(19, 25))
+		self.assertFalse(index.overlaps(20, 30))
+		self.assertEqual(index.conflicts(13, 31), [1, 2, 3])
+		self.assertEqual(index.next_free(11, 10, 100), 20)
+		self.assertEqual(index.next_free(21, 10, 100), 40)
+		self.assertEqual(index.next_free(21, 10, 45), None)
+		self.assertEqual(list(index.gaps(0, 50)), [(0, 10), (20, 30), (40, 50)])
+
+	def test_double_booking_is_rejected(self):
+		schedule_interview(self.applications[0], self.interviewer, self.nine, 60, "Room 1")
+		with self.assertRaises(SchedulingConflict) as raised:
+			schedule_interview(
+				self.applications[1], self.interviewer, self.nine + timedelta(minutes=30), 30, "Room 1"
+			)
+		self.assertEqual(len(raised.exception.conflicts), 1)
+		# Кандидат тоже не может быть на двух собеседованиях одновременно
+		other = make_employer(self.interviewer.company, username="hr2")
+		with self.assertRaises(SchedulingConflict):
+			schedule_interview(self.applications[0], other, self.nine, 30, "Room 2")
+
+	def test_free_slots_skip_booked_time(self):
+		schedule_interview(self.applications[0], self.interviewer, self.nine, 60, "Room 1")
+		slots = free_slots(self.interviewer, self.day, 60)
+		self.assertEqual(slots[0], self.nine + timedelta(hours=1))
+		self.assertEqual(len(slots), 8)
+
+	def test_shortlist_is_scheduled_back_to_back(self):
+		schedule_interview(
+			self.applications[1], self.interviewer, self.nine + timedelta(minutes=30), 30, "Room 1"
+		)
+		other = make_employer(self.interviewer.company, username="hr2")
+		schedule_interview(self.applications[2], other, self.nine + timedelta(minutes=60), 30, "Room 2")
+
+		# Блокировка интервьюера, два запроса расписания, вставка + точка сохранения
+		with self.assertNumQueries(6):
+			planned, unscheduled = schedule_shortlist(
+				[self.applications[0], self.applications[2], self.applications[3]],
+				self.interviewer, self.nine, 30, "Room 1",
+				until=self.nine + timedelta(hours=2),
+			)
+		starts = [(interview.scheduled_date - self.nine).seconds // 60 for interview in planned]
+		self.assertEqual(starts, [0, 90])
+		self.assertEqual(unscheduled, [self.applications[3]])
+		self.assertEqual(Interview.objects.filter(interviewer=self.interviewer).count(), 3)
+
+	def test_form_checks_the_candidate_of_a_new_interview(self):
+		other = make_employer(self.interviewer.company, username="hr2")
+		schedule_interview(self.applications[0], other, self.nine, 60, "Room 2")
+		form = InterviewForm(
+			{
+				"application": self.applications[0].pk,
+				"interviewer": self.interviewer.pk,
+				"scheduled_date": self.nine + timedelta(minutes=30),
+				"duration": 30,
+				"location": "Room 1",
+			},
+			company=self.interviewer.company,
+		)
+		self.assertFalse(form.is_valid())
+		self.assertIn("scheduled_date", form.errors)
+
+	def test_interview_endpoints(self):
+		EmployerProfile.objects.filter(pk=self.interviewer.pk).update(can_view_candidates=True)
+		self.client.force_login(self.interviewer.user)
+		application = self.applications[0]
+		page = self.client.get(
+			reverse("employers:interview_create", args=[application.pk]), {"date": self.day.isoformat()}
+		)
+		self.assertEqual(page.context["slots"][0], self.nine)
+
+		response = self.client.post(
+			reverse("employers:interview_create", args=[application.pk]),
+			{
+				"application": application.pk,
+				"interviewer": self.interviewer.pk,
+				"scheduled_date": self.nine.strftime("%Y-%m-%dT%H:%M"),
+				"duration": 60,
+				"location": "Room 1",
+			},
+		)
+		self.assertRedirects(response, reverse("employers:dashboard"), fetch_redirect_response=False)
+		self.assertTrue(Interview.objects.filter(application=application).exists())
+
+		response = self.client.get(
+			reverse("employers:interview_free_slots"),
+			{"date": self.day.isoformat(), "duration": 60, "application": application.pk},
+		)
+		self.assertEqual(response.json()["slots"][0], (self.nine + timedelta(hours=1)).isoformat())
+
+		response = self.client.post(
+			reverse("employers:interview_shortlist"),
+			data={
+				"applications": [app.pk for app in self.applications[1:3]],
+				"start": self.nine.isoformat(),
+				"duration": 30,
+				"location": "Room 1",
+			},
+			content_type="application/json",
+		)
+		starts = [item["start"] for item in response.json()["scheduled"]]
+		self.assertEqual(
+			starts,
+			[(self.nine + timedelta(minutes=minutes)).isoformat() for minutes in (60, 90)],
+		)
+		response = self.client.post(
+			reverse("employers:interview_shortlist"), data={"start": "x"}, content_type="application/json"
+		)
+		self.assertEqual(response.status_code, 400)
+
+
+def make_user(username):
+	return CustomUser.objects.create_user(
+		username=username, email=f"{username}@example.com", password="pass12345",
+		user_type="student",
+	)
+
+
+def make_review(company, author, rating, is_published=True):
+	return CompanyReview.objects.create(
+		company=company, author=author, rating=rating, title="Review",
+		review="Text", is_published=is_published,
+	)
+
+
+class CompanyRatingTests(TestCase):
+	def setUp(self):
+		self.company = make_company(is_verified=True)
+		self.users = [make_user(f"reviewer{i}") for i in range(3)]
+
+	def assertRating(self, count, total, histogram):
+		self.company.refresh_from_db()
+		self.assertEqual(self.company.rating_count, count)
+		self.assertEqual(self.company.rating_sum, total)
+		self.assertAlmostEqual(self.company.rating_avg, total / count if count else 0)
+		self.assertEqual([getattr(self.company, f"rating_{stars}") for stars in range(1, 6)], histogram)
+
+	def test_publish_edit_unpublish_and_delete(self):
+		review = make_review(self.company, self.users[0], 5)
+		make_review(self.company, self.users[1], 2)
+		draft = make_review(self.company, self.users[2], 1, is_published=False)
+		self.assertRating(2, 7, [0, 1, 0, 0, 1])
+
+		draft.is_published = True
+		draft.save()
+		self.assertRating(3, 8, [1, 1, 0, 0, 1])
+
+		review.rating = 4
+		review.save()
+		self.assertRating(3, 7, [1, 1, 0, 1, 0])
+
+		draft.is_published = False
+		draft.save()
+		self.assertRating(2, 6, [0, 1, 0, 1, 0])
+
+		review.delete()
+		self.assertRating(1, 2, [0, 1, 0, 0, 0])
+
+	def test_reconcile_fixes_drift(self):
+		make_review(self.company, self.users[0], 3)
+		make_review(self.company, self.users[1], 5, is_published=False)
+		# queryset.update() обходит сигналы
+		CompanyReview.objects.update(is_published=True)
+		Company.objects.filter(pk=self.company.pk).update(rating_count=10)
+
+		call_command("reconcile_company_ratings", stdout=StringIO())
+		self.assertRating(2, 8, [0, 0, 1, 0, 1])
+		self.assertEqual(refresh_company_ratings(), 0)
+
+	def test_company_detail_reads_columns(self):
+		make_review(self.company, self.users[0], 4)
+		response = self.client.get(reverse("employers:company_detail", args=[self.company.pk]))
+		self.assertEqual(response.context["avg_rating"], 4.0)
+		self.assertEqual(response.context["review_count"], 1)
+		self.assertEqual(response.context["rating_histogram"][1], (4, 1, 100))
+
+	def test_company_list_sort_and_filter_by_rating(self):
+		other = make_company("Beta", is_verified=True)
+		make_review(self.company, self.users[0], 3)
+		make_review(other, self.users[0], 5)
+		url = reverse("employers:company_list")
+
+		response = self.client.get(url, {"sort": "rating"})
+		self.assertEqual([company.name for company in response.context["page_obj"]], ["Beta", "Acme"])
+
+		response = self.client.get(url, {"min_rating": "4"})
+		self.assertEqual([company.name for company in response.context["page_obj"]], ["Beta"])
+
+
+class CompanyListingTests(TestCase):
+	def setUp(self):
+		cache.delete(TOP_COMPANIES_CACHE_KEY)
+		self.acme = make_company(is_verified=True)
+		self.beta = make_company("Beta", is_verified=True)
+		self.employer = make_employer(self.acme)
+		make_job(self.acme, self.employer)
+		make_job(self.beta, self.employer)
+		make_job(self.beta, self.employer)
+		make_job(self.beta, self.employer, is_active=False)
+
+	def test_list_annotates_open_jobs_in_one_query(self):
+		url = reverse("employers:company_list")
+		response = self.client.get(url, {"sort": "jobs"})
+		page = list(response.context["page_obj"])
+		self.assertEqual([company.name for company in page], ["Beta", "Acme"])
+		with self.assertNumQueries(0):
+			self.assertEqual([company.job_count() for company in page], [2, 1])
+
+		response = self.client.get(url, {"min_jobs": "2"})
+		self.assertEqual([company.name for company in response.context["page_obj"]], ["Beta"])
+
+	def test_leaderboard_is_cached_until_activation_changes(self):
+		self.assertEqual([company.name for company in top_companies()], ["Beta", "Acme"])
+		with self.assertNumQueries(0):
+			top_companies()
+
+		job = self.acme.jobs.get()
+		job.title = "Senior Developer"
+		with self.captureOnCommitCallbacks(execute=True):
+			job.save()
+		self.assertIsNotNone(cache.get(TOP_COMPANIES_CACHE_KEY))
+
+		with self.captureOnCommitCallbacks(execute=True):
+			make_job(self.acme, self.employer)
+			make_job(self.acme, self.employer)
+		self.assertEqual([company.name for company in top_companies()], ["Acme", "Beta"])
+
+		job.is_active = False
+		with self.captureOnCommitCallbacks(execute=True):
+			job.save()
+		self.assertEqual(
+			[(company.name, company.open_jobs) for company in top_companies()],
+			[("Acme", 2), ("Beta", 2)],
+		)
+
+
+class PipelineTransitionTests(TestCase):
+	def setUp(self):
+		self.company = make_company()
+		self.employer = make_employer(self.company)
+		self.job = make_job(self.company, self.employer)
+		self.applications = [make_application(self.job, f"candidate{i}") for i in range(5)]
+		other = make_company("Other")
+		foreign_job = make_job(other, make_employer(other, username="other"))
+		self.foreign = make_application(foreign_job, "foreign")
+
+	def test_bulk_rejection_runs_a_fixed_number_of_queries(self):
+		changes = [(application.pk, "rejected") for application in self.applications]
+		# Точка сохранения и ее освобождение, чтение с блокировкой, UPDATE, история, уведомления
+		with self.assertNumQueries(6):
+			result = apply_transitions(self.company, changes, changed_by=self.employer.user)
+		self.assertEqual(len(result.updated), 5)
+		self.assertEqual(
+			JobApplication.objects.filter(job=self.job, status="rejected").count(), 5
+		)
+		self.assertEqual(ApplicationStatusChange.objects.filter(to_status="rejected").count(), 5)
+		self.assertEqual(Notification.objects.filter(notification_type="application_update").count(), 5)
+
+	def test_ownership_and_status_checks(self):
+		hired = self.applications[0]
+		apply_transitions(self.company, [(hired.pk, "hired")])
+		result = apply_transitions(
+			self.company,
+			[
+				(hired.pk, "new"),
+				(self.applications[2].pk, "new"),
+				(self.foreign.pk, "rejected"),
+				(self.applications[1].pk, "bogus"),
+			],
+		)
+		# Любой известный статус допустим, в том числе возврат в "new"
+		self.assertEqual(result.updated, {hired.pk: "new"})
+		self.assertEqual(result.skipped[self.applications[2].pk], SKIP_UNCHANGED)
+		self.assertEqual(result.skipped[self.foreign.pk], SKIP_NOT_FOUND)
+		self.assertEqual(result.skipped[self.applications[1].pk], SKIP_INVALID_STATUS)
+		self.foreign.refresh_from_db()
+		self.assertEqual(self.foreign.status, "new")
+
+	def test_single_status_update_endpoint(self):
+		EmployerProfile.objects.filter(pk=self.employer.pk).update(can_view_candidates=True)
+		self.client.force_login(self.employer.user)
+		application = self.applications[0]
+
+		def post(pk, status):
+			return self.client.post(
+				reverse("employers:update_application_status", args=[pk]),
+				{"status": status},
+				headers={"x-requested-with": "XMLHttpRequest"},
+			)
+
+		response = post(application.pk, "hired")
+		self.assertEqual(response.status_code, 200)
+		self.assertTrue(response.json()["success"])
+		self.assertEqual(post(application.pk, "hired").status_code, 200)
+		response = post(application.pk, "bogus")
+		self.assertEqual(response.status_code, 400)
+		self.assertEqual(response.json()["error"], SKIP_INVALID_STATUS)
+		self.assertEqual(post(self.foreign.pk, "hired").status_code, 404)
+
+	def test_transitions_endpoint(self):
+		self.client.force_login(self.employer.user)
+		response = self.client.get(reverse("employers:pipeline_board"))
+		self.assertEqual(response.status_code, 403)
+
+		EmployerProfile.objects.filter(pk=self.employer.pk).update(can_view_candidates=True)
+		response = self.client.post(
+			reverse("employers:pipeline_transitions"),
+			data={"ids": [app.pk for app in self.applications[:3]] + [self.foreign.pk], "status": "reviewed"},
+			content_type="application/json",
+		)
+		self.assertEqual(response.status_code, 200)
+		payload = response.json()
+		self.assertEqual(len(payload["updated"]), 3)
+		self.assertEqual(payload["skipped"], {str(self.foreign.pk): SKIP_NOT_FOUND})
+
+		board = self.client.get(reverse("employers:pipeline_board")).json()["columns"]
+		self.assertEqual(board["reviewed"]["count"], 3)
+		self.assertEqual(board["new"]["count"], 2)
+
+		response = self.client.post(
+			reverse("employers:pipeline_transitions"), data="[1]", content_type="application/json"
+		)
+		self.assertEqual(response.status_code, 400)
+
+
+class FunnelRollupTests(TestCase):
+	def setUp(self):
+		self.company = make_company()
+		self.employer = make_employer(self.company)
+		self.job = make_job(self.company, self.employer)
+		self.applications = [make_application(self.job, f"candidate{i}") for i in range(4)]
+
+	def later(self, hours=2):
+		return timezone.now() + timedelta(hours=hours)
+
+	def test_every_transition_is_logged(self):
+		application = self.applications[0]
+		self.assertEqual(
+			list(application.status_changes.values_list("from_status", "to_status")), [("", "new")]
+		)
+		first_change = application.status_changed_at
+		application.is_read = True
+		application.save()
+		self.assertEqual(application.status_changed_at, first_change)
+
+		application.status = "reviewed"
+		application.save()
+		apply_transitions(self.company, [(application.pk, "interview")])
+		set_status(JobApplication.objects.filter(pk=application.pk), "rejected")
+		self.assertEqual(
+			list(application.status_changes.values_list("from_status", "to_status")),
+			[("", "new"), ("new", "reviewed"), ("reviewed", "interview"), ("interview", "rejected")],
+		)
+
+	def test_rollup_is_incremental(self):
+		apply_transitions(self.company, [(app.pk, "reviewed") for app in self.applications[:3]])
+		self.assertEqual(rollup_funnels(now=self.later()), 7)
+		funnel = JobFunnel.objects.get(job=self.job)
+		self.assertEqual((funnel.applications, funnel.reviewed, funnel.hired), (4, 3, 0))
+
+		apply_transitions(self.company, [(self.applications[0].pk, "hired")])
+		# Повторный вход в статус не считается заново
+		set_status(JobApplication.objects.filter(pk=self.applications[1].pk), "new")
+		apply_transitions(self.company, [(self.applications[1].pk, "reviewed")])
+		# Отметка, события, их предыстория, по чтению и записи на каждую сводку,
+		# сдвиг отметки и точка сохранения — независимо от числа событий
+		with self.assertNumQueries(10):
+			self.assertEqual(rollup_source(EMPLOYER_FUNNELS, now=self.later()), 3)
+		self.assertEqual(rollup_funnels(now=self.later()), 0)
+
+		funnel = CompanyFunnel.objects.get(company=self.company)
+		self.assertEqual((funnel.applications, funnel.reviewed, funnel.hired), (4, 3, 1))
+		self.assertEqual(sum(funnel.durations["time_to_review"]), 3)
+		self.assertEqual(sum(funnel.durations["time_in_reviewed"]), 2)
+		self.assertLess(funnel.median_hours("time_to_hire"), DURATION_BUCKETS[0])
+
+	def test_fresh_events_wait_for_next_run(self):
+		self.assertEqual(rollup_funnels(), 0)
+		self.assertFalse(JobFunnel.objects.exists())
+
+	def test_histogram_median(self):
+		self.assertIsNone(histogram_median([]))
+		counts = [0] * (len(DURATION_BUCKETS) + 1)
+		counts[1] = 2
+		self.assertEqual(histogram_median(counts), 1.5)
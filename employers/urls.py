@@ -18,11 +18,25 @@ urlpatterns = [
     path("jobs/manage/", views.manage_jobs, name="manage_jobs"),
     # Отклики
     path("applications/", views.my_applications, name="my_applications"),
+    path("applications/board/", views.pipeline_board_view, name="pipeline_board"),
+    path(
+        "applications/board/transitions/",
+        views.pipeline_transitions,
+        name="pipeline_transitions",
+    ),
     path(
         "applications/<int:pk>/update-status/",
         views.update_application_status,
         name="update_application_status",
     ),
+    # Собеседования
+    path(
+        "applications/<int:pk>/interview/",
+        views.interview_create,
+        name="interview_create",
+    ),
+    path("interviews/free-slots/", views.interview_free_slots, name="interview_free_slots"),
+    path("interviews/shortlist/", views.interview_shortlist, name="interview_shortlist"),
     # Компании
     path("companies/", views.company_list, name="company_list"),
     path("companies/<int:pk>/", views.company_detail, name="company_detail"),
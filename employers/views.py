@@ -1,16 +1,23 @@
+import json
+from datetime import timedelta
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
-from django.db.models import Avg, Q  # Убрали Count, так как он не используется
-from django.http import JsonResponse
+from django.db.models import Q
+from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_POST
 
 # Временные формы (создадим позже)
 from .forms import (
     CompanyForm,
     EmployerProfileForm,
+    InterviewForm,
     JobApplicationForm,
     JobForm,
     JobSearchForm,
@@ -19,10 +26,28 @@ from .forms import (
 # Исправленные импорты моделей
 from .models import (
     Company,
+    CompanyFunnel,
     EmployerProfile,
     Job,
     JobApplication,
 )
+from .funnel import funnel_summary
+from .listing import COMPANY_SORTS, filter_companies
+from .pipeline import (
+    SKIP_NOT_FOUND,
+    SKIP_UNCHANGED,
+    PipelineError,
+    apply_transitions,
+    parse_changes,
+    pipeline_board,
+)
+from .scheduling import (
+    MAX_INTERVIEW_MINUTES,
+    SchedulingConflict,
+    free_slots,
+    schedule_interview,
+    schedule_shortlist,
+)
 
 
 def job_list(request):
@@ -168,11 +193,15 @@ def employer_dashboard(request):
         "-created_at"
     )[:5]
 
+    # Воронка из инкрементальной сводки (employers.funnel), без сканирования откликов
+    funnel = CompanyFunnel.objects.filter(company=company).first()
+
     context = {
         "employer_profile": employer_profile,
         "company": company,
         "stats": stats,
         "recent_applications": recent_applications,
+        "funnel": funnel_summary(funnel),
     }
     return render(request, "employers/employer_dashboard.html", context)
 
@@ -232,20 +261,8 @@ def my_applications(request):
 
 
 def company_list(request):
-    """Список компаний"""
-    companies = Company.objects.filter(is_active=True, is_verified=True)
-
-    # Фильтрация по индустрии
-    industry = request.GET.get("industry")
-    if industry:
-        companies = companies.filter(industry=industry)
-
-    # Поиск
-    query = request.GET.get("q")
-    if query:
-        companies = companies.filter(
-            Q(name__icontains=query) | Q(description__icontains=query)
-        )
+    """Список компаний с числом открытых вакансий в том же запросе"""
+    companies, sort = filter_companies(request.GET)
 
     # Пагинация
     paginator = Paginator(companies, 12)
@@ -255,7 +272,9 @@ def company_list(request):
     context = {
         "page_obj": page_obj,
         "industries": Company.INDUSTRY_CHOICES,
-        "total_companies": companies.count(),
+        "total_companies": paginator.count,
+        "sort": sort,
+        "sort_options": list(COMPANY_SORTS),
     }
     return render(request, "employers/company_list.html", context)
 
@@ -265,19 +284,16 @@ def company_detail(request, pk):
     company = get_object_or_404(Company, pk=pk, is_active=True)
     jobs = company.jobs.filter(is_active=True)
 
-    # Отзывы
+    # Отзывы; рейтинг читается из сводки компании
     reviews = company.reviews.filter(is_published=True)
 
-    # Средний рейтинг
-    from django.db.models import Avg
-    avg_rating = reviews.aggregate(Avg("rating"))["rating__avg"] or 0
-
     context = {
         "company": company,
         "jobs": jobs,
         "reviews": reviews,
-        "avg_rating": round(avg_rating, 1),
-        "review_count": reviews.count(),
+        "avg_rating": round(company.rating_avg, 1),
+        "review_count": company.rating_count,
+        "rating_histogram": company.rating_histogram,
     }
     return render(request, "employers/company_detail.html", context)
 
@@ -290,24 +306,232 @@ def update_application_status(request, pk):
         request.method == "POST"
         and request.headers.get("X-Requested-With") == "XMLHttpRequest"
     ):
-        application = get_object_or_404(JobApplication, pk=pk)
+        employer_profile = _candidate_manager(request.user)
         new_status = request.POST.get("status")
+        if employer_profile is None:
+            return JsonResponse({"success": False}, status=403)
 
-        if new_status in dict(JobApplication.STATUS_CHOICES):
-            application.status = new_status
-            application.save()
-
+        result = apply_transitions(
+            employer_profile.company, [(pk, new_status)], changed_by=request.user
+        )
+        reason = result.skipped.get(pk)
+        if reason is None or reason == SKIP_UNCHANGED:
             return JsonResponse(
                 {
                     "success": True,
-                    "new_status": application.get_status_display(),
+                    "new_status": dict(JobApplication.STATUS_CHOICES)[new_status],
                     "status_class": new_status,
                 }
             )
+        if reason == SKIP_NOT_FOUND:
+            return JsonResponse({"success": False}, status=404)
+        return JsonResponse({"success": False, "error": reason}, status=400)
 
     return JsonResponse({"success": False})
 
 
+def _candidate_manager(user):
+    """Активный профиль работодателя с доступом к кандидатам или None"""
+    return (
+        EmployerProfile.objects.select_related("company")
+        .filter(user=user, is_active=True, can_view_candidates=True)
+        .first()
+    )
+
+
+@login_required
+def pipeline_board_view(request):
+    """Доска откликов компании по статусам (JSON)"""
+    employer_profile = _candidate_manager(request.user)
+    if employer_profile is None:
+        return JsonResponse({"error": "forbidden"}, status=403)
+
+    job_id = request.GET.get("job")
+    board = pipeline_board(
+        employer_profile.company,
+        job_id=int(job_id) if job_id and job_id.isdigit() else None,
+    )
+    return JsonResponse({"columns": board})
+
+
+@login_required
+@require_POST
+def pipeline_transitions(request):
+    """
+    Пакетная смена статусов откликов (JSON):
+    {"changes": [{"id": 1, "status": "reviewed"}, ...]} или
+    {"ids": [1, 2, 3], "status": "rejected"}.
+    """
+    employer_profile = _candidate_manager(request.user)
+    if employer_profile is None:
+        return JsonResponse({"error": "forbidden"}, status=403)
+
+    try:
+        changes = parse_changes(json.loads(request.body or b"null"))
+    except (ValueError, PipelineError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    result = apply_transitions(employer_profile.company, changes, changed_by=request.user)
+    return JsonResponse(result.as_dict())
+
+
+# ============ СОБЕСЕДОВАНИЯ ============
+
+
+def _parse_day(value):
+    try:
+        return parse_date(value or "")
+    except ValueError:
+        return None
+
+
+def _positive_int(value, default=None):
+    return int(value) if value and str(value).isdigit() and int(value) > 0 else default
+
+
+@login_required
+def interview_create(request, pk):
+    """Назначение собеседования по отклику с проверкой занятости"""
+    employer_profile = _candidate_manager(request.user)
+    if employer_profile is None:
+        return HttpResponseForbidden()
+    company = employer_profile.company
+    application = get_object_or_404(JobApplication, pk=pk, job__company=company)
+
+    if request.method == "POST":
+        form = InterviewForm(request.POST, company=company)
+        if form.is_valid():
+            data = form.cleaned_data
+            try:
+                # Повторная проверка под блокировкой интервьюера
+                schedule_interview(
+                    data["application"],
+                    data["interviewer"],
+                    data["scheduled_date"],
+                    data["duration"],
+                    data["location"],
+                    data["notes"],
+                )
+            except SchedulingConflict:
+                form.add_error(
+                    "scheduled_date",
+                    _("The interviewer or the candidate already has an interview at this time."),
+                )
+            else:
+                messages.success(request, _("Interview scheduled."))
+                return redirect("employers:dashboard")
+    else:
+        form = InterviewForm(
+            company=company,
+            initial={"application": application, "interviewer": employer_profile, "duration": 60},
+        )
+
+    day = _parse_day(request.GET.get("date")) or timezone.localdate() + timedelta(days=1)
+    context = {
+        "form": form,
+        "application": application,
+        "day": day,
+        "slots": free_slots(employer_profile, day, 60, candidate=application.candidate_id),
+    }
+    return render(request, "employers/interview_form.html", context)
+
+
+@login_required
+def interview_free_slots(request):
+    """
+    Свободные окна (JSON): ?date=YYYY-MM-DD&duration=60, необязательно
+    &interviewer=<id сотрудника компании> и &application=<id отклика>.
+    """
+    employer_profile = _candidate_manager(request.user)
+    if employer_profile is None:
+        return JsonResponse({"error": "forbidden"}, status=403)
+    company = employer_profile.company
+
+    day = _parse_day(request.GET.get("date"))
+    duration = _positive_int(request.GET.get("duration"), 60)
+    if day is None or duration > MAX_INTERVIEW_MINUTES:
+        return JsonResponse({"error": "Invalid date or duration"}, status=400)
+
+    interviewer = employer_profile
+    interviewer_id = _positive_int(request.GET.get("interviewer"))
+    if interviewer_id is not None:
+        interviewer = get_object_or_404(EmployerProfile, pk=interviewer_id, company=company)
+    candidate_id = None
+    application_id = _positive_int(request.GET.get("application"))
+    if application_id is not None:
+        application = get_object_or_404(JobApplication, pk=application_id, job__company=company)
+        candidate_id = application.candidate_id
+
+    slots = free_slots(interviewer, day, duration, candidate=candidate_id)
+    return JsonResponse({"slots": [timezone.localtime(slot).isoformat() for slot in slots]})
+
+
+@login_required
+@require_POST
+def interview_shortlist(request):
+    """
+    Назначение собеседований по списку откликов подряд (JSON):
+    {"applications": [1, 2], "start": "2026-01-15T09:00", "duration": 30,
+    "location": "Room 1", "interviewer": 5, "gap": 10, "until": "..."}.
+    interviewer, gap и until необязательны.
+    """
+    employer_profile = _candidate_manager(request.user)
+    if employer_profile is None:
+        return JsonResponse({"error": "forbidden"}, status=403)
+    company = employer_profile.company
+
+    try:
+        payload = json.loads(request.body or b"null")
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        ids = [int(pk) for pk in payload.get("applications") or []]
+        start = parse_datetime(str(payload.get("start", "")))
+        until = parse_datetime(str(payload["until"])) if payload.get("until") else None
+        duration = int(payload.get("duration", 0))
+        gap = int(payload.get("gap", 0))
+    except (TypeError, ValueError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    location = str(payload.get("location") or "").strip()
+    if not ids or start is None or not location or gap < 0:
+        return JsonResponse({"error": "applications, start and location are required"}, status=400)
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    if until is not None and timezone.is_naive(until):
+        until = timezone.make_aware(until)
+
+    interviewer = employer_profile
+    if payload.get("interviewer"):
+        interviewer = EmployerProfile.objects.filter(
+            pk=_positive_int(payload["interviewer"]), company=company, is_active=True
+        ).first()
+        if interviewer is None:
+            return JsonResponse({"error": "Unknown interviewer"}, status=400)
+
+    found = JobApplication.objects.filter(pk__in=ids, job__company=company).in_bulk()
+    applications = [found[pk] for pk in dict.fromkeys(ids) if pk in found]
+    try:
+        planned, unscheduled = schedule_shortlist(
+            applications, interviewer, start, duration, location, gap=gap, until=until
+        )
+    except ValidationError as exc:
+        return JsonResponse({"error": " ".join(exc.messages)}, status=400)
+
+    return JsonResponse(
+        {
+            "scheduled": [
+                {
+                    "application": interview.application_id,
+                    "interview": interview.pk,
+                    "start": timezone.localtime(interview.scheduled_date).isoformat(),
+                }
+                for interview in planned
+            ],
+            "unscheduled": [application.pk for application in unscheduled],
+            "not_found": [pk for pk in ids if pk not in found],
+        }
+    )
+
+
 @login_required
 def get_candidate_cvs(request, user_id):
     """Получение резюме кандидата (AJAX)"""
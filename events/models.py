@@ -5,6 +5,8 @@ from django.db.models import QuerySet
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from core.slugs import save_with_slug
+
 User = get_user_model()
 
 
@@ -181,14 +183,8 @@ class Event(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.title) or 'event'
-            slug = base_slug
-            counter = 1
-            while Event.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            save_with_slug(self, self.title, super().save, *args, fallback="event", **kwargs)
+            return
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
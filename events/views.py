@@ -1,7 +1,7 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import F, Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -9,6 +9,8 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import ListView
 
+from core.utils import mark_viewed
+
 from .forms import *
 from .models import *
 
@@ -96,13 +98,10 @@ def event_detail(request, slug):
         slug=slug, status="published"
     )
     
-    # Увеличение счетчика просмотров только один раз за сессию (24 часа)
-    session_key = f"event_viewed_{event.id}"
-    if not request.session.get(session_key):
+    # Увеличение счетчика просмотров только один раз за 24 часа (без записи в сессию)
+    if mark_viewed(request, "event", event.id):
+        Event.objects.filter(pk=event.pk).update(views_count=F("views_count") + 1)
         event.views_count += 1
-        event.save(update_fields=["views_count"])
-        request.session[session_key] = True
-        request.session.set_expiry(86400)  # 24 часа в секундах
     
     context = {
         "event": event,
@@ -1,10 +1,24 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.admin import display
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 # ЗАКОММЕНТИРУЙТЕ эту строку - временно отключаем modeltranslation
 # from modeltranslation.admin import TranslationAdmin
 
-from .models import Job, Industry, JobApplication, SavedJob, JobAlert
+from .models import (
+    ApplicationStatusChange,
+    CurrencyRate,
+    Job,
+    Industry,
+    JobApplication,
+    SavedJob,
+    JobAlert,
+)
+from .dedupe import find_duplicate_jobs
+from .history import set_status
+from .search import invalidate_job_facets
 
 
 class JobInline(admin.TabularInline):
@@ -123,26 +137,61 @@ class JobAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
             return f"{obj.employer.company_name} ({obj.employer.user.username})"
         return "-"
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change:
+            return
+        # Подпись новой вакансии уже сохранена (jobs.dedupe) — ищем похожие опубликованные
+        duplicates = find_duplicate_jobs(obj, Job.objects.live())
+        if duplicates:
+            self.message_user(
+                request,
+                _("Similar published jobs: %(jobs)s")
+                % {"jobs": ", ".join(f"#{job.pk} {job.title}" for job, _score in duplicates)},
+                level=messages.WARNING,
+            )
+
     actions = ["activate_jobs", "deactivate_jobs", "mark_as_featured"]
 
     @display(description=_("Activate selected jobs"))
     def activate_jobs(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        # update() минует Job.save(): первую публикацию отмечаем здесь
+        updated = queryset.update(
+            is_active=True, activated_at=Coalesce("activated_at", Value(timezone.now()))
+        )
+        invalidate_job_facets()
         self.message_user(request, _("%(count)d jobs activated") % {"count": updated})
 
     @display(description=_("Deactivate selected jobs"))
     def deactivate_jobs(self, request, queryset):
         updated = queryset.update(is_active=False)
+        invalidate_job_facets()
         self.message_user(request, _("%(count)d jobs deactivated") % {"count": updated})
 
     @display(description=_("Mark selected jobs as featured"))
     def mark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=True)
+        invalidate_job_facets()
         self.message_user(
             request, _("%(count)d jobs marked as featured") % {"count": updated}
         )
 
 
+class StatusChangeInline(admin.TabularInline):
+    """Read-only status history within application admin"""
+
+    model = ApplicationStatusChange
+    extra = 0
+    can_delete = False
+    fields = ("from_status", "to_status", "changed_by", "changed_at")
+    readonly_fields = fields
+    verbose_name = "Status Change"
+    verbose_name_plural = "Status History"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 # ИЗМЕНИТЕ TranslationAdmin на admin.ModelAdmin
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
@@ -155,6 +204,7 @@ class JobApplicationAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
         "job__employer__company_name",
     )
     readonly_fields = ("created_at", "updated_at", "status_changed_at")
+    inlines = [StatusChangeInline]
 
     fieldsets = (
         (
@@ -181,14 +231,14 @@ class JobApplicationAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
     ]
 
     def mark_as_reviewed(self, request, queryset):
-        updated = queryset.update(status="reviewed")
+        updated = set_status(queryset, "reviewed", changed_by=request.user)
         self.message_user(
             request, _("%(count)d applications marked as reviewed") % {"count": updated}
         )
 
     @display(description=_("Mark as interview"))
     def mark_as_interview(self, request, queryset):
-        updated = queryset.update(status="interview")
+        updated = set_status(queryset, "interview", changed_by=request.user)
         self.message_user(
             request,
             _("%(count)d applications marked as interview") % {"count": updated},
@@ -196,7 +246,7 @@ class JobApplicationAdmin(admin.ModelAdmin):  # ИЗМЕНИТЕ здесь
 
     @display(description=_("Mark as rejected"))
     def mark_as_rejected(self, request, queryset):
-        updated = queryset.update(status="rejected")
+        updated = set_status(queryset, "rejected", changed_by=request.user)
         self.message_user(
             request, _("%(count)d applications marked as rejected") % {"count": updated}
         )
@@ -260,4 +310,11 @@ class JobAlertAdmin(admin.ModelAdmin):
         updated = queryset.update(is_active=False)
         self.message_user(
             request, _("%(count)d alerts deactivated") % {"count": updated}
-        )
\ No newline at end of file
+        )
+
+
+@admin.register(CurrencyRate)
+class CurrencyRateAdmin(admin.ModelAdmin):
+    # Сохранение курса пересчитывает зарплаты вакансий в UZS (jobs.salary)
+    list_display = ("currency", "uzs_per_unit", "updated_at")
+    readonly_fields = ("updated_at",)
@@ -8,4 +8,4 @@ class JobsConfig(AppConfig):
     verbose_name = _("Jobs")
 
     def ready(self):
-        pass
+        from . import dedupe, history, salary, search, skills  # noqa: F401
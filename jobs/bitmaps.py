@@ -0,0 +1,238 @@
+# jobs/bitmaps.py - битовые индексы опубликованных вакансий для фильтров списка
+#
+# Для каждого значения низкокардинальных полей (тип занятости, опыт,
+# образование, формат работы, диапазон зарплаты) и для каждого флага формы
+# хранится битовая маска опубликованных вакансий: целое число Python, бит N
+# которого означает вакансию с pk=N. Комбинация фильтров — OR внутри
+# измерения и AND между измерениями, число результатов — bit_count(),
+# страница "сначала новые" — старшие биты маски. Из таблицы вакансий потом
+# читается только одна страница строк по первичному ключу.
+#
+# Индекс строится одним запросом по коротким колонкам и хранится в кэше
+# (маски сжаты zlib) и в памяти процесса. Версия индекса — версия кэша
+# фасетов (jobs.search), поэтому сигналы об изменении вакансий делают его
+# устаревшим; кроме того, он устаревает, когда истекает срок ближайшей
+# из проиндексированных вакансий.
+import zlib
+from itertools import islice
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Job
+from .search import CHOICE_FACETS, FLAG_FACETS, SALARY_BANDS, facets_version
+
+BITMAP_CACHE_TTL = 60 * 60
+
+# Фильтры формы, которые индекс не покрывает (текст и точные суммы)
+UNINDEXED_FILTERS = ("query", "location", "salary_min", "salary_max")
+
+# Условия флагов FLAG_FACETS для строки индекса (должны совпадать с Q-условиями)
+FLAG_TESTS = {
+    "is_featured": lambda row: row["is_featured"],
+    "is_urgent": lambda row: row["is_urgent"],
+    "has_salary": lambda row: row["salary_min"] is not None or row["salary_max"] is not None,
+    "remote_ok": lambda row: row["work_type"] in ("remote", "hybrid"),
+}
+
+INDEX_COLUMNS = (
+    "pk",
+    *CHOICE_FACETS,
+    "is_featured",
+    "is_urgent",
+    "salary_min",
+    "salary_max",
+    "salary_max_uzs",
+    "expires_at",
+)
+
+_memo: tuple[str, "JobBitmapIndex"] | None = None
+
+
+def bitset(ids):
+    """Маска из набора неотрицательных целых"""
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for value in ids:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def iter_bits_desc(bits):
+    """Номера установленных битов маски по убыванию"""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for position in range(len(data) - 1, -1, -1):
+        byte = data[position]
+        if byte:
+            for bit in range(7, -1, -1):
+                if byte >> bit & 1:
+                    yield position * 8 + bit
+
+
+def salary_band_of(top):
+    """Диапазон SALARY_BANDS по верхней границе зарплаты в UZS"""
+    if top is None:
+        return None
+    for band, floor in SALARY_BANDS:
+        if top >= floor:
+            return band
+    return None
+
+
+class JobBitmapIndex:
+    """Маски {(измерение, значение): int} опубликованных вакансий"""
+
+    def __init__(self, bitmaps, live, valid_until=None):
+        self.bitmaps = bitmaps
+        self.live = live
+        self.valid_until = valid_until
+
+    @classmethod
+    def build(cls, now=None):
+        now = now or timezone.now()
+        members = {}
+        live = []
+        valid_until = None
+        rows = Job.objects.live(now).order_by().values(*INDEX_COLUMNS)
+        for row in rows.iterator(chunk_size=5000):
+            pk = row["pk"]
+            live.append(pk)
+            for field in CHOICE_FACETS:
+                members.setdefault((field, row[field]), []).append(pk)
+            band = salary_band_of(row["salary_max_uzs"])
+            if band:
+                members.setdefault(("salary", band), []).append(pk)
+            for name, test in FLAG_TESTS.items():
+                if test(row):
+                    members.setdefault(("flag", name), []).append(pk)
+            expires_at = row["expires_at"]
+            if expires_at and (valid_until is None or expires_at < valid_until):
+                valid_until = expires_at
+        bitmaps = {key: bitset(ids) for key, ids in members.items()}
+        return cls(bitmaps, bitset(live), valid_until)
+
+    def is_stale(self, now=None):
+        return self.valid_until is not None and self.valid_until <= (now or timezone.now())
+
+    def dumps(self):
+        def pack(bits):
+            return zlib.compress(bits.to_bytes((bits.bit_length() + 7) // 8, "little"))
+
+        return {
+            "bitmaps": {key: pack(bits) for key, bits in self.bitmaps.items()},
+            "live": pack(self.live),
+            "valid_until": self.valid_until,
+        }
+
+    @classmethod
+    def loads(cls, data):
+        def unpack(packed):
+            return int.from_bytes(zlib.decompress(packed), "little")
+
+        return cls(
+            {key: unpack(packed) for key, packed in data["bitmaps"].items()},
+            unpack(data["live"]),
+            data["valid_until"],
+        )
+
+    def match(self, data, exclude=()):
+        """Маска вакансий, проходящих фильтры data, кроме измерений из exclude"""
+        bits = self.live
+        for field in CHOICE_FACETS:
+            values = data.get(field)
+            if values and field not in exclude:
+                union = 0
+                for value in values:
+                    union |= self.bitmaps.get((field, value), 0)
+                bits &= union
+        for name in FLAG_FACETS:
+            if data.get(name) and name not in exclude:
+                bits &= self.bitmaps.get(("flag", name), 0)
+        return bits
+
+    def counts(self, bits, dimension):
+        """[(значение, количество)] измерения внутри маски, как у facet_counts"""
+        counts = [
+            (value, (bits & mask).bit_count())
+            for (key, value), mask in self.bitmaps.items()
+            if key == dimension
+        ]
+        return sorted(
+            ((value, count) for value, count in counts if count and value != ""),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+
+def bitmap_filterable(data):
+    return not any(data.get(name) for name in UNINDEXED_FILTERS)
+
+
+def get_bitmap_index(now=None):
+    """Актуальный индекс: из памяти процесса, из кэша или построенный заново"""
+    global _memo
+    key = f"jobs:bitmaps:{facets_version()}"
+    if _memo is not None and _memo[0] == key and not _memo[1].is_stale(now):
+        return _memo[1]
+
+    data = cache.get(key)
+    index = JobBitmapIndex.loads(data) if data is not None else None
+    if index is None or index.is_stale(now):
+        index = JobBitmapIndex.build(now)
+        cache.set(key, index.dumps(), BITMAP_CACHE_TTL)
+    _memo = (key, index)
+    return index
+
+
+def bitmap_facets(data):
+    """Счетчики фасетов в формате jobs.search.compute_facets без запросов к вакансиям"""
+    index = get_bitmap_index()
+    facets = {
+        field: index.counts(index.match(data, exclude={field}), field)
+        for field in CHOICE_FACETS
+    }
+    facets["salary"] = index.counts(index.match(data), "salary")
+
+    base = index.match(data, exclude=set(FLAG_FACETS))
+    selected = [name for name in FLAG_FACETS if data.get(name)]
+
+    def with_flags(names):
+        bits = base
+        for name in names:
+            bits &= index.bitmaps.get(("flag", name), 0)
+        return bits.bit_count()
+
+    flags = {"total": with_flags(selected)}
+    for name in FLAG_FACETS:
+        flags[name] = with_flags({name, *selected})
+    facets["flags"] = flags
+    return facets
+
+
+class BitmapJobList:
+    """
+    Результат фильтра по маске для Paginator: число — bit_count(), срез —
+    строки queryset'а по id из старших битов (сначала новые вакансии).
+    """
+
+    def __init__(self, bits, queryset):
+        self.bits = bits
+        self.queryset = queryset
+
+    def count(self):
+        return self.bits.bit_count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        ids = list(islice(iter_bits_desc(self.bits), index.start or 0, index.stop))
+        rows = self.queryset.in_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]
+
+
+def bitmap_jobs(data, queryset):
+    """Вакансии, проходящие фильтры data, в порядке убывания id"""
+    return BitmapJobList(get_bitmap_index().match(data), queryset)
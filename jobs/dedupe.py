@@ -0,0 +1,223 @@
+# jobs/dedupe.py - поиск повторно размещенных (почти одинаковых) вакансий
+#
+# Текст вакансии (название, описание, требования на всех языках) режется на
+# шинглы — тройки соседних нормализованных слов. Сходство двух вакансий —
+# коэффициент Жаккара множеств шинглов; его оценивает доля совпавших
+# значений MinHash-подписи из NUM_PERM хэш-функций.
+#
+# Подпись делится на LSH_BANDS полос по LSH_ROWS значений, хэш каждой полосы —
+# номер корзины (JobBucket). Вакансии с общей корзиной хотя бы в одной полосе —
+# кандидаты в дубликаты: при пороге 0.8 такая пара находится с вероятностью
+# ~95%, а при сходстве 0.5 — ~6%. Проверка новой вакансии — LSH_BANDS
+# поисков по индексу (band, bucket) и сравнение подписей немногих кандидатов,
+# ее стоимость не растет с числом вакансий.
+import hashlib
+import random
+import struct
+from itertools import combinations, groupby
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from modeltranslation import settings as mt_settings
+from modeltranslation.utils import build_localized_fieldname
+
+from core.utils import normalize_search_text
+
+from .models import Job, JobBucket, JobSignature
+
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+
+SHINGLE_SIZE = 3
+
+# Оценка сходства, начиная с которой вакансии считаются дубликатами
+DUPLICATE_THRESHOLD = 0.8
+
+# Сколько подписей читать одним запросом в отчете
+SIGNATURE_CHUNK_SIZE = 500
+
+DEDUPE_TEXT_FIELDS = ("title", "description", "requirements")
+
+DEDUPE_COLUMNS = [
+    build_localized_fieldname(field, code)
+    for field in DEDUPE_TEXT_FIELDS
+    for code in mt_settings.AVAILABLE_LANGUAGES
+]
+
+# update_fields, после которых подпись нужно пересчитать
+DEDUPE_UPDATE_FIELDS = {*DEDUPE_TEXT_FIELDS, *DEDUPE_COLUMNS}
+
+# Хэш-функции (a * x + b) mod p по простому Мерсенна; параметры постоянны,
+# чтобы сохраненные подписи оставались сравнимыми между процессами
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_PACK = struct.Struct(f"<{NUM_PERM}Q")
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def job_shingles(job):
+    """Хэши шинглов текста вакансии (по всем языковым колонкам)"""
+    shingles = set()
+    for column in DEDUPE_COLUMNS:
+        words = normalize_search_text(getattr(job, column, "") or "").split()
+        if not words:
+            continue
+        for start in range(max(len(words) - SHINGLE_SIZE + 1, 1)):
+            shingles.add(_hash64(" ".join(words[start:start + SHINGLE_SIZE])))
+    return shingles
+
+
+def minhash(shingles):
+    """Подпись из NUM_PERM минимумов; None для вакансии без текста"""
+    if not shingles:
+        return None
+    values = [shingle % _PRIME for shingle in shingles]
+    return [min((a * value + b) % _PRIME for value in values) for a, b in PERMUTATIONS]
+
+
+def band_buckets(signature):
+    """Номера корзин полос подписи (знаковые 64-битные, под BigIntegerField)"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{LSH_ROWS}Q", *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def similarity(first, second):
+    """Оценка коэффициента Жаккара по двум подписям"""
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERM
+
+
+def pack(signature):
+    return _PACK.pack(*signature)
+
+
+def unpack(data):
+    return list(_PACK.unpack(bytes(data)))
+
+
+def store_signatures(jobs):
+    """
+    Пересчитать подписи и корзины вакансий jobs (с загруженными текстовыми
+    колонками). Возвращает число вакансий с подписью.
+    """
+    signatures = {job.pk: minhash(job_shingles(job)) for job in jobs}
+    if not signatures:
+        return 0
+    stored = {pk: signature for pk, signature in signatures.items() if signature}
+    with transaction.atomic():
+        JobSignature.objects.filter(job_id__in=signatures).delete()
+        JobBucket.objects.filter(job_id__in=signatures).delete()
+        JobSignature.objects.bulk_create(
+            [JobSignature(job_id=pk, minhashes=pack(sig)) for pk, sig in stored.items()]
+        )
+        JobBucket.objects.bulk_create(
+            [
+                JobBucket(job_id=pk, band=band, bucket=bucket)
+                for pk, signature in stored.items()
+                for band, bucket in enumerate(band_buckets(signature))
+            ]
+        )
+    return len(stored)
+
+
+def find_duplicate_jobs(job, queryset=None, threshold=DUPLICATE_THRESHOLD):
+    """
+    Вакансии из queryset (по умолчанию — все), похожие на job не меньше
+    threshold: [(вакансия, сходство)] по убыванию сходства. job может быть
+    еще не сохранена.
+    """
+    signature = minhash(job_shingles(job))
+    if signature is None:
+        return []
+
+    same_bucket = Q()
+    for band, bucket in enumerate(band_buckets(signature)):
+        same_bucket |= Q(band=band, bucket=bucket)
+    candidates = JobBucket.objects.filter(same_bucket).values("job_id")
+    if job.pk:
+        candidates = candidates.exclude(job_id=job.pk)
+
+    scores = {}
+    for pk, data in JobSignature.objects.filter(job_id__in=candidates).values_list(
+        "job_id", "minhashes"
+    ):
+        score = similarity(signature, unpack(data))
+        if score >= threshold:
+            scores[pk] = score
+    if not scores:
+        return []
+
+    jobs = (queryset if queryset is not None else Job.objects.all()).filter(pk__in=scores)
+    return sorted(((item, scores[item.pk]) for item in jobs), key=lambda pair: -pair[1])
+
+
+def duplicate_clusters(job_ids=None, threshold=DUPLICATE_THRESHOLD):
+    """
+    Группы дубликатов среди всех подписей (или только job_ids):
+    [[(id, сходство с первой вакансией группы)]], сначала большие группы.
+
+    Корзины читаются потоком по индексу (band, bucket); пары берутся только
+    из корзин, где больше одной вакансии, проверяются по подписям и
+    объединяются в группы.
+    """
+    buckets = JobBucket.objects.order_by("band", "bucket")
+    if job_ids is not None:
+        buckets = buckets.filter(job_id__in=job_ids)
+    pairs = set()
+    rows = buckets.values_list("band", "bucket", "job_id").iterator(chunk_size=5000)
+    for _bucket, members in groupby(rows, key=lambda row: row[:2]):
+        pks = sorted(row[2] for row in members)
+        pairs.update(combinations(pks, 2))
+    if not pairs:
+        return []
+
+    involved = sorted({pk for pair in pairs for pk in pair})
+    signatures = {}
+    for start in range(0, len(involved), SIGNATURE_CHUNK_SIZE):
+        chunk = involved[start:start + SIGNATURE_CHUNK_SIZE]
+        for pk, data in JobSignature.objects.filter(job_id__in=chunk).values_list(
+            "job_id", "minhashes"
+        ):
+            signatures[pk] = unpack(data)
+
+    parent = {}
+
+    def root(pk):
+        parent.setdefault(pk, pk)
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    for first, second in pairs:
+        if similarity(signatures[first], signatures[second]) >= threshold:
+            parent[root(second)] = root(first)
+
+    groups = {}
+    for pk in list(parent):
+        groups.setdefault(root(pk), []).append(pk)
+    clusters = []
+    for pks in groups.values():
+        pks.sort()
+        head = signatures[pks[0]]
+        clusters.append([(pk, similarity(head, signatures[pk])) for pk in pks])
+    clusters.sort(key=lambda cluster: (-len(cluster), cluster[0][0]))
+    return clusters
+
+
+@receiver(post_save, sender=Job)
+def store_signature_on_job_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and not DEDUPE_UPDATE_FIELDS & set(update_fields)):
+        return
+    store_signatures([instance])
@@ -0,0 +1,72 @@
+# jobs/expiry.py - снятие с публикации вакансий с истекшим сроком
+#
+# Публичные списки отсекают истекшие вакансии условием Job.objects.live()
+# (expires_at > now OR expires_at IS NULL по индексу job_active_expiry_idx),
+# а команда deactivate_expired_jobs периодически выключает их совсем: пакеты
+# id читаются по тому же индексу и выключаются UPDATE'ами, после чего каждый
+# работодатель получает одно уведомление со списком своих вакансий.
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from accounts.models import Notification
+
+from .models import Job
+from .search import invalidate_job_facets
+
+EXPIRY_CHUNK_SIZE = 500
+
+# Сколько названий вакансий перечислять в уведомлении
+NOTIFICATION_TITLES_LIMIT = 10
+
+
+def _notification(user_id, titles):
+    shown = ", ".join(titles[:NOTIFICATION_TITLES_LIMIT])
+    if len(titles) > NOTIFICATION_TITLES_LIMIT:
+        shown += _(" and %(count)d more") % {"count": len(titles) - NOTIFICATION_TITLES_LIMIT}
+    return Notification(
+        user_id=user_id,
+        notification_type="system",
+        title=_("Job postings expired"),
+        message=_("These job postings reached their deadline and were unpublished: %(jobs)s")
+        % {"jobs": shown},
+    )
+
+
+def deactivate_expired_jobs(chunk_size=EXPIRY_CHUNK_SIZE, now=None, notify=True):
+    """
+    Выключить активные вакансии со сроком до now пакетами по chunk_size.
+
+    Каждый пакет — отдельная транзакция: UPDATE повторяет условие отбора,
+    поэтому вакансия, продленная между чтением и записью, не выключается.
+    save() и сигналы не вызываются. Возвращает число выключенных вакансий.
+    """
+    now = now or timezone.now()
+    expired_titles = {}
+    deactivated = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Job.objects.expired(now)
+                .select_for_update()
+                .order_by("expires_at", "pk")
+                .values_list("pk", "employer__user_id", "title")[:chunk_size]
+            )
+            if not rows:
+                break
+            updated = Job.objects.expired(now).filter(pk__in=[pk for pk, _u, _t in rows]).update(
+                is_active=False, updated_at=now
+            )
+        deactivated += updated
+        for _pk, user_id, title in rows:
+            expired_titles.setdefault(user_id, []).append(title)
+        if len(rows) < chunk_size:
+            break
+
+    if deactivated:
+        invalidate_job_facets()
+    if notify and expired_titles:
+        Notification.objects.bulk_create(
+            [_notification(user_id, titles) for user_id, titles in expired_titles.items()]
+        )
+    return deactivated
@@ -1,6 +1,9 @@
 # jobs/forms.py
 from django import forms
 from django.utils.translation import gettext_lazy as _
+
+from core.skills import canonical_names
+
 from .models import Job, JobApplication, JobAlert
 
 
@@ -15,6 +18,13 @@ class JobForm(forms.ModelForm):
         error_messages={'required': _('You must accept the terms and conditions.')}
     )
 
+    # Подтверждение публикации, похожей на уже размещенную вакансию (jobs.dedupe)
+    confirm_duplicate = forms.BooleanField(
+        required=False,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+        label=_("Publish anyway, this is a different vacancy")
+    )
+
     class Meta:
         model = Job
         fields = [
@@ -144,10 +154,12 @@ class JobForm(forms.ModelForm):
             "skills_required": forms.TextInput(attrs={
                 "class": "form-control",
                 "placeholder": _("Python, Django, JavaScript, React, SQL"),
+                "data-skill-autocomplete": "list",
             }),
             "preferred_skills": forms.TextInput(attrs={
                 "class": "form-control",
                 "placeholder": _("Docker, AWS, GraphQL, TypeScript"),
+                "data-skill-autocomplete": "list",
             }),
 
             # Contact Information
@@ -296,6 +308,13 @@ class JobForm(forms.ModelForm):
 
         return cleaned_data
 
+    def clean_skills_required(self):
+        # Известные навыки сохраняются под каноническими названиями
+        return canonical_names(self.cleaned_data.get('skills_required', ''))
+
+    def clean_preferred_skills(self):
+        return canonical_names(self.cleaned_data.get('preferred_skills', ''))
+
     def clean_short_description(self):
         short_description = self.cleaned_data.get('short_description', '')
         if len(short_description.strip()) < 10:  # Changed from 50 to 10 to be less strict
@@ -0,0 +1,14 @@
+# jobs/history.py - журнал смен статусов откликов на вакансии
+#
+# Каждая смена статуса jobs.JobApplication — через save() или пакетно через
+# set_status — добавляет строку ApplicationStatusChange (общий код с
+# employers.pipeline — в employers.journal). По журналу employers.funnel
+# наращивает воронки вакансий (JobFunnel) и работодателей (EmployerFunnel).
+from employers.journal import StatusJournal
+
+from .models import ApplicationStatusChange, JobApplication
+
+JOURNAL = StatusJournal(JobApplication, ApplicationStatusChange)
+JOURNAL.connect()
+
+set_status = JOURNAL.set_status
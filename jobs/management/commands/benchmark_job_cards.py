@@ -0,0 +1,112 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import translation
+from modeltranslation import settings as mt_settings
+
+from accounts.models import CustomUser, EmployerProfile
+from jobs.models import Job
+
+
+class Rollback(Exception):
+    pass
+
+
+def row_bytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, memoryview)):
+        return len(value)
+    return len(str(value).encode())
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the size of job list queries with and without the card "
+        "projection (Job.objects.for_card)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=15)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            default=0,
+            help="Measure on N generated jobs inside a transaction that is rolled back",
+        )
+        parser.add_argument("--text-size", type=int, default=3000)
+
+    def handle(self, *args, **options):
+        if not options["synthetic"]:
+            self.measure(options)
+            return
+        try:
+            with transaction.atomic():
+                self.generate(options["synthetic"], options["text_size"])
+                self.measure(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def generate(self, count, text_size):
+        user = CustomUser.objects.create_user(
+            username="benchmark-job-cards", password=None, user_type="employer"
+        )
+        employer, _created = EmployerProfile.objects.get_or_create(
+            user=user, defaults={"company_name": "Benchmark"}
+        )
+        text = ("lorem ipsum dolor sit amet " * (text_size // 27 + 1))[:text_size]
+        # Длинные тексты на всех языках, как у реальных вакансий
+        translated = {
+            f"{field}_{code}": text
+            for field in ("description", "requirements", "responsibilities", "benefits")
+            for code in mt_settings.AVAILABLE_LANGUAGES
+        }
+        Job.objects.bulk_create(
+            [
+                Job(
+                    employer=employer,
+                    title=f"Job {index}",
+                    short_description="Short",
+                    location="Tashkent",
+                    employment_type="full_time",
+                    experience_level="junior",
+                    education_level="bachelor",
+                    skills_required="Python",
+                    contact_email="hr@example.com",
+                    **translated,
+                )
+                for index in range(count)
+            ],
+            batch_size=500,
+        )
+
+    def run(self, queryset, repeat):
+        sql, params = queryset.query.sql_with_params()
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            for _index in range(repeat):
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+            columns = len(cursor.description)
+        elapsed = (time.perf_counter() - started) / repeat
+        size = sum(row_bytes(value) for row in rows for value in row)
+        return columns, size, elapsed
+
+    def measure(self, options):
+        page_size, repeat = options["page_size"], max(options["repeat"], 1)
+        for code in mt_settings.AVAILABLE_LANGUAGES:
+            with translation.override(code):
+                page = Job.objects.live().order_by("-created_at")
+                full = self.run(page.select_related("employer")[:page_size], repeat)
+                card = self.run(page.for_card()[:page_size], repeat)
+            self.stdout.write(f"[{code}] page of {page_size} jobs:")
+            for label, (columns, size, elapsed) in (("select *", full), ("for_card", card)):
+                self.stdout.write(
+                    f"  {label:<9} {columns:>3} columns, {size / 1024:8.1f} KiB, "
+                    f"{elapsed * 1000:.2f} ms"
+                )
+            if full[1]:
+                self.stdout.write(f"  payload: {card[1] / full[1] * 100:.1f}% of select *")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from jobs.expiry import EXPIRY_CHUNK_SIZE, deactivate_expired_jobs
+
+
+class Command(BaseCommand):
+    help = "Unpublish active jobs whose deadline has passed and notify their employers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPIRY_CHUNK_SIZE,
+            help="Number of jobs deactivated per UPDATE",
+        )
+        parser.add_argument(
+            "--no-notify",
+            action="store_true",
+            help="Do not send notifications to employers",
+        )
+
+    def handle(self, *args, **options):
+        deactivated = deactivate_expired_jobs(
+            chunk_size=max(options["chunk_size"], 1), notify=not options["no_notify"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deactivated {deactivated} expired jobs"))
@@ -0,0 +1,49 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.models import BASE_CURRENCY, CurrencyRate, Job
+from jobs.salary import recompute_salaries
+
+
+class Command(BaseCommand):
+    help = "Update exchange rates and recompute job salaries in UZS"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--currency",
+            action="append",
+            choices=[code for code, _label in Job.CURRENCY_CHOICES],
+            help="Recompute only jobs in this currency (repeatable)",
+        )
+        parser.add_argument(
+            "--rate",
+            action="append",
+            default=[],
+            metavar="CODE=UZS",
+            help="Set the rate of a currency before recomputing, e.g. USD=12650",
+        )
+
+    def parse_rate(self, value):
+        code, _sep, amount = value.partition("=")
+        code = code.strip().upper()
+        valid = {code for code, _label in Job.CURRENCY_CHOICES} - {BASE_CURRENCY}
+        if code not in valid:
+            raise CommandError(f"Unknown currency in --rate {value!r}")
+        try:
+            rate = Decimal(amount)
+        except InvalidOperation:
+            raise CommandError(f"Invalid rate in --rate {value!r}")
+        if rate <= 0:
+            raise CommandError(f"Rate must be positive in --rate {value!r}")
+        return code, rate
+
+    def handle(self, *args, **options):
+        for code, rate in map(self.parse_rate, options["rate"]):
+            CurrencyRate.objects.update_or_create(currency=code, defaults={"uzs_per_unit": rate})
+            self.stdout.write(f"1 {code} = {rate} {BASE_CURRENCY}")
+
+        # Сохранение курса уже пересчитало свою валюту (после фиксации),
+        # здесь пересчитываются выбранные валюты целиком
+        updated = recompute_salaries(options["currency"])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed salaries of {updated} jobs"))
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from jobs.dedupe import DEDUPE_COLUMNS, DUPLICATE_THRESHOLD, duplicate_clusters, store_signatures
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Report groups of near-duplicate job postings (MinHash/LSH)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DUPLICATE_THRESHOLD,
+            help="Minimum estimated Jaccard similarity of duplicates",
+        )
+        parser.add_argument(
+            "--live-only",
+            action="store_true",
+            help="Only consider published, unexpired jobs",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute all signatures, not only missing ones",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.live() if options["live_only"] else Job.objects.all()
+
+        pending = jobs if options["rebuild"] else jobs.filter(signature__isnull=True)
+        pending = pending.only("pk", *DEDUPE_COLUMNS).order_by("pk")
+        size = max(options["chunk_size"], 1)
+        signed, last = 0, 0
+        while True:
+            batch = list(pending.filter(pk__gt=last)[:size])
+            if not batch:
+                break
+            signed += store_signatures(batch)
+            last = batch[-1].pk
+        if signed:
+            self.stdout.write(f"Computed {signed} signatures")
+
+        job_ids = jobs.values("pk") if options["live_only"] else None
+        clusters = duplicate_clusters(job_ids, threshold=options["threshold"])
+        titles = {
+            job.pk: job
+            for job in Job.objects.filter(
+                pk__in=[pk for cluster in clusters for pk, _score in cluster]
+            ).select_related("employer")
+        }
+        for cluster in clusters:
+            self.stdout.write(f"{len(cluster)} similar jobs:")
+            for pk, score in cluster:
+                job = titles[pk]
+                self.stdout.write(
+                    f"  #{pk} {score:.2f} {job.title} "
+                    f"({job.employer.company_name or job.employer_id}, {job.created_at:%Y-%m-%d})"
+                )
+
+        duplicates = sum(len(cluster) - 1 for cluster in clusters)
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(clusters)} groups, {duplicates} redundant postings")
+        )
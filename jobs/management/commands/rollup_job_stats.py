@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.stats import ROLLUP_REFRESH_DAYS, rollup_job_stats
+
+
+class Command(BaseCommand):
+    help = "Fill the daily job statistics rollup up to yesterday"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Recompute from this date (YYYY-MM-DD) instead of the last rolled day",
+        )
+        parser.add_argument(
+            "--until",
+            help="Last day to roll up (YYYY-MM-DD), yesterday by default",
+        )
+        parser.add_argument(
+            "--refresh-days",
+            type=int,
+            default=ROLLUP_REFRESH_DAYS,
+            help="Number of trailing days recomputed on every run",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = date.fromisoformat(options["since"]) if options["since"] else None
+            until = date.fromisoformat(options["until"]) if options["until"] else None
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        written = rollup_job_stats(
+            until=until, since=since, refresh_days=max(options["refresh_days"], 1)
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily stats rows"))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_activated_at(apps, schema_editor):
+    """Active jobs count as published when they were created"""
+    Job = apps.get_model("jobs", "Job")
+    Job.objects.filter(is_active=True, activated_at__isnull=True).update(
+        activated_at=models.F("created_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_studentsearchdocument'),
+        ('jobs', '0004_industry_description_en_industry_description_ru_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='activated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the job was first published', null=True, verbose_name='Activated At'),
+        ),
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('jobs_created', models.PositiveIntegerField(default=0, verbose_name='Jobs Created')),
+                ('jobs_activated', models.PositiveIntegerField(default=0, verbose_name='Jobs Activated')),
+                ('jobs_expired', models.PositiveIntegerField(default=0, verbose_name='Jobs Expired')),
+                ('remote_jobs', models.PositiveIntegerField(default=0, verbose_name='Remote Jobs Created')),
+                ('featured_jobs', models.PositiveIntegerField(default=0, verbose_name='Featured Jobs Created')),
+                ('applications', models.PositiveIntegerField(default=0, verbose_name='Applications')),
+                ('applications_applied', models.PositiveIntegerField(default=0)),
+                ('applications_reviewed', models.PositiveIntegerField(default=0)),
+                ('applications_shortlisted', models.PositiveIntegerField(default=0)),
+                ('applications_interview', models.PositiveIntegerField(default=0)),
+                ('applications_rejected', models.PositiveIntegerField(default=0)),
+                ('applications_hired', models.PositiveIntegerField(default=0)),
+                ('applications_withdrawn', models.PositiveIntegerField(default=0)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_daily_stats', to='accounts.employerprofile', verbose_name='Employer')),
+                ('industry', models.ForeignKey(blank=True, help_text='Employer industry at rollup time', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jobs.industry', verbose_name='Industry')),
+            ],
+            options={
+                'verbose_name': 'Job Daily Stats',
+                'verbose_name_plural': 'Job Daily Stats',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['industry', 'date'], name='jobs_jobdai_industr_416dad_idx')],
+                'unique_together': {('date', 'employer')},
+            },
+        ),
+        migrations.RunPython(backfill_activated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_studentsearchdocument'),
+        ('jobs', '0005_job_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'expires_at'], name='job_active_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:58
+
+import django.core.validators
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import BigIntegerField, F
+from django.db.models.functions import Cast, Coalesce
+
+
+def backfill_uzs_salaries(apps, schema_editor):
+    """UZS salaries need no rate; other currencies are filled in once rates are entered"""
+    Job = apps.get_model("jobs", "Job")
+    Job.objects.filter(currency="UZS").update(
+        salary_min_uzs=Cast(Coalesce(F("salary_min"), F("salary_max")), BigIntegerField()),
+        salary_max_uzs=Cast(Coalesce(F("salary_max"), F("salary_min")), BigIntegerField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_studentsearchdocument'),
+        ('jobs', '0006_job_expiry_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrencyRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(choices=[('USD', 'USD'), ('EUR', 'EUR')], max_length=3, unique=True, verbose_name='Currency')),
+                ('uzs_per_unit', models.DecimalField(decimal_places=4, help_text='How many UZS one unit of the currency is worth', max_digits=14, validators=[django.core.validators.MinValueValidator(Decimal('0.0001'))], verbose_name='UZS per Unit')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Currency Rate',
+                'verbose_name_plural': 'Currency Rates',
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_uzs',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, help_text='Upper bound of the salary range converted to UZS (minimum if no maximum)', null=True, verbose_name='Maximum Salary (UZS)'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_uzs',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, help_text='Lower bound of the salary range converted to UZS (maximum if no minimum)', null=True, verbose_name='Minimum Salary (UZS)'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_max_uzs'], name='job_active_salary_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'salary_min_uzs'], name='job_active_salary_min_idx'),
+        ),
+        migrations.RunPython(backfill_uzs_salaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_canonicalskill_skillalias'),
+        ('jobs', '0007_job_salary_uzs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_required', models.BooleanField(default=True, help_text='False for preferred (nice to have) skills', verbose_name='Required')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='jobs.job', verbose_name='Job')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='core.canonicalskill', verbose_name='Skill')),
+            ],
+            options={
+                'verbose_name': 'Job Skill',
+                'verbose_name_plural': 'Job Skills',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='skills',
+            field=models.ManyToManyField(blank=True, help_text='Canonical skills parsed from the required and preferred skills', related_name='jobs', through='jobs.JobSkill', to='core.canonicalskill', verbose_name='Skills'),
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['skill', 'job'], name='job_skill_skill_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobskill',
+            constraint=models.UniqueConstraint(fields=('job', 'skill'), name='job_skill_unique'),
+        ),
+    ]
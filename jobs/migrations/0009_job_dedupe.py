@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSignature',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='jobs.job', verbose_name='Job')),
+                ('minhashes', models.BinaryField(verbose_name='MinHash Values')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Job Signature',
+                'verbose_name_plural': 'Job Signatures',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField(verbose_name='Band')),
+                ('bucket', models.BigIntegerField(verbose_name='Bucket')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='jobs.job', verbose_name='Job')),
+            ],
+            options={
+                'verbose_name': 'Job LSH Bucket',
+                'verbose_name_plural': 'Job LSH Buckets',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='job_lsh_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'band'), name='job_bucket_band_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_status_history(apps, schema_editor):
+    """Give applications without history an entry event and, if moved on, their current status"""
+    JobApplication = apps.get_model("jobs", "JobApplication")
+    ApplicationStatusChange = apps.get_model("jobs", "ApplicationStatusChange")
+
+    events = []
+    applications = JobApplication.objects.filter(status_changes__isnull=True).values_list(
+        "pk", "status", "created_at", "status_changed_at"
+    )
+    for pk, status, created_at, changed_at in applications.iterator():
+        events.append(
+            ApplicationStatusChange(
+                application_id=pk, from_status="", to_status="applied", changed_at=created_at
+            )
+        )
+        if status != "applied":
+            events.append(
+                ApplicationStatusChange(
+                    application_id=pk,
+                    from_status="applied",
+                    to_status=status,
+                    changed_at=max(changed_at, created_at),
+                )
+            )
+    ApplicationStatusChange.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_studentsearchdocument'),
+        ('jobs', '0009_job_dedupe'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='status_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When status was last updated', verbose_name='Status Changed'),
+        ),
+        migrations.CreateModel(
+            name='EmployerFunnel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applications', models.PositiveIntegerField(default=0, verbose_name='Applications')),
+                ('reviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Review')),
+                ('interviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Interview')),
+                ('hired', models.PositiveIntegerField(default=0, verbose_name='Hired')),
+                ('rejected', models.PositiveIntegerField(default=0, verbose_name='Rejected')),
+                ('durations', models.JSONField(blank=True, default=dict, help_text='Stage duration histograms by metric', verbose_name='Duration Histograms')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('employer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='funnel', to='accounts.employerprofile', verbose_name='Employer')),
+            ],
+            options={
+                'verbose_name': 'Employer Funnel',
+                'verbose_name_plural': 'Employer Funnels',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobFunnel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applications', models.PositiveIntegerField(default=0, verbose_name='Applications')),
+                ('reviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Review')),
+                ('interviewed', models.PositiveIntegerField(default=0, verbose_name='Reached Interview')),
+                ('hired', models.PositiveIntegerField(default=0, verbose_name='Hired')),
+                ('rejected', models.PositiveIntegerField(default=0, verbose_name='Rejected')),
+                ('durations', models.JSONField(blank=True, default=dict, help_text='Stage duration histograms by metric', verbose_name='Duration Histograms')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='funnel', to='jobs.job', verbose_name='Job')),
+            ],
+            options={
+                'verbose_name': 'Job Funnel',
+                'verbose_name_plural': 'Job Funnels',
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('applied', 'Applied'), ('reviewed', 'Under Review'), ('shortlisted', 'Shortlisted'), ('interview', 'Interview'), ('rejected', 'Rejected'), ('hired', 'Hired'), ('withdrawn', 'Withdrawn')], help_text='Previous status (empty for a new application)', max_length=20, verbose_name='From Status')),
+                ('to_status', models.CharField(choices=[('applied', 'Applied'), ('reviewed', 'Under Review'), ('shortlisted', 'Shortlisted'), ('interview', 'Interview'), ('rejected', 'Rejected'), ('hired', 'Hired'), ('withdrawn', 'Withdrawn')], help_text='New status', max_length=20, verbose_name='To Status')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the status was changed', verbose_name='Changed At')),
+                ('application', models.ForeignKey(help_text='Application whose status changed', on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='jobs.jobapplication', verbose_name='Application')),
+                ('changed_by', models.ForeignKey(blank=True, help_text='User who changed the status', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Changed By')),
+            ],
+            options={
+                'verbose_name': 'Application Status Change',
+                'verbose_name_plural': 'Application Status Changes',
+                'ordering': ['changed_at', 'pk'],
+                'indexes': [models.Index(fields=['application', 'changed_at'], name='jobs_applic_applica_00e18b_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_status_history, migrations.RunPython.noop),
+    ]
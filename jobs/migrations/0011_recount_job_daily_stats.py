@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:10
+
+from django.db import migrations
+
+
+def clear_daily_stats(apps, schema_editor):
+    """Per-status counters now count transitions; the next rollup recomputes every day"""
+    JobDailyStats = apps.get_model("jobs", "JobDailyStats")
+    JobDailyStats.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_application_funnels'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_daily_stats, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,16 @@
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.projection import CardQuerySetMixin
+from employers.models import FunnelStats
+
 User = get_user_model()
 
 
@@ -35,6 +43,58 @@ class Industry(models.Model):
         return self.name
 
 
+# Поля, от которых зависит зарплата в UZS
+SALARY_SOURCE_FIELDS = {"salary_min", "salary_max", "currency"}
+
+# Валюта, к которой приводятся зарплаты
+BASE_CURRENCY = "UZS"
+
+
+class JobQuerySet(CardQuerySetMixin, models.QuerySet):
+    """Job querysets for public listings"""
+
+    # Fields rendered by job cards (lists, home page, similar jobs)
+    card_fields = (
+        "employment_type",
+        "experience_level",
+        "work_type",
+        "salary_min",
+        "salary_max",
+        "currency",
+        "hide_salary",
+        "salary_negotiable",
+        "is_active",
+        "is_featured",
+        "is_urgent",
+        "created_at",
+        "expires_at",
+    )
+    card_translated = (
+        "title",
+        "short_description",
+        "location",
+        "district",
+        "region",
+        "skills_required",
+    )
+    card_related = {
+        "employer": (("company_logo",), ("company_name",)),
+        "employer__industry": ((), ("name",)),
+    }
+
+    def live(self, now=None):
+        """Active jobs whose deadline has not passed (served by job_active_expiry_idx)"""
+        now = now or timezone.now()
+        return self.filter(
+            models.Q(expires_at__gt=now) | models.Q(expires_at__isnull=True),
+            is_active=True,
+        )
+
+    def expired(self, now=None):
+        """Jobs still marked active after their deadline"""
+        return self.filter(is_active=True, expires_at__lte=now or timezone.now())
+
+
 class Job(models.Model):
     """Stores job vacancy information with multilingual support"""
 
@@ -236,6 +296,14 @@ class Job(models.Model):
         verbose_name=_("Preferred Skills"),
         help_text=_("List preferred skills separated by commas")
     )
+    skills = models.ManyToManyField(
+        "core.CanonicalSkill",
+        through="JobSkill",
+        blank=True,
+        related_name="jobs",
+        verbose_name=_("Skills"),
+        help_text=_("Canonical skills parsed from the required and preferred skills")
+    )
 
     # Language Requirements
     language_requirements = models.TextField(
@@ -334,6 +402,27 @@ class Job(models.Model):
         verbose_name=_("Expires At"),
         help_text=_("Job posting expiration date")
     )
+    activated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Activated At"),
+        help_text=_("When the job was first published")
+    )
+    salary_min_uzs = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Minimum Salary (UZS)"),
+        help_text=_("Lower bound of the salary range converted to UZS (maximum if no minimum)")
+    )
+    salary_max_uzs = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Maximum Salary (UZS)"),
+        help_text=_("Upper bound of the salary range converted to UZS (minimum if no maximum)")
+    )
     
     created_by = models.ForeignKey(
         User,
@@ -345,11 +434,16 @@ class Job(models.Model):
         help_text=_("User who created this job")
     )
 
+    objects = JobQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Job")
         verbose_name_plural = _("Jobs")
         ordering = ["-created_at"]
         indexes = [
+            models.Index(fields=['is_active', 'expires_at'], name='job_active_expiry_idx'),
+            models.Index(fields=['is_active', 'salary_max_uzs'], name='job_active_salary_max_idx'),
+            models.Index(fields=['is_active', 'salary_min_uzs'], name='job_active_salary_min_idx'),
             models.Index(fields=['is_active', 'is_featured']),
             models.Index(fields=['employment_type', 'experience_level']),
             models.Index(fields=['region', 'district']),
@@ -358,11 +452,38 @@ class Job(models.Model):
     def __str__(self):
         return f"{self.title} - {self.employer.company_name}"
 
+    def save(self, *args, **kwargs):
+        # Первая публикация фиксируется для ежедневной статистики
+        if self.is_active and self.activated_at is None:
+            self.activated_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "activated_at"}
+        # Зарплата в UZS для фильтров и сортировки по курсам CurrencyRate
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or SALARY_SOURCE_FIELDS & set(update_fields):
+            self.normalize_salary()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "salary_min_uzs", "salary_max_uzs"}
+        super().save(*args, **kwargs)
+
+    def normalize_salary(self, rates=None):
+        """Recompute salary_min_uzs/salary_max_uzs from the salary range and currency rates"""
+        rate = (CurrencyRate.rates() if rates is None else rates).get(self.currency)
+
+        def convert(amount):
+            if amount is None or rate is None:
+                return None
+            return int(amount * rate)
+
+        low, high = convert(self.salary_min), convert(self.salary_max)
+        self.salary_min_uzs = low if low is not None else high
+        self.salary_max_uzs = high if high is not None else low
+
     def get_absolute_url(self):
         return reverse("jobs:job_detail", kwargs={"pk": self.pk})
 
     def is_expired(self):
-        from django.utils import timezone
         if self.expires_at:
             return timezone.now() > self.expires_at
         return False
@@ -482,7 +603,7 @@ class JobApplication(models.Model):
         help_text=_("Current application status")
     )
     status_changed_at = models.DateTimeField(
-        auto_now=True,
+        default=timezone.now,
         verbose_name=_("Status Changed"),
         help_text=_("When status was last updated")
     )
@@ -519,6 +640,170 @@ class JobApplication(models.Model):
         return f"Application from {self.candidate.username} for {self.job.title}"
 
 
+class ApplicationStatusChange(models.Model):
+    """Status transition of a job application (append-only history)"""
+
+    application = models.ForeignKey(
+        JobApplication,
+        on_delete=models.CASCADE,
+        related_name="status_changes",
+        verbose_name=_("Application"),
+        help_text=_("Application whose status changed")
+    )
+    from_status = models.CharField(
+        max_length=20,
+        blank=True,
+        choices=JobApplication.STATUS_CHOICES,
+        verbose_name=_("From Status"),
+        help_text=_("Previous status (empty for a new application)")
+    )
+    to_status = models.CharField(
+        max_length=20,
+        choices=JobApplication.STATUS_CHOICES,
+        verbose_name=_("To Status"),
+        help_text=_("New status")
+    )
+    changed_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Changed By"),
+        help_text=_("User who changed the status")
+    )
+    changed_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Changed At"),
+        help_text=_("When the status was changed")
+    )
+
+    class Meta:
+        verbose_name = _("Application Status Change")
+        verbose_name_plural = _("Application Status Changes")
+        ordering = ["changed_at", "pk"]
+        indexes = [
+            models.Index(fields=["application", "changed_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
+class JobFunnel(FunnelStats):
+    """Funnel rollup of one job"""
+
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="funnel",
+        verbose_name=_("Job"),
+    )
+
+    class Meta:
+        verbose_name = _("Job Funnel")
+        verbose_name_plural = _("Job Funnels")
+
+    def __str__(self):
+        return f"Funnel of {self.job_id}"
+
+
+class EmployerFunnel(FunnelStats):
+    """Funnel rollup of all jobs of an employer"""
+
+    employer = models.OneToOneField(
+        "accounts.EmployerProfile",
+        on_delete=models.CASCADE,
+        related_name="funnel",
+        verbose_name=_("Employer"),
+    )
+
+    class Meta:
+        verbose_name = _("Employer Funnel")
+        verbose_name_plural = _("Employer Funnels")
+
+    def __str__(self):
+        return f"Funnel of {self.employer_id}"
+
+
+class JobSkill(models.Model):
+    """Link between a job and a canonical skill, kept in sync with the skill text fields"""
+
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="skill_links",
+        verbose_name=_("Job")
+    )
+    skill = models.ForeignKey(
+        "core.CanonicalSkill",
+        on_delete=models.CASCADE,
+        related_name="job_links",
+        verbose_name=_("Skill")
+    )
+    is_required = models.BooleanField(
+        default=True,
+        verbose_name=_("Required"),
+        help_text=_("False for preferred (nice to have) skills")
+    )
+
+    class Meta:
+        verbose_name = _("Job Skill")
+        verbose_name_plural = _("Job Skills")
+        constraints = [
+            models.UniqueConstraint(fields=["job", "skill"], name="job_skill_unique"),
+        ]
+        indexes = [models.Index(fields=["skill", "job"], name="job_skill_skill_idx")]
+
+    def __str__(self):
+        return f"{self.job_id}: {self.skill_id}"
+
+
+class JobSignature(models.Model):
+    """MinHash signature of a job's title, description and requirements"""
+
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+        verbose_name=_("Job")
+    )
+    minhashes = models.BinaryField(verbose_name=_("MinHash Values"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Job Signature")
+        verbose_name_plural = _("Job Signatures")
+
+    def __str__(self):
+        return f"Signature of job {self.job_id}"
+
+
+class JobBucket(models.Model):
+    """LSH bucket of one band of a job signature; shared buckets mark candidate duplicates"""
+
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="lsh_buckets",
+        verbose_name=_("Job")
+    )
+    band = models.PositiveSmallIntegerField(verbose_name=_("Band"))
+    bucket = models.BigIntegerField(verbose_name=_("Bucket"))
+
+    class Meta:
+        verbose_name = _("Job LSH Bucket")
+        verbose_name_plural = _("Job LSH Buckets")
+        constraints = [
+            models.UniqueConstraint(fields=["job", "band"], name="job_bucket_band_unique"),
+        ]
+        indexes = [models.Index(fields=["band", "bucket"], name="job_lsh_bucket_idx")]
+
+    def __str__(self):
+        return f"{self.job_id}: {self.band}/{self.bucket}"
+
+
 class SavedJob(models.Model):
     """Stores user's saved job bookmarks"""
 
@@ -645,4 +930,90 @@ class JobAlert(models.Model):
         ordering = ["-created_at"]
 
     def __str__(self):
-        return f"{self.name} - {self.user.username}"
\ No newline at end of file
+        return f"{self.name} - {self.user.username}"
+
+
+class JobDailyStats(models.Model):
+    """Daily job and application counters per employer (rollup of jobs.stats)"""
+
+    date = models.DateField(verbose_name=_("Date"))
+    employer = models.ForeignKey(
+        "accounts.EmployerProfile",
+        on_delete=models.CASCADE,
+        related_name="job_daily_stats",
+        verbose_name=_("Employer"),
+    )
+    industry = models.ForeignKey(
+        Industry,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Industry"),
+        help_text=_("Employer industry at rollup time")
+    )
+
+    jobs_created = models.PositiveIntegerField(default=0, verbose_name=_("Jobs Created"))
+    jobs_activated = models.PositiveIntegerField(default=0, verbose_name=_("Jobs Activated"))
+    jobs_expired = models.PositiveIntegerField(default=0, verbose_name=_("Jobs Expired"))
+    remote_jobs = models.PositiveIntegerField(default=0, verbose_name=_("Remote Jobs Created"))
+    featured_jobs = models.PositiveIntegerField(default=0, verbose_name=_("Featured Jobs Created"))
+
+    applications = models.PositiveIntegerField(default=0, verbose_name=_("Applications"))
+    applications_applied = models.PositiveIntegerField(default=0)
+    applications_reviewed = models.PositiveIntegerField(default=0)
+    applications_shortlisted = models.PositiveIntegerField(default=0)
+    applications_interview = models.PositiveIntegerField(default=0)
+    applications_rejected = models.PositiveIntegerField(default=0)
+    applications_hired = models.PositiveIntegerField(default=0)
+    applications_withdrawn = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Job Daily Stats")
+        verbose_name_plural = _("Job Daily Stats")
+        ordering = ["-date"]
+        unique_together = ["date", "employer"]
+        indexes = [
+            models.Index(fields=["industry", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.employer_id}"
+
+
+class CurrencyRate(models.Model):
+    """Locally maintained exchange rate used to normalize job salaries to UZS"""
+
+    RATES_CACHE_KEY = "jobs:currency_rates"
+
+    currency = models.CharField(
+        max_length=3,
+        unique=True,
+        choices=[choice for choice in Job.CURRENCY_CHOICES if choice[0] != BASE_CURRENCY],
+        verbose_name=_("Currency"),
+    )
+    uzs_per_unit = models.DecimalField(
+        max_digits=14,
+        decimal_places=4,
+        validators=[MinValueValidator(Decimal("0.0001"))],
+        verbose_name=_("UZS per Unit"),
+        help_text=_("How many UZS one unit of the currency is worth")
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Currency Rate")
+        verbose_name_plural = _("Currency Rates")
+        ordering = ["currency"]
+
+    def __str__(self):
+        return f"1 {self.currency} = {self.uzs_per_unit} {BASE_CURRENCY}"
+
+    @classmethod
+    def rates(cls):
+        """{currency: UZS per unit}, cached; UZS itself is always 1"""
+        rates = cache.get(cls.RATES_CACHE_KEY)
+        if rates is None:
+            rates = dict(cls.objects.values_list("currency", "uzs_per_unit"))
+            cache.set(cls.RATES_CACHE_KEY, rates, None)
+        return {**rates, BASE_CURRENCY: Decimal(1)}
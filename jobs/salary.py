@@ -0,0 +1,82 @@
+# jobs/salary.py - зарплаты вакансий в UZS
+#
+# Job хранит границы зарплаты в валюте вакансии и их копии в UZS
+# (salary_min_uzs / salary_max_uzs), пересчитанные по таблице CurrencyRate.
+# Фильтры и сортировка по зарплате работают только с колонками в UZS, для
+# которых есть индексы. Job.save() пересчитывает копии сам; после смены
+# курса вакансии в этой валюте пересчитываются одним UPDATE.
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BigIntegerField, DecimalField, F, Value
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import BASE_CURRENCY, CurrencyRate, Job
+from .search import invalidate_job_facets
+
+
+def to_uzs(amount, currency=None, rates=None):
+    """Сумма в UZS; None, если курс валюты неизвестен"""
+    if amount is None:
+        return None
+    rate = (CurrencyRate.rates() if rates is None else rates).get(currency or BASE_CURRENCY)
+    return None if rate is None else int(amount * rate)
+
+
+def _converted(first, second, rate):
+    amount = Coalesce(F(first), F(second))
+    return Cast(
+        amount * Value(rate, output_field=DecimalField(max_digits=14, decimal_places=4)),
+        output_field=BigIntegerField(),
+    )
+
+
+def recompute_salaries(currencies=None):
+    """
+    Пересчитать зарплаты в UZS вакансий в указанных валютах (по умолчанию —
+    во всех) по текущим курсам: один UPDATE на валюту. Вакансии в валюте без
+    курса получают пустые значения. Возвращает число обновленных вакансий.
+    """
+    rates = CurrencyRate.rates()
+    if currencies is None:
+        currencies = [code for code, _label in Job.CURRENCY_CHOICES]
+
+    updated = 0
+    with transaction.atomic():
+        for currency in currencies:
+            jobs = Job.objects.filter(currency=currency)
+            rate = rates.get(currency)
+            if rate is None:
+                updated += jobs.update(salary_min_uzs=None, salary_max_uzs=None)
+            else:
+                updated += jobs.update(
+                    salary_min_uzs=_converted("salary_min", "salary_max", rate),
+                    salary_max_uzs=_converted("salary_max", "salary_min", rate),
+                )
+    if updated:
+        invalidate_job_facets()
+    return updated
+
+
+# ============ СМЕНА КУРСА ============
+
+
+def _rate_changed(currency):
+    def refresh():
+        # Курсы сбрасываются после фиксации, чтобы в кэш не попало старое значение
+        cache.delete(CurrencyRate.RATES_CACHE_KEY)
+        recompute_salaries([currency])
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=CurrencyRate)
+def recompute_on_rate_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _rate_changed(instance.currency)
+
+
+@receiver(post_delete, sender=CurrencyRate)
+def recompute_on_rate_delete(sender, instance, **kwargs):
+    _rate_changed(instance.currency)
@@ -0,0 +1,231 @@
+# jobs/search.py - фильтры поиска вакансий и счетчики фасетов
+#
+# filter_jobs применяет к queryset'у поля JobSearchForm. job_facets считает
+# счетчики всех фасетов текущей выборки: один GROUP BY на измерение (для
+# измерения применяются все фильтры, кроме его собственного, чтобы были
+# видны альтернативы) и один агрегат на все флаги. Счетчики кэшируются по
+# нормализованной строке запроса; номер версии в ключе меняется при
+# изменении вакансий, поэтому устаревшие записи просто не читаются.
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import get_language
+from django.utils.translation import gettext_lazy as _
+
+from core.search import facet_counts
+
+from .models import Job
+
+# Поля выбора, по которым считаются фасеты
+CHOICE_FACETS = ("employment_type", "experience_level", "education_level", "work_type")
+
+# Флаги "только ..." формы: условие, которое включает флаг
+FLAG_FACETS = {
+    "is_featured": Q(is_featured=True),
+    "is_urgent": Q(is_urgent=True),
+    "has_salary": Q(salary_min__isnull=False) | Q(salary_max__isnull=False),
+    "remote_ok": Q(work_type__in=("remote", "hybrid")),
+}
+
+# Диапазоны зарплаты в UZS (по верхней границе вакансии) — значения фильтра на странице
+SALARY_BANDS = (
+    ("10000000+", 10_000_000),
+    ("6000000-10000000", 6_000_000),
+    ("3000000-6000000", 3_000_000),
+    ("0-3000000", 0),
+)
+
+SALARY_BAND_LABELS = {
+    "0-3000000": _("Up to 3,000,000 UZS"),
+    "3000000-6000000": _("3-6 million UZS"),
+    "6000000-10000000": _("6-10 million UZS"),
+    "10000000+": _("Over 10 million UZS"),
+}
+
+# Поля формы, входящие в ключ кэша
+QUERY_FIELDS = (
+    "query",
+    "location",
+    *CHOICE_FACETS,
+    "salary_min",
+    "salary_max",
+    "currency",
+    *FLAG_FACETS,
+)
+
+FACETS_CACHE_TTL = 5 * 60
+FACETS_VERSION_KEY = "jobs:facets:version"
+
+# Поля, изменение которых не влияет на фасеты (счетчики просмотров и откликов)
+UNFACETED_FIELDS = {"views_count", "applications_count", "updated_at"}
+
+
+def filter_jobs(jobs, data, exclude=()):
+    """Применить фильтры формы поиска (cleaned_data), кроме измерений из exclude"""
+    query = data.get("query")
+    if query:
+        jobs = jobs.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(employer__company_name__icontains=query)
+            | Q(skills_required__icontains=query)
+        )
+
+    location = data.get("location")
+    if location:
+        jobs = jobs.filter(
+            Q(location__icontains=location)
+            | Q(region__icontains=location)
+            | Q(district__icontains=location)
+        )
+
+    for field in CHOICE_FACETS:
+        values = data.get(field)
+        if values and field not in exclude:
+            jobs = jobs.filter(**{f"{field}__in": values})
+
+    if "salary" not in exclude:
+        from .salary import to_uzs
+
+        # Суммы формы — в выбранной валюте, сравнение — по индексам колонок в UZS;
+        # при неизвестном курсе фильтр по сумме не применяется
+        salary_min = to_uzs(data.get("salary_min") or None, data.get("currency"))
+        if salary_min:
+            jobs = jobs.filter(salary_max_uzs__gte=salary_min)
+        salary_max = to_uzs(data.get("salary_max") or None, data.get("currency"))
+        if salary_max:
+            jobs = jobs.filter(salary_min_uzs__lte=salary_max)
+
+    for name, condition in FLAG_FACETS.items():
+        if data.get(name) and name not in exclude:
+            jobs = jobs.filter(condition)
+    return jobs
+
+
+def normalize_query(data):
+    """Строка запроса, одинаковая для равнозначных наборов фильтров"""
+    parts = []
+    for name in QUERY_FIELDS:
+        value = data.get(name)
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        elif isinstance(value, (list, tuple)):
+            value = ",".join(sorted(value))
+        if value in (None, "", False):
+            continue
+        parts.append(f"{name}={value}")
+    return "&".join(parts)
+
+
+def facets_version():
+    version = cache.get(FACETS_VERSION_KEY)
+    if version is None:
+        # Начальное значение от времени, как у версий RSS-лент
+        cache.add(FACETS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(FACETS_VERSION_KEY)
+    return version
+
+
+def invalidate_job_facets():
+    try:
+        cache.incr(FACETS_VERSION_KEY)
+    except ValueError:
+        cache.set(FACETS_VERSION_KEY, time.time_ns(), None)
+
+
+def salary_band():
+    """Диапазон по верхней границе зарплаты в UZS; "" — не указана"""
+    return Case(
+        *(When(salary_max_uzs__gte=floor, then=Value(band)) for band, floor in SALARY_BANDS),
+        default=Value(""),
+        output_field=CharField(),
+    )
+
+
+def compute_facets(jobs, data):
+    """
+    Счетчики фасетов без кэша: {измерение: [(значение, количество)]} для
+    полей выбора и зарплаты, {флаг: количество} для флагов и total.
+    """
+    facets = {
+        field: facet_counts(filter_jobs(jobs, data, exclude={field}), field)
+        for field in CHOICE_FACETS
+    }
+
+    facets["salary"] = facet_counts(
+        filter_jobs(jobs, data, exclude={"salary"}).annotate(salary_band=salary_band()),
+        "salary_band",
+    )
+
+    # Счетчик флага — выборка со всеми фильтрами, где этот флаг включен
+    selected = {name: condition for name, condition in FLAG_FACETS.items() if data.get(name)}
+    # Псевдонимы агрегатов не должны совпадать с полями из условий
+    counters = {"flag_total": Count("pk", filter=Q(*selected.values()))}
+    for name, condition in FLAG_FACETS.items():
+        others = [other for other_name, other in selected.items() if other_name != name]
+        counters[f"flag_{name}"] = Count("pk", filter=Q(condition, *others))
+    totals = filter_jobs(jobs, data, exclude=set(FLAG_FACETS)).aggregate(**counters)
+    facets["flags"] = {alias.removeprefix("flag_"): count for alias, count in totals.items()}
+    return facets
+
+
+def _labels(field):
+    return dict(Job._meta.get_field(field).choices)
+
+
+def job_facets(jobs, data, scope="live"):
+    """
+    Счетчики фасетов для выборки jobs с фильтрами data (cleaned_data формы).
+
+    scope отличает выборки разных ролей (опубликованные, вакансии
+    работодателя, все) в ключе кэша; для scope="live" jobs — это
+    Job.objects.live(), и фильтры без текста и сумм считаются по битовому
+    индексу. Значения полей выбора и диапазоны
+    зарплаты дополняются подписями: [(значение, подпись, количество)].
+    """
+    from .bitmaps import bitmap_facets, bitmap_filterable
+
+    if scope == "live" and bitmap_filterable(data):
+        # Фильтры покрыты битовым индексом (jobs.bitmaps): считаем без запросов
+        facets = bitmap_facets(data)
+    else:
+        normalized = normalize_query(data)
+        digest = hashlib.md5(normalized.encode()).hexdigest()
+        key = f"jobs:facets:{facets_version()}:{scope}:{get_language() or ''}:{digest}"
+        facets = cache.get(key)
+        if facets is None:
+            facets = compute_facets(jobs, data)
+            cache.set(key, facets, FACETS_CACHE_TTL)
+
+    labelled = dict(facets)
+    for field in CHOICE_FACETS:
+        labels = _labels(field)
+        labelled[field] = [
+            (value, labels.get(value, value), count) for value, count in facets[field]
+        ]
+    salary = dict(facets["salary"])
+    labelled["salary"] = [
+        (band, SALARY_BAND_LABELS[band], salary[band])
+        for band, _floor in reversed(SALARY_BANDS)
+        if band in salary
+    ]
+    return labelled
+
+
+# ============ СБРОС КЭША ФАСЕТОВ ============
+
+
+@receiver(post_save, sender=Job)
+def invalidate_facets_on_job_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= UNFACETED_FIELDS):
+        return
+    invalidate_job_facets()
+
+
+@receiver(post_delete, sender=Job)
+def invalidate_facets_on_job_delete(sender, instance, **kwargs):
+    invalidate_job_facets()
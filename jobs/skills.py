@@ -0,0 +1,80 @@
+# jobs/skills.py - навыки вакансий в общем словаре (core.skills)
+#
+# Текстовые поля skills_required и preferred_skills (все языковые колонки)
+# разбираются в ссылки JobSkill на core.CanonicalSkill: при сохранении
+# вакансии и пакетно командой backfill_skills. Подбор вакансий по навыкам
+# соединяет JobSkill по id навыка вместо icontains по тексту.
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from modeltranslation import settings as mt_settings
+from modeltranslation.utils import build_localized_fieldname
+
+from core.skills import skill_ids, split_skills
+from core.utils import skill_key
+
+from .models import Job, JobSkill
+
+SKILL_TEXT_FIELDS = ("skills_required", "preferred_skills")
+
+# Колонки текстовых полей навыков на всех языках
+SKILL_COLUMNS = {
+    field: [build_localized_fieldname(field, code) for code in mt_settings.AVAILABLE_LANGUAGES]
+    for field in SKILL_TEXT_FIELDS
+}
+
+# update_fields, после которых связи нужно пересобрать
+SKILL_UPDATE_FIELDS = {
+    *SKILL_TEXT_FIELDS,
+    *(column for columns in SKILL_COLUMNS.values() for column in columns),
+}
+
+
+def job_skill_names(job, field):
+    """Названия навыков поля field вакансии на всех языках"""
+    names = []
+    for column in SKILL_COLUMNS[field]:
+        names.extend(split_skills(getattr(job, column, "")))
+    return names
+
+
+def sync_job_skills(jobs):
+    """
+    Пересобрать связи JobSkill вакансий jobs по их текстовым полям.
+
+    Неизвестные навыки добавляются в словарь. Обязательный навык не
+    дублируется как желательный. Возвращает число созданных связей.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return 0
+    parsed = {
+        job.pk: {field: job_skill_names(job, field) for field in SKILL_TEXT_FIELDS}
+        for job in jobs
+    }
+    ids = skill_ids(
+        (name for fields in parsed.values() for names in fields.values() for name in names),
+        create=True,
+    )
+
+    links = []
+    for pk, fields in parsed.items():
+        required = {ids.get(skill_key(name)) for name in fields["skills_required"]}
+        preferred = {ids.get(skill_key(name)) for name in fields["preferred_skills"]} - required
+        links.extend(
+            JobSkill(job_id=pk, skill_id=skill_id, is_required=is_required)
+            for linked, is_required in ((required, True), (preferred, False))
+            for skill_id in linked
+            if skill_id is not None
+        )
+    with transaction.atomic():
+        JobSkill.objects.filter(job_id__in=parsed).delete()
+        JobSkill.objects.bulk_create(links)
+    return len(links)
+
+
+@receiver(post_save, sender=Job)
+def sync_skills_on_job_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and not SKILL_UPDATE_FIELDS & set(update_fields)):
+        return
+    sync_job_skills([instance])
@@ -0,0 +1,214 @@
+# jobs/stats.py - ежедневная сводка по вакансиям и откликам
+#
+# JobDailyStats хранит счетчики за день по работодателю (и его отрасли):
+# созданные, опубликованные, истекшие вакансии, удаленные и выделенные
+# вакансии, поданные отклики и переходы откликов в каждый статус (по журналу
+# ApplicationStatusChange, поэтому счетчики прошедших дней не устаревают,
+# когда отклик потом меняет статус). Команда rollup_job_stats досчитывает дни
+# после последнего сохраненного, перезаписывая несколько последних (на случай
+# записей, зафиксированных задним числом). Статистика за любой период — сумма
+# строк сводки плюс "живой" подсчет дней, которые еще не попали в сводку
+# (обычно сегодня).
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import EmployerProfile
+
+from .models import ApplicationStatusChange, Job, JobApplication, JobDailyStats
+
+# Сколько последних дней пересчитывается при каждом запуске
+ROLLUP_REFRESH_DAYS = 3
+
+# Дней в одном пакете пересчета
+ROLLUP_CHUNK_DAYS = 31
+
+APPLICATION_STATUSES = [status for status, _label in JobApplication.STATUS_CHOICES]
+
+COUNTER_FIELDS = (
+    "jobs_created",
+    "jobs_activated",
+    "jobs_expired",
+    "remote_jobs",
+    "featured_jobs",
+    "applications",
+    *(f"applications_{status}" for status in APPLICATION_STATUSES),
+)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _by_day(queryset, field, start, end, employer_field, **counters):
+    """{(день, работодатель): {счетчик: n}} — один GROUP BY по дням диапазона"""
+    tz = timezone.get_current_timezone()
+    window = {
+        f"{field}__gte": _day_start(start),
+        f"{field}__lt": _day_start(end + timedelta(days=1)),
+    }
+    rows = (
+        queryset.filter(**window)
+        .annotate(day=TruncDate(field, tzinfo=tz))
+        .order_by()
+        .values("day", employer_field)
+        .annotate(**counters)
+    )
+    for row in rows:
+        yield (row["day"], row[employer_field]), {name: row[name] for name in counters}
+
+
+def compute_daily_rows(start, end):
+    """
+    Счетчики за дни [start, end] по живым таблицам: {(день, employer_id):
+    {поле: значение}}. Пять запросов независимо от длины диапазона.
+    """
+    rows = {}
+
+    def merge(items):
+        for key, values in items:
+            counters = rows.setdefault(key, dict.fromkeys(COUNTER_FIELDS, 0))
+            for name, value in values.items():
+                counters[name] += value
+
+    merge(
+        _by_day(
+            Job.objects.all(), "created_at", start, end, "employer_id",
+            jobs_created=Count("pk"),
+            remote_jobs=Count("pk", filter=Q(work_type="remote")),
+            featured_jobs=Count("pk", filter=Q(is_featured=True)),
+        )
+    )
+    merge(
+        _by_day(
+            Job.objects.all(), "activated_at", start, end, "employer_id",
+            jobs_activated=Count("pk"),
+        )
+    )
+    # Истекшей вакансия считается только после наступления срока
+    merge(
+        _by_day(
+            Job.objects.filter(expires_at__lte=timezone.now()), "expires_at", start, end,
+            "employer_id", jobs_expired=Count("pk"),
+        )
+    )
+    merge(
+        _by_day(
+            JobApplication.objects.all(), "created_at", start, end, "job__employer_id",
+            applications=Count("pk"),
+        )
+    )
+    # applications_<статус> — сколько откликов перешло в статус за день
+    merge(
+        _by_day(
+            ApplicationStatusChange.objects.all(), "changed_at", start, end,
+            "application__job__employer_id",
+            **{
+                f"applications_{status}": Count("pk", filter=Q(to_status=status))
+                for status in APPLICATION_STATUSES
+            },
+        )
+    )
+    return rows
+
+
+def _industries(employer_ids):
+    return dict(
+        EmployerProfile.objects.filter(pk__in=employer_ids).values_list("pk", "industry_id")
+    )
+
+
+def store_daily_rows(start, end):
+    """Пересчитать и перезаписать строки сводки за дни [start, end]"""
+    rows = compute_daily_rows(start, end)
+    industries = _industries({employer_id for _day, employer_id in rows})
+    with transaction.atomic():
+        JobDailyStats.objects.filter(date__gte=start, date__lte=end).delete()
+        JobDailyStats.objects.bulk_create(
+            [
+                JobDailyStats(
+                    date=day,
+                    employer_id=employer_id,
+                    industry_id=industries.get(employer_id),
+                    **counters,
+                )
+                for (day, employer_id), counters in sorted(rows.items())
+            ],
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+def last_rolled_day():
+    return JobDailyStats.objects.aggregate(last=Max("date"))["last"]
+
+
+def rollup_job_stats(until=None, since=None, refresh_days=ROLLUP_REFRESH_DAYS):
+    """
+    Досчитать сводку до until (по умолчанию — вчера включительно).
+
+    Без since начинает с последнего сохраненного дня минус refresh_days, а
+    при пустой сводке — с первой вакансии. Возвращает число записанных строк.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    if since is None:
+        last = last_rolled_day()
+        if last is not None:
+            since = last - timedelta(days=refresh_days - 1)
+        else:
+            first = Job.objects.aggregate(first=Min("created_at"))["first"]
+            if first is None:
+                return 0
+            since = timezone.localdate(first)
+
+    written = 0
+    start = since
+    while start <= until:
+        end = min(start + timedelta(days=ROLLUP_CHUNK_DAYS - 1), until)
+        written += store_daily_rows(start, end)
+        start = end + timedelta(days=1)
+    return written
+
+
+def job_stats(start=None, end=None, employer=None, industry=None):
+    """
+    Суммы счетчиков за дни [start, end] (None — без границы).
+
+    Дни после последнего сохраненного в сводке досчитываются по живым
+    таблицам, поэтому результат не зависит от того, когда запускалась команда.
+    """
+    end = end or timezone.localdate()
+    employer_id = getattr(employer, "pk", employer)
+    industry_id = getattr(industry, "pk", industry)
+
+    rows = JobDailyStats.objects.filter(date__lte=end)
+    if start:
+        rows = rows.filter(date__gte=start)
+    if employer_id is not None:
+        rows = rows.filter(employer_id=employer_id)
+    if industry_id is not None:
+        rows = rows.filter(industry_id=industry_id)
+    totals = rows.aggregate(**{field: Sum(field) for field in COUNTER_FIELDS})
+    totals = {field: value or 0 for field, value in totals.items()}
+
+    last = last_rolled_day()
+    live_start = last + timedelta(days=1) if last else start
+    if live_start is None:
+        first = Job.objects.aggregate(first=Min("created_at"))["first"]
+        live_start = timezone.localdate(first) if first else end
+    if start and live_start < start:
+        live_start = start
+    if live_start <= end:
+        live = compute_daily_rows(live_start, end)
+        industries = _industries({pk for _day, pk in live}) if industry_id is not None else {}
+        for (_day, row_employer), counters in live.items():
+            if employer_id is not None and row_employer != employer_id:
+                continue
+            if industry_id is not None and industries.get(row_employer) != industry_id:
+                continue
+            for field, value in counters.items():
+                totals[field] += value
+    return totals
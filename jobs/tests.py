@@ -1,2 +1,567 @@
+import csv
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from accounts.models import CustomUser, EmployerProfile, Notification
+from core.models import CanonicalSkill, SkillAlias
+from cvbuilder.models import CV, Skill as CVSkill
+
+from .bitmaps import bitmap_facets, bitmap_jobs, get_bitmap_index, iter_bits_desc
+from .dedupe import duplicate_clusters, find_duplicate_jobs
+from .expiry import deactivate_expired_jobs
+from employers.funnel import JOBS_FUNNELS, rollup_source
+
+from .history import set_status
+from .models import (
+	CurrencyRate,
+	EmployerFunnel,
+	Industry,
+	Job,
+	JobApplication,
+	JobFunnel,
+	JobBucket,
+	JobDailyStats,
+	JobSignature,
+	JobSkill,
+)
+from .salary import recompute_salaries
+from .search import compute_facets, filter_jobs, job_facets, normalize_query
+from .stats import job_stats, rollup_job_stats
+from .utils import generate_job_stats, get_job_recommendations
+
+
+def make_employer(username="employer", industry=None):
+	user = CustomUser.objects.create_user(
+		username=username, email=f"{username}@example.com", password="pass12345",
+		user_type="employer",
+	)
+	profile, _created = EmployerProfile.objects.get_or_create(
+		user=user, defaults={"company_name": "Acme", "company_description": "Acme"},
+	)
+	profile.industry = industry
+	profile.save()
+	return profile
+
+
+def make_job(employer, **extra):
+	fields = {
+		"title": "Developer", "description": "Build", "short_description": "Build",
+		"employer": employer, "location": "Tashkent", "work_type": "office",
+		"employment_type": "full_time", "experience_level": "junior",
+		"education_level": "bachelor", "requirements": "Python", "responsibilities": "Code",
+		"skills_required": "Python", "contact_email": "hr@example.com",
+	}
+	fields.update(extra)
+	return Job.objects.create(**fields)
+
+
+def make_application(job, username, status="applied"):
+	candidate = CustomUser.objects.create_user(
+		username=username, email=f"{username}@example.com", password="pass12345",
+		user_type="student",
+	)
+	return JobApplication.objects.create(job=job, candidate=candidate, cover_letter="Hi", status=status)
+
+
+def days_ago(days):
+	return timezone.now() - timedelta(days=days)
+
+
+class JobDailyStatsTests(TestCase):
+	def setUp(self):
+		self.industry = Industry.objects.create(name="IT")
+		self.employer = make_employer(industry=self.industry)
+		self.other = make_employer("other")
+		old = make_job(self.employer, work_type="remote", is_featured=True)
+		make_job(self.employer, expires_at=days_ago(1))
+		make_job(self.other, is_active=False)
+		Job.objects.filter(pk=old.pk).update(created_at=days_ago(10), activated_at=days_ago(10))
+		make_application(old, "candidate1", status="rejected")
+		make_application(old, "candidate2")
+
+	def test_rollup_and_live_days_add_up(self):
+		live = job_stats()
+		# Строки до вчерашнего дня: создание старой вакансии и истечение срока вчера
+		self.assertEqual(rollup_job_stats(), 2)
+		self.assertEqual(JobDailyStats.objects.filter(employer=self.employer).count(), 2)
+		self.assertEqual(job_stats(), live)
+		self.assertEqual(live["jobs_created"], 3)
+		self.assertEqual(live["jobs_activated"], 2)
+		self.assertEqual(live["jobs_expired"], 1)
+		self.assertEqual(live["remote_jobs"], 1)
+		self.assertEqual(live["applications_rejected"], 1)
+
+		# Повторный запуск перезаписывает последние дни, а не дублирует их
+		rollup_job_stats()
+		self.assertEqual(job_stats(), live)
+
+	def test_status_counters_follow_transitions(self):
+		application = JobApplication.objects.get(candidate__username="candidate2")
+		application.status_changes.update(changed_at=days_ago(10))
+		rollup_job_stats()
+		self.assertEqual(job_stats()["applications_applied"], 1)
+
+		# Смена статуса давнего отклика учитывается днем перехода, а не днем подачи
+		set_status(JobApplication.objects.filter(pk=application.pk), "hired")
+		rollup_job_stats()
+		totals = job_stats()
+		self.assertEqual((totals["applications_applied"], totals["applications_hired"]), (1, 1))
+		self.assertEqual(job_stats(end=timezone.localdate() - timedelta(days=1))["applications_hired"], 0)
+
+	def test_ranges_and_dimensions(self):
+		rollup_job_stats()
+		today = timezone.localdate()
+		week = job_stats(start=today - timedelta(days=7))
+		self.assertEqual(week["jobs_created"], 2)
+		self.assertEqual(job_stats(employer=self.other)["jobs_created"], 1)
+		self.assertEqual(job_stats(industry=self.industry)["jobs_created"], 2)
+		with self.assertNumQueries(2):
+			job_stats(end=today - timedelta(days=1))
+
+	def test_generate_job_stats(self):
+		stats = generate_job_stats("week")
+		self.assertEqual(stats["total_jobs"], 2)
+		# Единственная активная вакансия недели уже истекла
+		self.assertEqual(stats["active_jobs"], 0)
+		self.assertEqual(generate_job_stats()["active_jobs"], 1)
+		self.assertEqual(generate_job_stats()["total_applications"], 2)
+
+
+class JobApplicationFunnelTests(TestCase):
+	def setUp(self):
+		self.employer = make_employer()
+		self.job = make_job(self.employer)
+		self.applications = [make_application(self.job, f"candidate{i}") for i in range(3)]
+
+	def test_every_transition_is_logged(self):
+		application = self.applications[0]
+		first_change = application.status_changed_at
+		application.is_read = True
+		application.save()
+		self.assertEqual(application.status_changed_at, first_change)
+
+		application.status = "shortlisted"
+		application.save()
+		set_status(JobApplication.objects.filter(pk=application.pk), "hired")
+		self.assertEqual(
+			list(application.status_changes.values_list("from_status", "to_status")),
+			[("", "applied"), ("applied", "shortlisted"), ("shortlisted", "hired")],
+		)
+
+	def test_rollup_covers_job_applications(self):
+		set_status(JobApplication.objects.filter(pk__in=[a.pk for a in self.applications[:2]]), "reviewed")
+		set_status(JobApplication.objects.filter(pk=self.applications[0].pk), "hired")
+		later = timezone.now() + timedelta(hours=2)
+		self.assertEqual(rollup_source(JOBS_FUNNELS, now=later), 6)
+		self.assertEqual(rollup_source(JOBS_FUNNELS, now=later), 0)
+
+		for funnel in (JobFunnel.objects.get(job=self.job), EmployerFunnel.objects.get(employer=self.employer)):
+			self.assertEqual((funnel.applications, funnel.reviewed, funnel.hired), (3, 2, 1))
+			self.assertEqual(sum(funnel.durations["time_in_applied"]), 2)
+			self.assertEqual(sum(funnel.durations["time_in_reviewed"]), 1)
+
+		self.client.force_login(self.employer.user)
+		response = self.client.get(reverse("jobs:employer_applications"))
+		self.assertEqual(response.context["funnel"]["applications"], 3)
+
+
+class EmployerApplicationExportTests(TestCase):
+	def setUp(self):
+		self.employer = make_employer()
+		self.job = make_job(self.employer)
+		make_application(self.job, "alice")
+		make_application(self.job, "bob", status="hired")
+		other = make_job(make_employer("other"))
+		make_application(other, "carol", status="hired")
+
+	def test_export_matches_the_filtered_list(self):
+		self.client.force_login(self.employer.user)
+		listed = self.client.get(reverse("jobs:employer_applications"), {"status": "hired"})
+		self.assertEqual([app.candidate.username for app in listed.context["applications"]], ["bob"])
+
+		response = self.client.get(
+			reverse("jobs:export_applications"), {"status": "hired", "columns": "email,status"}
+		)
+		self.assertEqual(response.status_code, 200)
+		rows = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+		self.assertEqual(rows, ["Email,Status", "bob@example.com,Hired"])
+
+	def test_formulas_are_exported_as_text(self):
+		JobApplication.objects.filter(candidate__username="bob").update(
+			cover_letter='=HYPERLINK("http://evil.example","Open")'
+		)
+		self.client.force_login(self.employer.user)
+		response = self.client.get(
+			reverse("jobs:export_applications"), {"status": "hired", "columns": "cover_letter"}
+		)
+		rows = list(csv.reader(response.getvalue().decode("utf-8-sig").splitlines()))
+		self.assertEqual(rows, [["Cover letter"], ['\'=HYPERLINK("http://evil.example","Open")']])
+
+	def test_students_cannot_export(self):
+		student = JobApplication.objects.get(candidate__username="alice").candidate
+		self.client.force_login(student)
+		self.assertEqual(self.client.get(reverse("jobs:export_applications")).status_code, 403)
+
+
+class JobExpiryTests(TestCase):
+	def setUp(self):
+		self.employer = make_employer()
+		self.open = make_job(self.employer, title="Open")
+		self.future = make_job(self.employer, title="Future", expires_at=timezone.now() + timedelta(days=3))
+		self.stale = make_job(self.employer, title="Stale", expires_at=days_ago(1))
+		self.older = make_job(self.employer, title="Older", expires_at=days_ago(5))
+		make_job(self.employer, title="Draft", is_active=False, expires_at=days_ago(2))
+
+	def test_live_excludes_expired_jobs(self):
+		self.assertEqual(
+			set(Job.objects.live().values_list("title", flat=True)), {"Open", "Future"}
+		)
+		self.assertEqual(
+			set(Job.objects.expired().values_list("title", flat=True)), {"Stale", "Older"}
+		)
+
+	def test_deactivate_in_chunks_with_one_notification(self):
+		self.assertEqual(deactivate_expired_jobs(chunk_size=1), 2)
+		self.assertFalse(Job.objects.expired().exists())
+		self.assertEqual(Job.objects.filter(is_active=True).count(), 2)
+
+		notification = Notification.objects.get(user=self.employer.user)
+		self.assertEqual(notification.notification_type, "system")
+		self.assertIn("Stale", notification.message)
+		self.assertIn("Older", notification.message)
+
+		self.assertEqual(deactivate_expired_jobs(), 0)
+		self.assertEqual(Notification.objects.count(), 1)
+
+	def test_deactivate_without_notifications(self):
+		self.assertEqual(deactivate_expired_jobs(notify=False), 2)
+		self.assertFalse(Notification.objects.exists())
+
+
+class JobCardProjectionTests(TestCase):
+	def setUp(self):
+		self.employer = make_employer()
+		EmployerProfile.objects.filter(pk=self.employer.pk).update(company_name_en="Acme")
+		make_job(self.employer, title_en="Developer", title_ru="", description_ru="Длинное описание")
+
+	def test_for_card_loads_active_language_with_fallback(self):
+		with translation.override("ru"):
+			with self.assertNumQueries(1):
+				job = Job.objects.live().for_card().get()
+				# Пустой русский заголовок берется из запасного английского
+				self.assertEqual(job.title, "Developer")
+				self.assertEqual(job.employer.company_name, "Acme")
+		deferred = job.get_deferred_fields()
+		self.assertIn("description_ru", deferred)
+		self.assertIn("title_uz", deferred)
+		self.assertNotIn("title_ru", deferred)
+
+
+class JobFacetTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.employer = make_employer()
+		make_job(self.employer, employment_type="full_time", work_type="remote", salary_max=12_000_000)
+		make_job(self.employer, employment_type="full_time", work_type="office", salary_min=4_000_000)
+		make_job(self.employer, employment_type="part_time", work_type="remote", is_urgent=True)
+		make_job(self.employer, employment_type="part_time", is_active=False)
+
+	def test_facets_ignore_own_dimension(self):
+		data = {"employment_type": ["full_time"]}
+		facets = job_facets(Job.objects.live(), data)
+		self.assertEqual(
+			{value: count for value, _label, count in facets["employment_type"]},
+			{"full_time": 2, "part_time": 1},
+		)
+		self.assertEqual(
+			{value: count for value, _label, count in facets["work_type"]},
+			{"remote": 1, "office": 1},
+		)
+		self.assertEqual(
+			[(band, count) for band, _label, count in facets["salary"]],
+			[("3000000-6000000", 1), ("10000000+", 1)],
+		)
+		self.assertEqual(facets["flags"]["total"], 2)
+		self.assertEqual(facets["flags"]["has_salary"], 2)
+		self.assertEqual(facets["flags"]["is_urgent"], 0)
+		self.assertEqual(filter_jobs(Job.objects.live(), data).count(), 2)
+
+	def test_flag_counts_combine_selected_flags(self):
+		facets = job_facets(Job.objects.live(), {"remote_ok": True})
+		self.assertEqual(facets["flags"]["total"], 2)
+		self.assertEqual(facets["flags"]["is_urgent"], 1)
+		self.assertEqual(facets["flags"]["has_salary"], 1)
+		self.assertEqual(facets["flags"]["remote_ok"], 2)
+
+	def test_facets_cached_per_normalized_query(self):
+		with self.assertNumQueries(6):
+			job_facets(Job.objects.live(), {"query": " python  dev", "work_type": ["remote", "office"]})
+		with self.assertNumQueries(0):
+			job_facets(Job.objects.live(), {"query": "python dev", "work_type": ["office", "remote"]})
+		self.assertEqual(
+			normalize_query({"query": " a  b ", "is_urgent": False, "work_type": ["b", "a"]}),
+			"query=a b&work_type=a,b",
+		)
+
+	def test_job_changes_invalidate_facets(self):
+		facets = job_facets(Job.objects.live(), {})
+		self.assertEqual(facets["flags"]["total"], 3)
+		job = Job.objects.filter(is_active=True).first()
+		job.views_count += 1
+		job.save(update_fields=["views_count"])
+		with self.assertNumQueries(0):
+			job_facets(Job.objects.live(), {})
+		job.is_active = False
+		job.save()
+		self.assertEqual(job_facets(Job.objects.live(), {})["flags"]["total"], 2)
+
+	def test_job_list_shows_facet_counts(self):
+		student = CustomUser.objects.create_user(
+			username="student", email="student@example.com", password="pass12345", user_type="student",
+		)
+		self.client.force_login(student)
+		response = self.client.get(reverse("jobs:list"), {"employment_type": "full_time"})
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.context["total_jobs"], 2)
+		self.assertContains(response, "(2)")
+
+
+class JobBitmapIndexTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.employer = make_employer()
+		self.jobs = [
+			make_job(self.employer, employment_type="full_time", work_type="remote", salary_max=12_000_000),
+			make_job(self.employer, employment_type="full_time", experience_level="senior", salary_min=4_000_000),
+			make_job(self.employer, employment_type="part_time", work_type="hybrid", is_featured=True),
+			make_job(self.employer, employment_type="part_time", is_urgent=True, salary_min=1_000_000),
+			make_job(self.employer, employment_type="contract", expires_at=timezone.now() + timedelta(hours=1)),
+		]
+		make_job(self.employer, employment_type="contract", is_active=False)
+		make_job(self.employer, employment_type="contract", expires_at=days_ago(1))
+
+	def test_bitmap_facets_match_sql(self):
+		for data in (
+			{},
+			{"employment_type": ["full_time", "part_time"]},
+			{"work_type": ["remote", "hybrid"], "has_salary": True},
+			{"experience_level": ["junior"], "is_urgent": True},
+			{"remote_ok": True, "is_featured": True},
+		):
+			with self.subTest(data=data):
+				self.assertEqual(bitmap_facets(data), compute_facets(Job.objects.live(), data))
+
+	def test_bitmap_jobs_pages_newest_first(self):
+		data = {"employment_type": ["full_time", "part_time"]}
+		result = bitmap_jobs(data, Job.objects.live().for_card())
+		self.assertEqual(result.count(), 4)
+		expected = [job.pk for job in reversed(self.jobs[:4])]
+		with self.assertNumQueries(1):
+			self.assertEqual([job.pk for job in result[1:3]], expected[1:3])
+		self.assertEqual(list(iter_bits_desc(0b100101)), [5, 2, 0])
+
+	def test_index_rebuilt_after_changes_and_expiry(self):
+		self.assertEqual(get_bitmap_index().live.bit_count(), 5)
+		with self.assertNumQueries(0):
+			get_bitmap_index()
+		self.jobs[0].is_active = False
+		self.jobs[0].save()
+		self.assertEqual(get_bitmap_index().live.bit_count(), 4)
+		# Срок одной из вакансий истекает — индекс перестраивается
+		later = timezone.now() + timedelta(hours=2)
+		self.assertEqual(get_bitmap_index(now=later).live.bit_count(), 3)
+
+	def test_job_list_reads_one_page_by_id(self):
+		student = CustomUser.objects.create_user(
+			username="student", email="student@example.com", password="pass12345", user_type="student",
+		)
+		self.client.force_login(student)
+		get_bitmap_index()
+		response = self.client.get(reverse("jobs:list"), {"work_type": "remote"})
+		self.assertEqual(response.context["total_jobs"], 1)
+		self.assertEqual([job.pk for job in response.context["page_obj"]], [self.jobs[0].pk])
+
+
+class JobSalaryNormalizationTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.employer = make_employer()
+		with self.captureOnCommitCallbacks(execute=True):
+			CurrencyRate.objects.create(currency="USD", uzs_per_unit=12500)
+		self.uzs = make_job(self.employer, salary_min=5_000_000, salary_max=8_000_000)
+		self.usd = make_job(self.employer, currency="USD", salary_min=900)
+		self.eur = make_job(self.employer, currency="EUR", salary_max=1000)
+
+	def test_save_normalizes_and_fills_missing_bound(self):
+		self.assertEqual((self.uzs.salary_min_uzs, self.uzs.salary_max_uzs), (5_000_000, 8_000_000))
+		self.assertEqual((self.usd.salary_min_uzs, self.usd.salary_max_uzs), (11_250_000, 11_250_000))
+		# Курса EUR нет — вакансия не участвует в поиске по сумме
+		self.assertIsNone(self.eur.salary_max_uzs)
+
+	def test_rate_change_recomputes_jobs_in_currency(self):
+		with self.captureOnCommitCallbacks(execute=True):
+			CurrencyRate.objects.create(currency="EUR", uzs_per_unit=13500)
+		self.eur.refresh_from_db()
+		self.assertEqual((self.eur.salary_min_uzs, self.eur.salary_max_uzs), (13_500_000, 13_500_000))
+
+		with self.captureOnCommitCallbacks(execute=True):
+			CurrencyRate.objects.filter(currency="USD").get().delete()
+		self.usd.refresh_from_db()
+		self.assertIsNone(self.usd.salary_max_uzs)
+		self.assertEqual(recompute_salaries(["UZS"]), 1)
+
+	def test_filter_and_sort_across_currencies(self):
+		jobs = Job.objects.live()
+		self.assertEqual(
+			set(filter_jobs(jobs, {"salary_min": 10_000_000})), {self.usd},
+		)
+		self.assertEqual(
+			set(filter_jobs(jobs, {"salary_min": 500, "currency": "USD"})), {self.uzs, self.usd},
+		)
+		self.assertEqual(set(filter_jobs(jobs, {"salary_max": 6_000_000})), {self.uzs})
+		# Курс неизвестен — фильтр по сумме не применяется
+		self.assertEqual(filter_jobs(jobs, {"salary_min": 500, "currency": "EUR"}).count(), 3)
+
+		student = CustomUser.objects.create_user(
+			username="student", email="student@example.com", password="pass12345", user_type="student",
+		)
+		self.client.force_login(student)
+		response = self.client.get(reverse("jobs:list"), {"sort": "salary"})
+		self.assertEqual(
+			[job.pk for job in response.context["page_obj"]], [self.usd.pk, self.uzs.pk, self.eur.pk],
+		)
+
+	def test_salary_facets_use_uzs(self):
+		facets = compute_facets(Job.objects.live(), {})
+		self.assertEqual(dict(facets["salary"]), {"10000000+": 1, "6000000-10000000": 1})
+		self.assertEqual(bitmap_facets({}), facets)
+
+
+class JobSkillLinkTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.employer = make_employer()
+		self.js = CanonicalSkill.objects.create(name="JavaScript")
+		SkillAlias.objects.create(skill=self.js, name="JS")
+
+	def links(self, job):
+		return set(
+			JobSkill.objects.filter(job=job).values_list("skill__name", "is_required")
+		)
+
+	def test_links_follow_skill_text(self):
+		job = make_job(self.employer, skills_required="Python, js", preferred_skills="Docker; python")
+		self.assertEqual(
+			self.links(job), {("Python", True), ("JavaScript", True), ("Docker", False)},
+		)
+		job.views_count = 5
+		with self.assertNumQueries(1):
+			job.save(update_fields=["views_count"])
+		job.skills_required = "JavaScript"
+		job.save()
+		self.assertEqual(self.links(job), {("JavaScript", True), ("Docker", False), ("Python", False)})
+
+	def test_recommendations_join_on_skill_ids(self):
+		matching = make_job(self.employer, skills_required="JavaScript, Python")
+		partial = make_job(self.employer, skills_required="Go", preferred_skills="javascript")
+		other = make_job(self.employer, skills_required="Go", views_count=100)
+		user = CustomUser.objects.create_user(
+			username="student", email="student@example.com", password="pass12345", user_type="student",
+		)
+		cv = CV.objects.create(
+			user=user, title="CV", status="published", full_name="Student",
+			email="student@example.com", phone="123", location="Tashkent", summary="About",
+		)
+		CVSkill.objects.create(cv=cv, name="js", level="advanced")
+		CVSkill.objects.create(cv=cv, name="python", level="expert")
+		self.assertEqual(
+			[job.pk for job in get_job_recommendations(user, limit=3)],
+			[matching.pk, partial.pk, other.pk],
+		)
+
+
+POSTING = (
+	"We are looking for a backend engineer to design and maintain payment services "
+	"for our retail platform. You will write clean Python code, review pull requests, "
+	"own the release process and work closely with product managers and designers "
+	"to ship features used by thousands of shops across the country every day."
+)
+OTHER_POSTING = (
+	"Our accounting department needs a junior accountant to prepare monthly reports, "
+	"reconcile bank statements, process supplier invoices and assist the chief accountant "
+	"with annual audits and tax declarations for the holding companies."
+)
+
+
+class JobDedupeTests(TestCase):
+	def setUp(self):
+		cache.clear()
+		self.employer = make_employer()
+		self.original = make_job(
+			self.employer, title="Backend Engineer", description=POSTING, requirements="Python, SQL",
+		)
+		self.other = make_job(
+			self.employer, title="Junior Accountant", description=OTHER_POSTING,
+			requirements="Excel",
+		)
+
+	def test_repost_with_small_edits_is_found(self):
+		repost = Job(
+			title="Backend Engineer (Python)", description=POSTING.replace("thousands", "hundreds"),
+			requirements="Python, SQL",
+		)
+		with self.assertNumQueries(2):
+			duplicates = find_duplicate_jobs(repost)
+		self.assertEqual([job.pk for job, _score in duplicates], [self.original.pk])
+		self.assertGreaterEqual(duplicates[0][1], 0.8)
+		self.assertEqual(find_duplicate_jobs(repost, Job.objects.filter(pk=self.other.pk)), [])
+
+	def test_signature_follows_text_changes(self):
+		self.assertEqual(JobBucket.objects.filter(job=self.original).count(), 16)
+		signature = JobSignature.objects.get(job=self.original).minhashes
+		self.original.views_count = 3
+		with self.assertNumQueries(1):
+			self.original.save(update_fields=["views_count"])
+		self.original.description = OTHER_POSTING
+		self.original.save()
+		self.assertNotEqual(bytes(JobSignature.objects.get(job=self.original).minhashes), bytes(signature))
+
+	def test_create_view_asks_to_confirm_duplicate(self):
+		self.client.force_login(self.employer.user)
+		data = {
+			"title": "Backend Engineer", "short_description": "Payment services team",
+			"description": POSTING, "employer": self.employer.pk, "location": "Tashkent",
+			"work_type": "office", "employment_type": "full_time", "experience_level": "middle",
+			"education_level": "bachelor", "currency": "UZS", "requirements": "Python, SQL",
+			"responsibilities": "Code", "skills_required": "Python",
+			"contact_email": "hr@example.com", "terms_accept": "on", "publish": "1",
+		}
+		response = self.client.post(reverse("jobs:job_create"), data)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(
+			[job.pk for job, _score in response.context["duplicate_jobs"]], [self.original.pk],
+		)
+		self.assertEqual(Job.objects.count(), 2)
+
+		response = self.client.post(reverse("jobs:job_create"), {**data, "confirm_duplicate": "on"})
+		self.assertRedirects(response, reverse("jobs:my_jobs"), fetch_redirect_response=False)
+		self.assertEqual(Job.objects.count(), 3)
+
+	def test_report_groups_duplicates(self):
+		copy = make_job(
+			self.employer, title="Backend Engineer", description=POSTING, requirements="Python, SQL",
+		)
+		JobSignature.objects.all().delete()
+		out = StringIO()
+		call_command("report_duplicate_jobs", stdout=out)
+		self.assertEqual(
+			[[pk for pk, _score in cluster] for cluster in duplicate_clusters()],
+			[[self.original.pk, copy.pk]],
+		)
+		self.assertIn("1 groups, 1 redundant postings", out.getvalue())
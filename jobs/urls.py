@@ -34,6 +34,11 @@ urlpatterns = [
         views.employer_applications,
         name="employer_applications",
     ),
+    path(
+        "ish-beruvchi/arizalar/eksport/",
+        views.export_applications,
+        name="export_applications",
+    ),
 
     
     # AJAX endpointlar
@@ -1,7 +1,7 @@
 from django.core.mail import send_mass_mail
-from django.db.models import Q
+from django.db.models import Count, Q
 
-from .models import Job, JobApplication
+from .models import Job
 
 
 def send_bulk_application_update(applications, subject, message):
@@ -32,84 +32,84 @@ def send_bulk_application_update(applications, subject, message):
 
 def get_job_recommendations(user, limit=10):
     """Получение рекомендаций вакансий для пользователя"""
-    from cvbuilder.models import CV
+    from cvbuilder.models import Skill
 
     try:
-        # Получаем навыки пользователя из его резюме
-        user_cvs = CV.objects.filter(user=user, status="published")
-        user_skills = []
-
-        for cv in user_cvs:
-            user_skills.extend([skill.name.lower() for skill in cv.skills.all()])
-
-        # Уникальные навыки
-        user_skills = list(set(user_skills))
+        # Навыки пользователя из опубликованных резюме — id общего словаря
+        skill_ids = set(
+            Skill.objects.filter(
+                cv__user=user, cv__status="published", canonical__isnull=False
+            ).values_list("canonical_id", flat=True)
+        )
 
-        if not user_skills:
+        if not skill_ids:
             # Если нет навыков, возвращаем популярные вакансии
-            return Job.objects.filter(is_active=True).order_by("-views_count")[:limit]
-
-        # Ищем вакансии с совпадающими навыками
-        recommended_jobs = Job.objects.filter(is_active=True)
-
-        # Создаем Q-объекты для поиска по навыкам
-        skill_queries = Q()
-        for skill in user_skills[:10]:  # Ограничиваем количество навыков для поиска
-            skill_queries |= Q(skills_required__icontains=skill)
-            skill_queries |= Q(preferred_skills__icontains=skill)
-
-        recommended_jobs = recommended_jobs.filter(skill_queries)
+            return Job.objects.live().order_by("-views_count")[:limit]
+
+        # Вакансии с совпадающими навыками: соединение по id навыка,
+        # сначала больше совпадений (обязательные навыки важнее желательных)
+        recommended_jobs = list(
+            Job.objects.live()
+            .filter(skill_links__skill_id__in=skill_ids)
+            .annotate(
+                matched_required=Count("skill_links", filter=Q(skill_links__is_required=True)),
+                matched=Count("skill_links"),
+            )
+            .order_by("-matched_required", "-matched", "-views_count")[:limit]
+        )
 
         # Если недостаточно рекомендаций, добавляем популярные вакансии
-        if recommended_jobs.count() < limit:
+        if len(recommended_jobs) < limit:
             additional_jobs = (
-                Job.objects.filter(is_active=True)
-                .exclude(pk__in=recommended_jobs.values_list("pk", flat=True))
-                .order_by("-views_count")[: limit - recommended_jobs.count()]
+                Job.objects.live()
+                .exclude(pk__in=[job.pk for job in recommended_jobs])
+                .order_by("-views_count")[: limit - len(recommended_jobs)]
             )
+            recommended_jobs.extend(additional_jobs)
 
-            # Convert to lists and combine to avoid reassigning a QuerySet
-            recommended_jobs_list = list(recommended_jobs) + list(additional_jobs)
-            return recommended_jobs_list[:limit]
-
-        return recommended_jobs[:limit]
+        return recommended_jobs
 
     except Exception:
         # В случае ошибки возвращаем популярные вакансии
-        return Job.objects.filter(is_active=True).order_by("-views_count")[:limit]
+        return Job.objects.live().order_by("-views_count")[:limit]
 
 
 def generate_job_stats(timeframe="all"):
-    """Генерация статистики по вакансиям"""
+    """
+    Генерация статистики по вакансиям за week/month/year/all.
+
+    Счетчики берутся из ежедневной сводки (jobs.stats), а не подсчетом
+    всех вакансий и откликов; remote/featured — созданные за период,
+    applications_by_status — переходы откликов в статусы за период.
+    """
     from datetime import timedelta
 
     from django.utils import timezone
 
-    now = timezone.now()
-
-    if timeframe == "week":
-        start_date = now - timedelta(days=7)
-    elif timeframe == "month":
-        start_date = now - timedelta(days=30)
-    elif timeframe == "year":
-        start_date = now - timedelta(days=365)
-    else:  # all
-        start_date = None
-
-    jobs = Job.objects.all()
-    applications = JobApplication.objects.all()
-
-    if start_date:
-        jobs = jobs.filter(created_at__gte=start_date)
-        applications = applications.filter(created_at__gte=start_date)
-
-    stats = {
-        "total_jobs": jobs.count(),
-        "active_jobs": jobs.filter(is_active=True).count(),
-        "total_applications": applications.count(),
-        "applications_per_job": round(applications.count() / max(jobs.count(), 1), 1),
-        "remote_jobs_count": jobs.filter(remote_work=True, is_active=True).count(),
-        "featured_jobs_count": jobs.filter(is_featured=True, is_active=True).count(),
-    }
+    from .stats import APPLICATION_STATUSES, job_stats
+
+    days = {"week": 7, "month": 30, "year": 365}.get(timeframe)
+    start = timezone.localdate() - timedelta(days=days) if days else None
+    totals = job_stats(start=start)
 
-    return stats
+    active_jobs = Job.objects.live()
+    if days:
+        active_jobs = active_jobs.filter(
+            created_at__gte=timezone.now() - timedelta(days=days)
+        )
+
+    return {
+        "total_jobs": totals["jobs_created"],
+        "active_jobs": active_jobs.count(),
+        "total_applications": totals["applications"],
+        "applications_per_job": round(
+            totals["applications"] / max(totals["jobs_created"], 1), 1
+        ),
+        "remote_jobs_count": totals["remote_jobs"],
+        "featured_jobs_count": totals["featured_jobs"],
+        "jobs_activated": totals["jobs_activated"],
+        "jobs_expired": totals["jobs_expired"],
+        "applications_by_status": {
+            status: totals[f"applications_{status}"] for status in APPLICATION_STATUSES
+        },
+    }
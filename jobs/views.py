@@ -1,18 +1,44 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.db.models import Count, F, Q
+from django.http import HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
 
 from accounts.models import EmployerProfile
+from core.exports import export_response
+from employers.funnel import JOBS_TIMED_STAGES, funnel_summary
 from typing import Any, Iterable, cast
 
 from .forms import *
 from .models import *
+from .bitmaps import bitmap_filterable, bitmap_jobs
+from .dedupe import find_duplicate_jobs
+from .search import filter_jobs, job_facets
+
+
+def filter_applications(applications, params):
+    """Фильтры откликов из GET-параметров: status, job, q (имя/email кандидата)"""
+    status = params.get("status")
+    if status in dict(JobApplication.STATUS_CHOICES):
+        applications = applications.filter(status=status)
+
+    job_id = params.get("job")
+    if job_id and job_id.isdigit():
+        applications = applications.filter(job_id=int(job_id))
+
+    query = params.get("q", "").strip()
+    if query:
+        applications = applications.filter(
+            Q(candidate__first_name__icontains=query)
+            | Q(candidate__last_name__icontains=query)
+            | Q(candidate__email__icontains=query)
+        )
+    return applications
+
 
 @login_required
 def employer_applications(request):
@@ -41,10 +67,9 @@ def employer_applications(request):
         .order_by("-created_at")
     )
 
-    # Status bo'yicha filter
+    # Status, vakansiya va nomzod bo'yicha filter (eksport bilan umumiy)
     status_filter = request.GET.get("status")
-    if status_filter:
-        applications = applications.filter(status=status_filter)
+    applications = filter_applications(applications, request.GET)
 
     # Arizalar statistikasi
     status_counts = {
@@ -57,14 +82,46 @@ def employer_applications(request):
         "hired": applications.filter(status="hired").count(),
     }
 
+    # Воронка из инкрементальной сводки (employers.funnel), без сканирования откликов
+    funnel = EmployerFunnel.objects.filter(employer=employer_profile).first()
+
     context = {
         "applications": applications,
         "status_filter": status_filter,
         "status_counts": status_counts,
+        "funnel": funnel_summary(funnel, JOBS_TIMED_STAGES),
     }
 
     return render(request, "jobs/applications.html", context)
 
+
+# Колонки выгрузки откликов: {ключ: (заголовок, значение из JobApplication)}
+APPLICATION_EXPORT_COLUMNS = {
+    "job": ("Job", lambda app: app.job.title),
+    "candidate": ("Candidate", lambda app: app.candidate.get_full_name() or app.candidate.username),
+    "email": ("Email", lambda app: app.candidate.email),
+    "status": ("Status", lambda app: app.get_status_display()),
+    "expected_salary": ("Expected salary", lambda app: app.expected_salary),
+    "cv": ("CV", lambda app: app.cv.title if app.cv else ""),
+    "cover_letter": ("Cover letter", lambda app: app.cover_letter),
+    "applied_at": ("Applied", lambda app: app.created_at),
+    "status_changed_at": ("Status changed", lambda app: app.status_changed_at),
+}
+
+
+@login_required
+def export_applications(request):
+    """Выгрузка откликов на вакансии работодателя (CSV/XLSX) с фильтрами списка"""
+    employer_profile = EmployerProfile.objects.filter(user=request.user).first()
+    if not request.user.is_employer or employer_profile is None:
+        return HttpResponseForbidden()
+
+    applications = filter_applications(
+        JobApplication.objects.filter(job__employer=employer_profile), request.GET
+    )
+    applications = applications.select_related("job", "candidate", "cv").order_by("-created_at")
+    return export_response(request, applications, APPLICATION_EXPORT_COLUMNS, "applications")
+
 @login_required
 def job_create(request):
     """Yangi vakansiya yaratish"""
@@ -78,6 +135,7 @@ def job_create(request):
         messages.error(request, _("Avval ish beruvchi profilingizni to'ldiring."))
         return redirect("accounts:employer_profile_update")
 
+    duplicate_jobs = []
     if request.method == "POST":
         form = JobForm(request.POST, user=request.user)
         if form.is_valid():
@@ -85,16 +143,29 @@ def job_create(request):
             job.employer = employer_profile
             job.created_by = request.user
 
-            if "save_draft" in request.POST:
-                job.is_active = False
-                job.save()
-                messages.success(request, _("Vakansiya qoralama sifatida saqlandi."))
-            else:
-                job.is_active = True
-                job.save()
-                messages.success(request, _("Vakansiya muvaffaqiyatli e'lon qilindi!"))
-
-            return redirect("jobs:my_jobs")
+            publish = "save_draft" not in request.POST
+            if publish and not form.cleaned_data.get("confirm_duplicate"):
+                # Повторное размещение той же вакансии: просим подтверждение
+                duplicate_jobs = find_duplicate_jobs(
+                    job, Job.objects.live().filter(employer=employer_profile)
+                )
+                if duplicate_jobs:
+                    form.add_error(
+                        None,
+                        _("Bu vakansiya siz e'lon qilgan vakansiyaga juda o'xshaydi. "
+                          "Baribir e'lon qilish uchun tasdiqlang."),
+                    )
+
+            if not duplicate_jobs:
+                if publish:
+                    job.is_active = True
+                    job.save()
+                    messages.success(request, _("Vakansiya muvaffaqiyatli e'lon qilindi!"))
+                else:
+                    job.is_active = False
+                    job.save()
+                    messages.success(request, _("Vakansiya qoralama sifatida saqlandi."))
+                return redirect("jobs:my_jobs")
         else:
             messages.error(request, _("Iltimos, xatolarni to'g'rilang."))
     else:
@@ -103,6 +174,7 @@ def job_create(request):
     context = {
         "form": form,
         "today": timezone.now().date(),
+        "duplicate_jobs": duplicate_jobs,
     }
     return render(request, "jobs/job_form.html", context)
 
@@ -259,7 +331,8 @@ def saved_jobs(request):
 
     saved_jobs = (
         SavedJob.objects.filter(user=request.user)
-        .select_related("job", "job__employer")
+        .select_related("job__employer__industry")
+        .only("created_at", "job", *(f"job__{column}" for column in Job.objects.card_columns()))
         .order_by("-created_at")
     )
 
@@ -284,57 +357,40 @@ def job_list(request):
     if request.user.is_staff or request.user.is_superuser:
         # Админы и суперадмины видят все вакансии
         jobs = Job.objects.all()
+        facets_scope = "all"
     elif request.user.is_employer:
         # Работодатели видят только свои вакансии в любом состоянии
         try:
             employer_profile = request.user.employer_profile
             jobs = Job.objects.filter(employer=employer_profile)
+            facets_scope = f"employer:{employer_profile.pk}"
         except EmployerProfile.DoesNotExist:
             jobs = Job.objects.none()
+            facets_scope = "none"
             messages.error(request, _("Iltimos, avval ish beruvchi profilingizni to'ldiring."))
     elif request.user.is_student:
         # Студенты и выпускники видят только опубликованные вакансии
-        jobs = Job.objects.filter(is_active=True)
+        jobs = Job.objects.live()
+        facets_scope = "live"
     else:
         # Гости и другие типы пользователей не имеют доступа
         messages.error(request, _("Sizda vakansiyalarni ko'rish huquqi yo'q."))
         return redirect("accounts:home")
 
-    # Поиск и фильтрация
-    if form.is_valid():
-        query = form.cleaned_data.get("query")
-        employment_type = form.cleaned_data.get("employment_type")
-        experience_level = form.cleaned_data.get("experience_level")
-        remote_work = form.cleaned_data.get("remote_work")
-        salary_min = form.cleaned_data.get("salary_min")
-
-        if query:
-            jobs = jobs.filter(
-                Q(title__icontains=query)
-                | Q(description__icontains=query)
-                | Q(employer__company_name__icontains=query)
-                | Q(skills_required__icontains=query)
-            )
-
-        if employment_type:
-            jobs = jobs.filter(employment_type__in=employment_type)
-
-        if experience_level:
-            jobs = jobs.filter(experience_level__in=experience_level)
-
-        if remote_work:
-            jobs = jobs.filter(remote_work=True)
-
-        if salary_min:
-            jobs = jobs.filter(
-                Q(salary_min__gte=salary_min)
-                | Q(salary_max__gte=salary_min)
-            )
+    # Поиск и фильтрация; счетчики фасетов считаются по той же выборке
+    filters = form.cleaned_data if form.is_valid() else {}
+    facets = job_facets(jobs, filters, scope=facets_scope)
+    jobs = filter_jobs(jobs, filters)
 
     # Сортировка
     sort = request.GET.get("sort", "newest")
     if sort == "salary":
-        jobs = jobs.order_by("-salary_max", "-salary_min")
+        # Сравнение в UZS: суммы в разных валютах напрямую не сопоставимы
+        jobs = jobs.order_by(
+            F("salary_max_uzs").desc(nulls_last=True),
+            F("salary_min_uzs").desc(nulls_last=True),
+            "-created_at",
+        )
     elif sort == "views":
         jobs = jobs.order_by("-views_count")
     elif sort == "applications":
@@ -342,13 +398,20 @@ def job_list(request):
     else:
         jobs = jobs.order_by("-created_at")
 
+    if facets_scope == "live" and sort == "newest" and bitmap_filterable(filters):
+        # Выборку дает битовый индекс, из таблицы читается одна страница по id
+        object_list = bitmap_jobs(filters, Job.objects.live().for_card())
+    else:
+        # Карточкам нужны только их поля на текущем языке
+        object_list = jobs.for_card()
+
     # Пагинация
-    paginator = Paginator(jobs, 15)
+    paginator = Paginator(object_list, 15)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
-    # Статистика
-    total_jobs = jobs.count()
+    # Статистика (paginator уже посчитал выборку)
+    total_jobs = paginator.count
     
     # Для студентов и выпускников показываем рекомендуемые вакансии
     featured_jobs = []
@@ -358,9 +421,11 @@ def job_list(request):
     context = {
         "page_obj": page_obj,
         "form": form,
-        "jobs": jobs,
+        # Шаблон выводит и листает именно страницу
+        "jobs": page_obj,
         "total_jobs": total_jobs,
         "featured_jobs": featured_jobs,
+        "facets": facets,
         "is_admin": request.user.is_staff or request.user.is_superuser,
         "is_employer": request.user.is_employer,
         "is_student": request.user.is_student,
@@ -392,7 +457,7 @@ def job_detail(request, pk):
 
     # Увеличиваем счетчик просмотров
     job.views_count += 1
-    job.save()
+    job.save(update_fields=["views_count"])
 
     # Проверяем, подавал ли пользователь заявку
     has_applied = False
@@ -417,10 +482,12 @@ def job_detail(request, pk):
     # Похожие вакансии (только для опубликованных)
     similar_jobs = []
     if job.is_active:
-        similar_jobs = Job.objects.filter(
-            is_active=True, 
-            experience_level=job.experience_level
-        ).exclude(pk=job.pk)[:4]
+        similar_jobs = (
+            Job.objects.live()
+            .filter(experience_level=job.experience_level)
+            .exclude(pk=job.pk)
+            .for_card()[:4]
+        )
 
     context = {
         "job": job,
@@ -442,7 +509,7 @@ def increment_job_views(request, pk):
     """Vakansiya ko'rishlar sonini oshirish (AJAX)"""
     job = get_object_or_404(Job, pk=pk)
     job.views_count += 1
-    job.save()
+    job.save(update_fields=["views_count"])
     return JsonResponse({"success": True, "views_count": job.views_count})
 
 @login_required
@@ -475,7 +542,7 @@ def apply_for_job(request, pk):
 
             # Увеличиваем счетчик заявок
             job.applications_count += 1
-            job.save()
+            job.save(update_fields=["applications_count"])
 
             messages.success(
                 request, _("Arizangiz muvaffaqiyatli yuborildi!")